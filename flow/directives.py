@@ -98,6 +98,7 @@ class _Directive:
             def validate_callable(*jobs):
                 return self._validator(value(*jobs))
 
+            validate_callable._flow_directive = value
             return validate_callable
         else:
             return self._validator(value)
@@ -118,14 +119,43 @@ class _Directives(MutableMapping):
         directives must be specified at initialization.
     """
 
+    __slots__ = (
+        "_directive_definitions",
+        "_defined_directives",
+        "_user_directives",
+        "_shared",
+    )
+
     def __init__(self, environment_directives):
         self._directive_definitions = dict()
         self._defined_directives = dict()
         self._user_directives = dict()
+        self._shared = False
 
         for directive in environment_directives:
             self._add_directive(directive)
 
+    def copy(self):
+        """Return a copy of the directives.
+
+        The copy shares the directive definitions and values with this object.
+        The values are only copied once either object is modified, so that
+        copies of directives which are never modified are cheap.
+        """
+        directives = type(self).__new__(type(self))
+        directives._directive_definitions = self._directive_definitions
+        directives._defined_directives = self._defined_directives
+        directives._user_directives = self._user_directives
+        directives._shared = self._shared = True
+        return directives
+
+    def _unshare(self):
+        """Copy the values shared with other directives before modifying them."""
+        if self._shared:
+            self._defined_directives = dict(self._defined_directives)
+            self._user_directives = dict(self._user_directives)
+            self._shared = False
+
     def _add_directive(self, directive):
         if not isinstance(directive, _Directive):
             raise TypeError(
@@ -134,14 +164,19 @@ class _Directives(MutableMapping):
         elif directive._name in self._directive_definitions:
             raise ValueError(f"Cannot redefine directive name {directive._name}.")
         else:
+            if self._shared:
+                self._directive_definitions = dict(self._directive_definitions)
+                self._unshare()
             self._directive_definitions[directive._name] = directive
             self._defined_directives[directive._name] = directive._default
 
     def _set_defined_directive(self, key, value):
         try:
-            self._defined_directives[key] = self._directive_definitions[key](value)
+            value = self._directive_definitions[key](value)
         except (KeyError, ValueError, TypeError) as err:
             raise DirectivesError(f"Error setting directive {key}") from err
+        self._unshare()
+        self._defined_directives[key] = value
 
     def __getitem__(self, key):
         if key in self._defined_directives and key in self._directive_definitions:
@@ -156,9 +191,11 @@ class _Directives(MutableMapping):
         if key in self._directive_definitions:
             self._set_defined_directive(key, value)
         else:
+            self._unshare()
             self._user_directives[key] = value
 
     def __delitem__(self, key):
+        self._unshare()
         if key in self._directive_definitions:
             self._defined_directives[key] = self._directive_definitions[key]._default
         else:
@@ -184,8 +221,11 @@ class _Directives(MutableMapping):
             super().update(other)
 
     def evaluate(self, jobs):
+        # Only callable values are set, so that directives without callable
+        # values remain shared with the directives they were copied from.
         for key, value in self.items():
-            self[key] = _evaluate(value, jobs)
+            if callable(value):
+                self[key] = _evaluate(value, jobs)
 
     def _aggregate(self, other, jobs=None, parallel=False):
         self.evaluate(jobs)
@@ -197,17 +237,34 @@ class _Directives(MutableMapping):
             other_directive = other.get(name, default_value)
             directive = self[name]
             if other_directive is not None:
+                self._unshare()
                 self._defined_directives[name] = agg_func(directive, other_directive)
 
 
 def _evaluate(value, jobs):
+    """Return the value of a directive for the given jobs.
+
+    Callable directives are memoized per job-aggregate while the project of the
+    jobs caches directives, see :meth:`flow.FlowProject._cached_directives`.
+    The memoized value is not validated, since the same callable may be used
+    for multiple directives; values are validated when they are set.
+    """
     if callable(value):
         if jobs is None:
             raise RuntimeError(
                 "jobs must be specified when evaluating a callable directive."
             )
-        else:
+        cache = getattr(getattr(jobs[0], "_project", None), "_directive_cache", None)
+        if cache is None:
             return value(*jobs)
+        # Validated callables are memoized by the callable that they wrap.
+        function = getattr(value, "_flow_directive", value)
+        key = (function, tuple(job.get_id() for job in jobs))
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = function(*jobs)
+            return result
     else:
         return value
 
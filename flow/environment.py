@@ -284,17 +284,22 @@ class ComputeEnvironment(metaclass=ComputeEnvironmentType):
 
     @classmethod
     def _get_default_directives(cls):
-        return _Directives(
-            [
-                _NP,
-                _NGPU,
-                _NRANKS,
-                _OMP_NUM_THREADS,
-                _EXECUTABLE,
-                _WALLTIME,
-                _PROCESSOR_FRACTION,
-            ]
-        )
+        # The directives are built once per environment and copied on write.
+        directives = cls.__dict__.get("_default_directives")
+        if directives is None:
+            directives = _Directives(
+                [
+                    _NP,
+                    _NGPU,
+                    _NRANKS,
+                    _OMP_NUM_THREADS,
+                    _EXECUTABLE,
+                    _WALLTIME,
+                    _PROCESSOR_FRACTION,
+                ]
+            )
+            cls._default_directives = directives
+        return directives.copy()
 
 
 class StandardEnvironment(ComputeEnvironment):
@@ -0,0 +1,233 @@
+# Copyright (c) 2020 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Directed graphs of the operations of a FlowProject."""
+import json
+
+
+class OperationGraph:
+    """A sparse directed graph of operations.
+
+    The graph is stored as adjacency lists. The topological order and the
+    transitive closure of the graph are computed once on construction, so that
+    queries for the upstream and downstream operations of an operation are
+    answered without traversing the graph.
+
+    :param nodes:
+        The nodes of the graph, typically the names of operations. The order
+        of the nodes determines the order of the rows and columns of the
+        adjacency matrix.
+    :type nodes:
+        sequence
+    :param edges:
+        Pairs ``(source, target)`` of nodes.
+    :type edges:
+        iterable
+    """
+
+    def __init__(self, nodes, edges=()):
+        self._nodes = list(nodes)
+        self._index = {node: i for i, node in enumerate(self._nodes)}
+        self._successors = {node: [] for node in self._nodes}
+        self._predecessors = {node: [] for node in self._nodes}
+        for source, target in edges:
+            if target not in self._successors[source]:
+                self._successors[source].append(target)
+                self._predecessors[target].append(source)
+        self._descendants = {
+            node: self._reachable(node, self._successors) for node in self._nodes
+        }
+        self._ancestors = {
+            node: self._reachable(node, self._predecessors) for node in self._nodes
+        }
+        self._order = self._topological_order()
+
+    @staticmethod
+    def _reachable(node, adjacency):
+        """Return the nodes reachable from node via at least one edge."""
+        reachable = set()
+        stack = list(adjacency[node])
+        while stack:
+            other = stack.pop()
+            if other not in reachable:
+                reachable.add(other)
+                stack.extend(adjacency[other])
+        return frozenset(reachable)
+
+    def _topological_order(self):
+        """Return a topological order of the nodes, or None if cyclic."""
+        in_degree = {node: len(self._predecessors[node]) for node in self._nodes}
+        ready = [node for node in self._nodes if not in_degree[node]]
+        order = []
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for other in self._successors[node]:
+                in_degree[other] -= 1
+                if not in_degree[other]:
+                    ready.append(other)
+        if len(order) != len(self._nodes):
+            return None
+        return order
+
+    @property
+    def nodes(self):
+        """The nodes of the graph."""
+        return list(self._nodes)
+
+    @property
+    def edges(self):
+        """The edges ``(source, target)`` of the graph."""
+        return [
+            (source, target)
+            for source in self._nodes
+            for target in self._successors[source]
+        ]
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node in self._index
+
+    def successors(self, node):
+        """Return the nodes directly downstream of a node.
+
+        :param node:
+            A node of the graph.
+        :return:
+            The targets of the edges starting at node.
+        :rtype:
+            list
+        """
+        return list(self._successors[node])
+
+    def predecessors(self, node):
+        """Return the nodes directly upstream of a node.
+
+        :param node:
+            A node of the graph.
+        :return:
+            The sources of the edges ending at node.
+        :rtype:
+            list
+        """
+        return list(self._predecessors[node])
+
+    def ancestors(self, node):
+        """Return all nodes upstream of a node.
+
+        :param node:
+            A node of the graph.
+        :return:
+            The nodes from which node is reachable.
+        :rtype:
+            frozenset
+        """
+        return self._ancestors[node]
+
+    def descendants(self, node):
+        """Return all nodes downstream of a node.
+
+        :param node:
+            A node of the graph.
+        :return:
+            The nodes reachable from node.
+        :rtype:
+            frozenset
+        """
+        return self._descendants[node]
+
+    def is_reachable(self, source, target):
+        """Return whether target is reachable from source.
+
+        :param source:
+            The node to start from.
+        :param target:
+            The node to reach.
+        :rtype:
+            bool
+        """
+        return target in self._descendants[source]
+
+    def is_acyclic(self):
+        """Return whether the graph is acyclic.
+
+        :rtype:
+            bool
+        """
+        return self._order is not None
+
+    def topological_order(self):
+        """Return the nodes in topological order.
+
+        Nodes without a dependency between them retain the order in which they
+        were provided.
+
+        :return:
+            The nodes, each before all of its descendants.
+        :rtype:
+            list
+        :raises ValueError:
+            If the graph is cyclic.
+        """
+        if self._order is None:
+            raise ValueError("The operation graph is cyclic.")
+        return list(self._order)
+
+    def to_adjacency_matrix(self):
+        """Return the adjacency matrix of the graph.
+
+        :return:
+            A matrix as list of lists, where the entry ``[i][j]`` is 1 if there
+            is an edge from the i-th to the j-th node and 0 otherwise.
+        :rtype:
+            list
+        """
+        matrix = [[0] * len(self._nodes) for _ in self._nodes]
+        for source, target in self.edges:
+            matrix[self._index[source]][self._index[target]] = 1
+        return matrix
+
+    def to_dict(self):
+        """Return the graph as a dictionary of node and edge lists.
+
+        :rtype:
+            dict
+        """
+        return {
+            "nodes": [str(node) for node in self._nodes],
+            "edges": [[str(source), str(target)] for source, target in self.edges],
+        }
+
+    def to_json(self, **kwargs):
+        """Return the graph as JSON string.
+
+        :param \\*\\*kwargs:
+            Keyword arguments forwarded to :func:`json.dumps`.
+        :rtype:
+            str
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_dot(self, name="operations"):
+        """Return the graph in the DOT language of Graphviz.
+
+        :param name:
+            The name of the graph.
+        :type name:
+            str
+        :rtype:
+            str
+        """
+
+        def quote(node):
+            return json.dumps(str(node))
+
+        lines = [f"digraph {quote(name)} {{"]
+        lines.extend(f"    {quote(node)};" for node in self._nodes)
+        lines.extend(
+            f"    {quote(source)} -> {quote(target)};" for source, target in self.edges
+        )
+        lines.append("}")
+        return "\n".join(lines) + "\n"
@@ -12,23 +12,33 @@ import functools
 import inspect
 import json
 import logging
-import multiprocessing
 import os
+import queue
 import random
 import re
+import signal
+import socket
 import subprocess
 import sys
 import threading
 import time
 import traceback
 import warnings
-from collections import Counter, OrderedDict, defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
 from copy import deepcopy
 from enum import IntFlag
 from hashlib import sha1
 from itertools import count, groupby, islice
-from multiprocessing import Event, Pool, TimeoutError, cpu_count
-from multiprocessing.pool import ThreadPool
+from multiprocessing import (
+    Event,
+    Pipe,
+    Pool,
+    Process,
+    TimeoutError,
+    cpu_count,
+    current_process,
+)
+from multiprocessing.pool import ExceptionWithTraceback, ThreadPool
 
 import jinja2
 import signac
@@ -39,6 +49,7 @@ from signac.contrib.hashing import calc_id
 from signac.contrib.project import JobsCursor
 from tqdm import tqdm
 
+from .directives import _evaluate as _evaluate_directive
 from .environment import get_environment
 from .errors import (
     ConfigKeyError,
@@ -48,23 +59,34 @@ from .errors import (
     UserConditionError,
     UserOperationError,
 )
+from .graph import OperationGraph
 from .labels import _is_label_func, classlabel, label, staticlabel
 from .render_status import Renderer as StatusRenderer
 from .scheduling.base import ClusterJob, JobStatus
 from .scheduling.status import update_status
 from .util import config as flow_config
 from .util import template_filters as tf
+from .util.async_commands import run_commands
 from .util.misc import (
     TrackGetItemDict,
+    _dump_json_atomically,
+    _format_table,
+    _Profiler,
     _positive_int,
     add_cwd_to_environment_pythonpath,
     roundrobin,
     switch_to_directory,
     to_hashable,
 )
+from .util.resources import LocalResources, allocated
 from .util.translate import abbreviate, shorten
 from .version import __version__
 
+try:
+    import resource
+except ImportError:  # The resource module is not available on Windows.
+    resource = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -152,15 +174,23 @@ class _condition:
     # are found to be equal by the graph detection algorithm.
     current_arbitrary_tag = 0
 
-    def __init__(self, condition, tag=None):
-        """Add tag to differentiate built-in conditions during graph detection."""
+    def __init__(self, condition, tag=None, volatile=False):
+        """Add tag to differentiate built-in conditions during graph detection.
+
+        Conditions that depend on state outside of the job's workspace and
+        document should be marked as volatile, so that their results are
+        never stored in the persistent condition cache.
+        """
 
         if tag is None:
             try:
-                tag = condition.__code__.co_code
+                # Batch conditions are tagged by the code of the batch function.
+                tag = getattr(condition, "_flow_batch", condition).__code__.co_code
             except AttributeError:
                 logger.warning(f"Condition {condition} could not autogenerate tag.")
         condition._flow_tag = tag
+        if volatile:
+            condition._flow_volatile = True
         self.condition = condition
 
     @classmethod
@@ -170,6 +200,7 @@ class _condition:
         def _isfile(*jobs):
             return all(job.isfile(filename) for job in jobs)
 
+        _isfile._flow_builtin = ("isfile", filename)
         return cls(_isfile, "isfile_" + filename)
 
     @classmethod
@@ -180,6 +211,7 @@ class _condition:
         def _document(*jobs):
             return all(job.document.get(key, False) for job in jobs)
 
+        _document._flow_builtin = ("true", key)
         return cls(_document, "true_" + key)
 
     @classmethod
@@ -190,8 +222,25 @@ class _condition:
         def _no_document(*jobs):
             return all(not job.document.get(key, False) for job in jobs)
 
+        _no_document._flow_builtin = ("false", key)
         return cls(_no_document, "false_" + key)
 
+    @classmethod
+    def batch(cls, condition, tag=None, volatile=False):
+        """True if the batch condition is met for this job.
+
+        The batch condition is called with a sequence of jobs and must return
+        a sequence of booleans (e.g. a list or a NumPy array) of the same
+        length. Within one evaluation pass, it is called once for all selected
+        jobs instead of once per job.
+        """
+
+        def _batch(*jobs):
+            return all(_evaluate_batch_condition(condition, jobs))
+
+        _batch._flow_batch = condition
+        return cls(_batch, tag, volatile)
+
     @classmethod
     def never(cls, func):
         "Returns False."
@@ -203,7 +252,7 @@ class _condition:
         """Returns ``not condition(job)`` for the provided condition function."""
 
         def _not(*jobs):
-            return not condition(*jobs)
+            return not _evaluate_condition(condition, jobs)
 
         return cls(_not, b"not_" + condition.__code__.co_code)
 
@@ -215,12 +264,166 @@ def _create_all_metacondition(condition_dict, *other_funcs):
     condition_list = [c for f in other_funcs for c in condition_dict[f]]
 
     def _flow_metacondition(*jobs):
-        return all(c(*jobs) for c in condition_list)
+        return all(_evaluate_condition(c, jobs) for c in condition_list)
 
     _flow_metacondition._composed_of = condition_list
     return _flow_metacondition
 
 
+def _evaluate_batch_condition(condition, jobs):
+    """Evaluate a batch condition and return a list with one result per job."""
+    results = [bool(result) for result in condition(list(jobs))]
+    if len(results) != len(jobs):
+        raise ValueError(
+            "The batch condition {} returned {} results for {} jobs.".format(
+                getattr(condition, "__name__", condition), len(results), len(jobs)
+            )
+        )
+    return results
+
+
+def _get_resource_metrics(usage):
+    """Return the CPU time and the maximum resident set size of a resource usage.
+
+    :param usage:
+        The resource usage, as returned by :func:`resource.getrusage` or
+        :func:`os.wait4`.
+    :type usage:
+        :class:`resource.struct_rusage`
+    :return:
+        The CPU time in seconds and the max RSS in kilobytes.
+    :rtype:
+        tuple
+    """
+    # The max RSS is reported in bytes on macOS and in kilobytes otherwise.
+    scale = 1024 if sys.platform == "darwin" else 1
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss / scale
+
+
+def _get_cpu_time():
+    """Return the CPU time of this process in seconds, or None if not available."""
+    if resource is None:
+        return None
+    return _get_resource_metrics(resource.getrusage(resource.RUSAGE_SELF))[0]
+
+
+def _run_command(cmd, timeout=None):
+    """Execute a shell command like ``subprocess.run(cmd, shell=True, check=True)``.
+
+    Unlike :func:`subprocess.run`, the terminated process is waited for with
+    :func:`os.wait4` to obtain the resource usage of the process itself,
+    instead of the accumulated usage of all children of this process.
+
+    :param cmd:
+        The shell command.
+    :type cmd:
+        str
+    :param timeout:
+        The time in seconds after which the process is killed (Default value
+        = None).
+    :type timeout:
+        float
+    :return:
+        The resource usage of the process, or None if not available.
+    :rtype:
+        :class:`resource.struct_rusage`
+    :raises subprocess.CalledProcessError:
+        If the command exits with a non-zero status.
+    :raises subprocess.TimeoutExpired:
+        If the command does not complete within the timeout.
+    """
+    if resource is None or not hasattr(os, "wait4"):
+        subprocess.run(cmd, shell=True, timeout=timeout, check=True)
+        return None
+    process = subprocess.Popen(cmd, shell=True)
+    result = []
+    # The process is reaped by the waiting thread only, Popen.wait() and
+    # Popen.kill() would reap it without reporting its resource usage.
+    waiter = threading.Thread(
+        target=lambda: result.append(os.wait4(process.pid, 0)), daemon=True
+    )
+    waiter.start()
+    try:
+        waiter.join(timeout)
+        if waiter.is_alive():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+    except BaseException:
+        if waiter.is_alive():
+            os.kill(process.pid, signal.SIGKILL)
+            waiter.join()
+        raise
+    _, status, usage = result[0]
+    process.returncode = (
+        -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+    )
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+    return usage
+
+
+def _percentile(values, q):
+    """Return the q-th percentile of sorted values by linear interpolation."""
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _summarize_metrics(records, names=None):
+    """Aggregate the runtime metrics of operations per operation.
+
+    The percentiles of the wall time and the mean CPU time are computed for
+    the successful executions. The throughput is the number of successful
+    executions per hour between the first start and the last end.
+
+    :param records:
+        The metrics records, see :meth:`FlowProject._recording_metrics`.
+    :type records:
+        Iterable of :class:`dict`
+    :param names:
+        Only summarize the operations with the given names, or all if None.
+    :type names:
+        Sequence of :class:`str`
+    :return:
+        The summary of each operation, sorted by name.
+    :rtype:
+        list
+    """
+    operations = defaultdict(list)
+    for record in records:
+        if names is None or record["operation"] in names:
+            operations[record["operation"]].append(record)
+    summary = []
+    for name, records in sorted(operations.items()):
+        succeeded = [record for record in records if record["status"] == 0]
+        wall_times = sorted(record["wall_time"] for record in succeeded)
+        cpu_times = [
+            record["cpu_time"] for record in succeeded if record["cpu_time"] is not None
+        ]
+        max_rss = [
+            record["max_rss"] for record in records if record["max_rss"] is not None
+        ]
+        span = max(record["end"] for record in records) - min(
+            record["start"] for record in records
+        )
+        summary.append(
+            {
+                "operation": name,
+                "runs": len(records),
+                "failed": len(records) - len(succeeded),
+                "wall_time": {
+                    f"p{q}": _percentile(wall_times, q) if wall_times else None
+                    for q in (50, 90, 99, 100)
+                },
+                "cpu_time": sum(cpu_times) / len(cpu_times) if cpu_times else None,
+                "max_rss": max(max_rss) if max_rss else None,
+                "hosts": sorted({record["host"] for record in records}),
+                "throughput": 3600 * len(succeeded) / span if span > 0 else None,
+            }
+        )
+    return summary
+
+
 def _make_bundles(operations, size=None):
     """Utility function for the generation of bundles.
 
@@ -250,10 +453,15 @@ class _JobOperation:
         This class is used by the :class:`~.FlowGroup` class for the execution and
         submission process and should not be instantiated by users themselves.
 
+    The id, the command, and the directives can be provided as callables,
+    which are evaluated once upon first access. This allows to determine the
+    eligible operations without resolving their commands and directives.
+
     :param id:
-        The id of this _JobOperation instance. The id should be unique.
+        The id of this _JobOperation instance. The id should be unique. Can be a
+        callable that when evaluated returns a string.
     :type id:
-        str
+        callable or str
     :param name:
         The name of the _JobOperation.
     :type name:
@@ -270,11 +478,14 @@ class _JobOperation:
     :param directives:
         A :class:`flow.directives._Directives` object of additional parameters
         that provide instructions on how to execute this operation, e.g.,
-        specifically required resources.
+        specifically required resources. Can be a callable that when evaluated
+        returns a :class:`flow.directives._Directives` object.
     :type directives:
-        :class:`flow.directives._Directives`
+        callable or :class:`flow.directives._Directives`
     """
 
+    __slots__ = ("_id", "name", "_jobs", "_cmd", "_directives")
+
     def __init__(self, id, name, jobs, cmd, directives=None):
         self._id = id
         self.name = name
@@ -282,7 +493,13 @@ class _JobOperation:
         if not (callable(cmd) or isinstance(cmd, str)):
             raise ValueError("JobOperation cmd must be a callable or string.")
         self._cmd = cmd
+        if callable(directives):
+            self._directives = directives
+        else:
+            self._directives = self._track_directives(directives)
 
+    @staticmethod
+    def _track_directives(directives):
         # Keys which were explicitly set by the user, but are not evaluated by the
         # template engine are cause for concern and might hint at a bug in the template
         # script or ill-defined directives. We are therefore keeping track of all
@@ -293,10 +510,11 @@ class _JobOperation:
         # We use a special dictionary that allows us to track all keys that have been
         # evaluated by the template engine and compare them to those explicitly set
         # by the user. See also comment above.
-        self.directives = TrackGetItemDict(
+        tracked_directives = TrackGetItemDict(
             {key: value for key, value in directives.items()}
         )
-        self.directives._keys_set_by_user = keys_set_by_user
+        tracked_directives._keys_set_by_user = keys_set_by_user
+        return tracked_directives
 
     def __str__(self):
         assert len(self._jobs) == 1
@@ -319,6 +537,8 @@ class _JobOperation:
 
     @property
     def id(self):
+        if callable(self._id):
+            self._id = self._id()
         return self._id
 
     @property
@@ -330,9 +550,14 @@ class _JobOperation:
             # If we need to fork this will fail to generate a command and
             # error, but not until then. If we don't fork then nothing errors,
             # and the user gets the expected result.
-            return self._cmd()
-        else:
-            return self._cmd
+            self._cmd = self._cmd()
+        return self._cmd
+
+    @property
+    def directives(self):
+        if callable(self._directives):
+            self._directives = self._track_directives(self._directives())
+        return self._directives
 
     def set_status(self, value):
         "Store the operation's status."
@@ -354,6 +579,43 @@ class _JobOperation:
             return JobStatus.unknown
 
 
+class _RunJobOperation(_JobOperation):
+    R"""A :class:`_JobOperation` for the execution of one operation of a group.
+
+    The directives of the operation determine the prefix of its command, e.g.,
+    to launch it with MPI, in which case the operation must be forked. The
+    prefix is determined once the directives are resolved.
+
+    :param \*args:
+        Passed to the constructor of :py:class:`_JobOperation`, where the
+        command is a callable that is evaluated with the directives.
+    """
+
+    __slots__ = ("_prefix",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prefix = ""
+
+    @property
+    def directives(self):
+        if callable(self._directives):
+            directives = super().directives
+            # Get the prefix, and if it's not NULL, set the fork directive
+            # to True since we must launch a separate process.
+            self._prefix = self._jobs[0]._project._environment.get_prefix(self)
+            if self._prefix != "":
+                directives["fork"] = True
+        return self._directives
+
+    @property
+    def cmd(self):
+        if callable(self._cmd):
+            cmd = self._cmd(directives=self.directives)
+            self._cmd = f"{self._prefix} {cmd}" if self._prefix != "" else cmd
+        return self._cmd
+
+
 @deprecated(deprecated_in="0.11", removed_in="0.13", current_version=__version__)
 class JobOperation(_JobOperation):
     """This class represents the information needed to execute one group for one job.
@@ -415,10 +677,10 @@ class JobOperation(_JobOperation):
         # We use a special dictionary that allows us to track all keys that have been
         # evaluated by the template engine and compare them to those explicitly set
         # by the user. See also comment above.
-        self.directives = TrackGetItemDict(
+        self._directives = TrackGetItemDict(
             {key: value for key, value in directives.items()}
         )
-        self.directives._keys_set_by_user = keys_set_by_user
+        self._directives._keys_set_by_user = keys_set_by_user
 
     @property
     def job(self):
@@ -494,6 +756,668 @@ class _SubmissionJobOperation(_JobOperation):
             self.operations_with_met_postconditions = operations_with_met_postconditions
 
 
+class _ConditionCache:
+    """Memoize the results of condition functions for the duration of one pass.
+
+    Eligibility, completion, status, and submission checks evaluate the same
+    conditions for the same jobs many times, for example when an operation's
+    post-conditions are reused by another operation's ``pre.after``
+    condition. Within one pass over the workflow the state of the data space
+    is assumed to be constant, so each condition needs to be evaluated at most
+    once per job-aggregate.
+
+    Results are keyed by the condition function itself and the ids of the
+    jobs. Condition tags are not suitable as keys, because conditions created
+    from the same code (e.g. lambdas closing over different variables) share
+    the same tag.
+
+    Batch conditions (see :meth:`~._condition.batch`) are evaluated once for
+    all jobs of the selection, as soon as the result for any one of them is
+    requested. The built-in ``isfile``, ``true``, and ``false`` conditions
+    are answered from one snapshot per job (see :class:`~._JobSnapshot`) that
+    is shared by all built-in conditions.
+
+    An instance of this class is picklable, but it is always unpickled as a
+    cache that only retains the results of batch conditions.
+
+    :param store:
+        An optional persistent store that results of single-job conditions
+        are looked up from and saved to.
+    :type store:
+        :class:`~._ConditionStore`
+    :param jobs:
+        The selection of jobs that batch conditions are evaluated for.
+    :type jobs:
+        iterable of :class:`~signac.contrib.job.Job`
+    :param profiler:
+        An optional profiler that records the runtime of each evaluation.
+    :type profiler:
+        :class:`~.util.misc._Profiler`
+    :param statistics:
+        Optional statistics that the cost and result of each evaluation are
+        recorded in.
+    :type statistics:
+        :class:`~._ConditionStatistics`
+    :param dependencies:
+        Optional dependencies between operations, which are used to infer the
+        completion of operations, see :meth:`~.complete`.
+    :type dependencies:
+        :class:`~._OperationDependencies`
+    """
+
+    def __init__(
+        self, store=None, jobs=None, profiler=None, statistics=None, dependencies=None
+    ):
+        self._results = dict()
+        self._store = store
+        self._fingerprints = dict()
+        self._snapshots = dict()
+        self._selection = jobs
+        self._batch_results = dict()
+        self._batch_lock = threading.Lock()
+        self._profiler = profiler
+        self._statistics = statistics
+        self._dependencies = dependencies
+        self._completed = dict()
+        # The keys of the results by job id, indexed once results are
+        # invalidated, see invalidate().
+        self._job_keys = None
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+
+    def __reduce__(self):
+        return (type(self), (), {"_batch_results": self._batch_results})
+
+    def __len__(self):
+        return len(self._results)
+
+    def evaluate(self, condition, jobs):
+        """Return the (possibly cached) result of ``condition(*jobs)``."""
+        key = (condition, tuple(job.get_id() for job in jobs))
+        try:
+            result = self._results[key]
+        except KeyError:
+            start = time.perf_counter()
+            try:
+                # Metaconditions are not profiled, their components are.
+                if self._profiler is None or hasattr(condition, "_composed_of"):
+                    result = self._evaluate(condition, jobs)
+                else:
+                    with self._profiler.record(
+                        "condition", _describe_condition(condition)
+                    ):
+                        result = self._evaluate(condition, jobs)
+            except Exception:
+                if self._statistics is not None:
+                    self._statistics.record_error(condition)
+                raise
+            if self._statistics is not None:
+                self._statistics.record(condition, result, time.perf_counter() - start)
+            self._results[key] = result
+            self._index(key)
+        else:
+            self.hits += 1
+        return result
+
+    def _evaluate(self, condition, jobs):
+        if self._dependencies is not None:
+            operations = self._dependencies.after.get(condition)
+            if operations is not None:
+                return all(self.complete(op, jobs) for op in operations)
+        batch_condition = getattr(condition, "_flow_batch", None)
+        if batch_condition is not None:
+            return all(self._evaluate_batch(batch_condition, jobs))
+        builtin = getattr(condition, "_flow_builtin", None)
+        if builtin is not None:
+            return all(self._get_snapshot(job).evaluate(*builtin) for job in jobs)
+        store = self._store
+        if store is None or len(jobs) != 1 or not store.stores(condition):
+            self.misses += 1
+            return condition(*jobs)
+        job = jobs[0]
+        job_id = job.get_id()
+        try:
+            fingerprint = self._fingerprints[job_id]
+        except KeyError:
+            fingerprint = self._fingerprints[job_id] = _job_fingerprint(job)
+        result = store.get(condition, job_id, fingerprint)
+        if result is None:
+            self.misses += 1
+            result = condition(*jobs)
+            store.set(condition, job_id, fingerprint, result)
+        else:
+            self.store_hits += 1
+        return result
+
+    def complete(self, operation, jobs):
+        """Return whether the operation is complete for the given jobs.
+
+        If the dependencies between operations are provided, the completion
+        of an operation implies the completion of all operations it depends
+        on, and an incomplete operation implies that all operations depending
+        on it are incomplete as well.
+        """
+        key = (operation, tuple(job.get_id() for job in jobs))
+        try:
+            return self._completed[key]
+        except KeyError:
+            complete = self._completed[key] = operation._postconds_met(jobs)
+            self._index(key)
+        if self._dependencies is not None:
+            if complete:
+                implied = self._dependencies.ancestors.get(operation, ())
+            else:
+                implied = self._dependencies.descendants.get(operation, ())
+            for op in implied:
+                if (op, key[1]) not in self._completed:
+                    self._completed[op, key[1]] = complete
+                    self._index((op, key[1]))
+        return complete
+
+    def known_complete(self, operation, jobs):
+        "Return whether the operation is complete if known, otherwise None."
+        if self._dependencies is None:
+            return None
+        return self._completed.get((operation, tuple(job.get_id() for job in jobs)))
+
+    def evaluate_operations(self, jobs):
+        """Determine the completion of all dependent operations for the given jobs.
+
+        The operations are visited in topological order, such that the
+        completion of operations that depend on an incomplete operation is
+        never evaluated.
+        """
+        if self._dependencies is not None:
+            for operation in self._dependencies.order:
+                self.complete(operation, jobs)
+
+    def export_results(self, condition_keys):
+        """Return the results of all conditions that have a stable key.
+
+        :param condition_keys:
+            A mapping of condition functions to keys that are stable across
+            processes, see :meth:`~.FlowProject._get_condition_keys`.
+        :type condition_keys:
+            dict
+        :return:
+            Tuples of the condition key, the job ids, and the result.
+        :rtype:
+            list
+        """
+        return [
+            (condition_keys[condition], job_ids, bool(result))
+            for (condition, job_ids), result in self._results.items()
+            if condition in condition_keys
+        ]
+
+    def import_results(self, results, condition_keys):
+        """Add results exported by another cache, see :meth:`~.export_results`."""
+        conditions = {key: condition for condition, key in condition_keys.items()}
+        for key, job_ids, result in results:
+            if (conditions[key], job_ids) not in self._results:
+                self._results[conditions[key], job_ids] = result
+                self._index((conditions[key], job_ids))
+
+    def invalidate(self, jobs):
+        """Discard the results for all job-aggregates that contain any of the jobs.
+
+        The results for other jobs are retained, such that the cache remains
+        valid after only the given jobs were modified.
+
+        :param jobs:
+            The modified jobs.
+        :type jobs:
+            iterable of :class:`~signac.contrib.job.Job`
+        """
+        if self._job_keys is None:
+            self._job_keys = defaultdict(set)
+            for key in list(self._results) + list(self._completed):
+                self._index(key)
+        for job in jobs:
+            job_id = job.get_id()
+            for key in self._job_keys.pop(job_id, ()):
+                self._results.pop(key, None)
+                self._completed.pop(key, None)
+            self._fingerprints.pop(job_id, None)
+            self._snapshots.pop(job_id, None)
+            for results in self._batch_results.values():
+                results.pop(job_id, None)
+
+    def _index(self, key):
+        if self._job_keys is not None:
+            for job_id in key[1]:
+                self._job_keys[job_id].add(key)
+
+    def _get_snapshot(self, job):
+        job_id = job.get_id()
+        try:
+            return self._snapshots[job_id]
+        except KeyError:
+            snapshot = self._snapshots[job_id] = _JobSnapshot(job)
+            return snapshot
+
+    def _evaluate_batch(self, batch_condition, jobs):
+        with self._batch_lock:
+            results = self._batch_results.get(batch_condition)
+            if results is None:
+                results = self._batch_results[batch_condition] = dict()
+                pending = dict()
+            else:
+                pending = {
+                    job.get_id(): job for job in jobs if job.get_id() not in results
+                }
+                if not pending:
+                    return [results[job.get_id()] for job in jobs]
+            # Evaluate the condition for all selected jobs that are not yet
+            # evaluated, in addition to the requested jobs.
+            if self._selection is not None:
+                if not isinstance(self._selection, list):
+                    self._selection = list(self._selection)
+                for job in self._selection:
+                    job_id = job.get_id()
+                    if job_id not in results:
+                        pending.setdefault(job_id, job)
+            for job in jobs:
+                pending.setdefault(job.get_id(), job)
+            if pending:
+                self.misses += 1
+                results.update(
+                    zip(
+                        pending,
+                        _evaluate_batch_condition(batch_condition, pending.values()),
+                    )
+                )
+            return [results[job.get_id()] for job in jobs]
+
+    def prime(self, batch_conditions):
+        """Evaluate the given batch conditions for all selected jobs."""
+        for batch_condition in batch_conditions:
+            self._evaluate_batch(batch_condition, ())
+
+
+class _JobSnapshot:
+    """Answer the built-in conditions of a job with a minimum of file system access.
+
+    Each directory of the workspace is listed at most once with
+    :func:`os.scandir` and the job document is loaded at most once, no
+    matter how many built-in conditions are evaluated for the job.
+
+    :param job:
+        The signac job handle.
+    :type job:
+        :class:`~signac.contrib.job.Job`
+    """
+
+    def __init__(self, job):
+        self._job = job
+        self._entries = dict()
+        self._document = None
+
+    def isfile(self, filename):
+        "True if the specified file exists in the job's workspace."
+        dirname, basename = os.path.split(filename)
+        try:
+            entries = self._entries[dirname]
+        except KeyError:
+            try:
+                with os.scandir(os.path.join(self._job.workspace(), dirname)) as it:
+                    entries = {entry.name: entry for entry in it}
+            except (FileNotFoundError, NotADirectoryError):
+                entries = dict()
+            self._entries[dirname] = entries
+        entry = entries.get(basename)
+        return entry is not None and entry.is_file()
+
+    @property
+    def document(self):
+        "A copy of the job document."
+        if self._document is None:
+            self._document = self._job.document()
+        return self._document
+
+    def evaluate(self, kind, arg):
+        "Evaluate the built-in condition of the given kind."
+        if kind == "isfile":
+            return self.isfile(arg)
+        value = bool(self.document.get(arg, False))
+        return value if kind == "true" else not value
+
+
+def _job_fingerprint(job):
+    """Return a fingerprint of the files at the top-level of a job's workspace.
+
+    The fingerprint is derived from the modification time of the workspace
+    directory, which changes whenever files are added to or removed from the
+    top-level of the workspace, and from the modification time and size of
+    each top-level entry, such as the job document and the job data, which
+    change whenever a file is modified in place. Files within subdirectories
+    are not captured.
+    """
+    workspace = job.workspace()
+    try:
+        fingerprint = [os.stat(workspace).st_mtime_ns]
+        with os.scandir(workspace) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # The file was removed concurrently.
+                fingerprint.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
+        return None
+    fingerprint[1:] = sorted(fingerprint[1:])
+    return sha1(repr(fingerprint).encode("utf-8")).hexdigest()
+
+
+class _ConditionStore:
+    """Persistent storage of condition results for individual jobs.
+
+    The results of each job's conditions are stored together with the job's
+    fingerprint (see :func:`~._job_fingerprint`) and are discarded as soon as
+    the fingerprint changes. All results are discarded if the signature of the
+    workflow definition changes.
+
+    Metaconditions (e.g. ``pre.after``), batch conditions, built-in conditions
+    (which are cheap to evaluate, see :class:`~._JobSnapshot`), and volatile
+    conditions are never stored.
+
+    An instance of this class is picklable, but it is always unpickled as a
+    store without any conditions.
+
+    :param filename:
+        The file used to persist the results.
+    :type filename:
+        str
+    :param signature:
+        The signature of the workflow definition.
+    :type signature:
+        str
+    :param condition_keys:
+        A mapping of condition functions to unique keys that are stable
+        across invocations.
+    :type condition_keys:
+        dict
+    """
+
+    def __init__(self, filename=None, signature=None, condition_keys=None):
+        self._filename = filename
+        self._signature = signature
+        self._keys = dict() if condition_keys is None else condition_keys
+        self._jobs = dict()
+        self._modified = False
+        if filename is not None:
+            self._load()
+
+    def __reduce__(self):
+        return (type(self), ())
+
+    def _load(self):
+        try:
+            with open(self._filename) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            logger.warning(f"Discarding corrupted condition cache '{self._filename}'.")
+            return
+        if data.get("signature") == self._signature:
+            self._jobs = data["jobs"]
+        else:
+            logger.info("The workflow definition changed, discarding condition cache.")
+
+    def save(self):
+        """Write the results to disk if they have been modified."""
+        if self._filename is not None and self._modified:
+            _dump_json_atomically(
+                {"signature": self._signature, "jobs": self._jobs}, self._filename
+            )
+            self._modified = False
+
+    def clear(self):
+        """Discard all stored results."""
+        self._modified = self._modified or bool(self._jobs)
+        self._jobs.clear()
+
+    def stores(self, condition):
+        """Determine whether results of this condition are stored."""
+        return condition in self._keys
+
+    def get(self, condition, job_id, fingerprint):
+        """Return the stored result or None if there is no valid result."""
+        entry = self._jobs.get(job_id)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            return entry["conditions"].get(self._keys[condition])
+        return None
+
+    def set(self, condition, job_id, fingerprint, result):
+        """Store the result of a condition for a job with a given fingerprint."""
+        entry = self._jobs.get(job_id)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            entry = self._jobs[job_id] = {"fingerprint": fingerprint, "conditions": {}}
+        entry["conditions"][self._keys[condition]] = bool(result)
+        self._modified = True
+
+
+def _describe_condition(condition):
+    "Return a human-readable description of a condition function."
+    builtin = getattr(condition, "_flow_builtin", None)
+    if builtin is not None:
+        return "{}({!r})".format(*builtin)
+    condition = getattr(condition, "_flow_batch", condition)
+    description = getattr(condition, "__name__", repr(condition))
+    code = getattr(condition, "__code__", None)
+    if code is not None:
+        description += " ({}:{})".format(
+            os.path.basename(code.co_filename), code.co_firstlineno
+        )
+    return description
+
+
+class _ConditionStatistics:
+    """Persistent statistics of the cost and the results of conditions.
+
+    The statistics are used to order the evaluation of conditions such that
+    the expected cost of the short-circuit evaluation of an operation's
+    conditions is minimized, see :meth:`~.sort`. Conditions that raised an
+    error are recorded as well, since they may rely on the conditions
+    declared before them. All statistics are discarded if the signature of
+    the workflow definition changes.
+
+    An instance of this class is picklable, but it is always unpickled without
+    any statistics.
+
+    :param filename:
+        The file used to persist the statistics.
+    :type filename:
+        str
+    :param signature:
+        The signature of the workflow definition.
+    :type signature:
+        str
+    :param condition_keys:
+        A mapping of condition functions to unique keys that are stable
+        across invocations.
+    :type condition_keys:
+        dict
+    """
+
+    def __init__(self, filename=None, signature=None, condition_keys=None):
+        self._filename = filename
+        self._signature = signature
+        self._keys = dict() if condition_keys is None else condition_keys
+        self._stats = dict()
+        self._errors = set()
+        self._lock = threading.Lock()
+        self._modified = False
+        if filename is not None:
+            self._load()
+
+    def __reduce__(self):
+        return (type(self), ())
+
+    def _load(self):
+        try:
+            with open(self._filename) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            logger.warning(
+                f"Discarding corrupted condition statistics '{self._filename}'."
+            )
+            return
+        if data.get("signature") == self._signature:
+            self._stats = data["conditions"]
+            self._errors = set(data.get("errors", ()))
+
+    def save(self):
+        """Write the statistics to disk if they have been modified."""
+        if self._filename is not None and self._modified:
+            with self._lock:
+                data = {
+                    "signature": self._signature,
+                    "conditions": self._stats,
+                    "errors": sorted(self._errors),
+                }
+                _dump_json_atomically(data, self._filename)
+                self._modified = False
+
+    def record(self, condition, result, elapsed):
+        """Record the result of one evaluation and the time it took."""
+        key = self._keys.get(condition)
+        if key is not None:
+            with self._lock:
+                stats = self._stats.setdefault(key, [0, 0, 0.0])
+                stats[0] += 1
+                stats[1] += not result
+                stats[2] += elapsed
+                self._modified = True
+
+    def record_error(self, condition):
+        """Record that the evaluation of the condition raised an error."""
+        key = self._keys.get(condition)
+        if key is not None and key not in self._errors:
+            with self._lock:
+                self._errors.add(key)
+                self._modified = True
+
+    def expected_cost(self, condition):
+        """Return the expected cost of evaluating the condition until it fails.
+
+        Conditions without statistics have an expected cost of zero, so that
+        they are evaluated first and statistics are recorded for them.
+        """
+        stats = self._stats.get(self._keys.get(condition))
+        if not stats:
+            return 0.0
+        calls, failures, elapsed = stats
+        if not failures:
+            return float("inf")
+        return elapsed / failures
+
+    def sort(self, conditions):
+        """Sort conditions (instances of :class:`~._FlowCondition`) by expected cost.
+
+        Evaluating the conditions in this order minimizes the expected cost
+        of the evaluation of ``all(conditions)`` and ``any(not conditions)``.
+        Conditions with equal expected cost retain their order. A condition
+        that raised an error is evaluated after all conditions declared before
+        it, since these may guard it, e.g., by checking that a file exists
+        before it is read.
+        """
+        result = []
+        segment = []
+        for condition in conditions:
+            if self._keys.get(condition._callback) in self._errors:
+                result.extend(
+                    sorted(segment, key=lambda c: self.expected_cost(c._callback))
+                )
+                result.append(condition)
+                segment = []
+            else:
+                segment.append(condition)
+        result.extend(sorted(segment, key=lambda c: self.expected_cost(c._callback)))
+        return result
+
+
+class _OperationDependencies:
+    """The dependencies between operations defined by ``pre.after`` conditions.
+
+    Operation B depends on operation A, if B has a ``pre.after(A)`` condition
+    and A has post-conditions. Assuming that operations are only executed in
+    the order of their dependencies and that the results of an operation are
+    not invalidated once a dependent operation is complete, the completion of
+    B implies the completion of A, and A being incomplete implies that B is
+    incomplete.
+
+    :param operations:
+        The operations of the project.
+    :type operations:
+        dict
+    :raises ValueError:
+        If the dependencies are cyclic.
+    """
+
+    def __init__(self, operations):
+        operation_functions = {
+            getattr(op, "_op_func", getattr(op, "_cmd", None)): op
+            for op in operations.values()
+        }
+        # Map pre.after conditions to the operations they depend on.
+        self.after = dict()
+        edges = []
+        for op in operations.values():
+            for condition in op._prereqs:
+                callback = condition._callback
+                funcs = getattr(callback, "_flow_after", None)
+                if not funcs:
+                    continue
+                after = [operation_functions.get(func) for func in funcs]
+                if all(other is not None and other._postconds for other in after):
+                    self.after[callback] = tuple(after)
+                    edges.extend((other, op) for other in after)
+
+        graph = OperationGraph(operations.values(), edges)
+        if not graph.is_acyclic():
+            raise ValueError("The pre.after conditions of operations are cyclic.")
+        self.order = graph.topological_order()
+        self.ancestors = {op: graph.ancestors(op) for op in self.order}
+        self.descendants = {op: graph.descendants(op) for op in self.order}
+
+
+def _known_complete(operation, jobs):
+    "Return whether the operation is known to be complete, or None if unknown."
+    cache = getattr(jobs[0]._project, "_condition_cache", None)
+    if cache is None:
+        return None
+    return cache.known_complete(operation, jobs)
+
+
+def _evaluate_condition(condition, jobs):
+    """Evaluate a condition function, using the project's cache if available."""
+    cache = getattr(jobs[0]._project, "_condition_cache", None)
+    if cache is None:
+        return condition(*jobs)
+    return cache.evaluate(condition, jobs)
+
+
+def _conditions_met(conditions, evaluation_order, jobs):
+    """Return whether all conditions are met, evaluated in the evaluation order.
+
+    If a condition raises an error while the evaluation order differs from the
+    order of declaration, the conditions are evaluated again in the order of
+    declaration, in which a condition may be guarded by the conditions that
+    are declared before it.
+    """
+    try:
+        return all(cond(jobs) for cond in evaluation_order)
+    except UserConditionError:
+        if evaluation_order == conditions:
+            raise
+        return all(cond(jobs) for cond in conditions)
+
+
 class _FlowCondition:
     """A _FlowCondition represents a condition as a function of a signac job.
 
@@ -512,7 +1436,7 @@ class _FlowCondition:
 
     def __call__(self, jobs):
         try:
-            return self._callback(*jobs)
+            return _evaluate_condition(self._callback, jobs)
         except Exception as e:
             assert len(jobs) == 1
             raise UserConditionError(
@@ -570,6 +1494,11 @@ class BaseFlowOperation:
         self._prereqs = [_FlowCondition(cond) for cond in pre]
         self._postconds = [_FlowCondition(cond) for cond in post]
 
+        # The order in which the conditions are evaluated, which may differ
+        # from the order of declaration, see FlowProject._order_conditions().
+        self._prereqs_evaluation_order = self._prereqs
+        self._postconds_evaluation_order = self._postconds
+
     def __str__(self):
         return "{type}(cmd='{cmd}')".format(type=type(self).__name__, cmd=self._cmd)
 
@@ -592,15 +1521,23 @@ class BaseFlowOperation:
                 "The ignore_conditions argument of FlowProject.run() "
                 "must be a member of class IgnoreConditions"
             )
+        if len(self._postconds) and not ignore_conditions & IgnoreConditions.POST:
+            # The completion may be known from the operation graph, see
+            # _ConditionCache.complete().
+            complete = _known_complete(self, jobs)
+            if complete:
+                return False
+            elif complete is False:
+                ignore_conditions |= IgnoreConditions.POST
         # len(self._prereqs) check for speed optimization
         pre = (
             (not len(self._prereqs))
             or (ignore_conditions & IgnoreConditions.PRE)
-            or all(cond(jobs) for cond in self._prereqs)
+            or _conditions_met(self._prereqs, self._prereqs_evaluation_order, jobs)
         )
         if pre and len(self._postconds):
-            post = (ignore_conditions & IgnoreConditions.POST) or any(
-                not cond(jobs) for cond in self._postconds
+            post = (ignore_conditions & IgnoreConditions.POST) or not (
+                _conditions_met(self._postconds, self._postconds_evaluation_order, jobs)
             )
         else:
             post = True
@@ -625,10 +1562,16 @@ class BaseFlowOperation:
     def _complete(self, jobs):
         "True when all post-conditions are met."
         if len(self._postconds):
-            return all(cond(jobs) for cond in self._postconds)
+            cache = getattr(jobs[0]._project, "_condition_cache", None)
+            if cache is not None:
+                return cache.complete(self, jobs)
+            return self._postconds_met(jobs)
         else:
             return False
 
+    def _postconds_met(self, jobs):
+        return _conditions_met(self._postconds, self._postconds_evaluation_order, jobs)
+
     @deprecated(deprecated_in="0.11", removed_in="0.13", current_version=__version__)
     def complete(self, job):
         "True when all post-conditions are met."
@@ -845,6 +1788,8 @@ class FlowGroup:
             self.operation_directives = dict()
         else:
             self.operation_directives = operation_directives
+        # The resolved directives of each operation, see _resolve_directives.
+        self._resolved_directives = dict()
 
     def _set_entrypoint_item(self, entrypoint, directives, key, default, jobs):
         """Set a value (executable, path) for entrypoint in command.
@@ -854,7 +1799,7 @@ class FlowGroup:
         """
         entrypoint[key] = directives.get(key, entrypoint.get(key, default))
         if callable(entrypoint[key]):
-            entrypoint[key] = entrypoint[key](*jobs)
+            entrypoint[key] = _evaluate_directive(entrypoint[key], jobs)
 
     def _determine_entrypoint(self, entrypoint, directives, jobs):
         """Get the entrypoint for creating a _JobOperation.
@@ -875,12 +1820,19 @@ class FlowGroup:
         return "{} {}".format(entrypoint["executable"], entrypoint["path"]).lstrip()
 
     def _resolve_directives(self, name, defaults, env):
-        all_directives = env._get_default_directives()
         if name in self.operation_directives:
-            all_directives.update(self.operation_directives[name])
+            directives = self.operation_directives[name]
         else:
-            all_directives.update(defaults.get(name, dict()))
-        return all_directives
+            directives = defaults.get(name, dict())
+        # The directives of an operation are resolved once per environment and
+        # copied on write, only callable directives are evaluated per job.
+        cached = self._resolved_directives.get(name)
+        if cached is not None and cached[0] is env and cached[1] == directives:
+            return cached[2].copy()
+        all_directives = env._get_default_directives()
+        all_directives.update(directives)
+        self._resolved_directives[name] = (env, dict(directives), all_directives)
+        return all_directives.copy()
 
     def _submit_cmd(self, entrypoint, ignore_conditions, jobs=None):
         entrypoint = self._determine_entrypoint(entrypoint, dict(), jobs)
@@ -1021,6 +1973,21 @@ class FlowGroup:
 
     def _generate_id(self, jobs, operation_name=None, index=0):
         "Return an id, which identifies this group with respect to this job."
+        # The ids are cached by the project, since they are requested for the
+        # same groups and jobs many times, e.g., by status and submit.
+        project = jobs[0]._project
+        ids = getattr(project, "_operation_ids", None)
+        if ids is None:
+            return self._calc_id(jobs, operation_name, index)
+        key = (self.name, tuple(job.get_id() for job in jobs), operation_name, index)
+        try:
+            return ids[key]
+        except KeyError:
+            id_ = ids[key] = self._calc_id(jobs, operation_name, index)
+            return id_
+
+    def _calc_id(self, jobs, operation_name, index):
+        "Compute the id returned by :meth:`~._generate_id`."
         project = jobs[0]._project
 
         # The full name is designed to be truly unique for each job-group.
@@ -1065,10 +2032,12 @@ class FlowGroup:
 
     def _get_status(self, jobs):
         """For a given job-aggregate check the groups submission status."""
+        project = jobs[0]._project
+        status = getattr(project, "_status_snapshot", None)
         try:
-            return JobStatus(
-                jobs[0]._project.document["_status"][self._generate_id(jobs)]
-            )
+            if status is None:
+                status = project.document["_status"]
+            return JobStatus(status[self._generate_id(jobs)])
         except KeyError:
             return JobStatus.unknown
 
@@ -1155,7 +2124,7 @@ class FlowGroup:
         )
 
         submission_job_operation = _SubmissionJobOperation(
-            self._generate_id(jobs, index=index),
+            functools.partial(self._generate_id, jobs, index=index),
             self.name,
             jobs,
             cmd=uneval_cmd,
@@ -1203,32 +2172,29 @@ class FlowGroup:
         """
         # Assuming all the jobs belong to the same FlowProject
         env = jobs[0]._project._environment
+
+        def resolve_directives(name):
+            directives = self._resolve_directives(name, default_directives, env)
+            directives.evaluate(jobs)
+            return directives
+
+        # The id, the directives, and the command are only resolved when
+        # they are accessed, e.g., not for counting the eligible operations.
         for name, op in self.operations.items():
             if op._eligible(jobs, ignore_conditions):
-                directives = self._resolve_directives(name, default_directives, env)
-                directives.evaluate(jobs)
-                cmd = self._run_cmd(
-                    entrypoint=entrypoint,
-                    operation_name=name,
-                    operation=op,
-                    directives=directives,
-                    jobs=jobs,
-                )
-                job_op = _JobOperation(
-                    self._generate_id(jobs, name, index=index),
+                yield _RunJobOperation(
+                    functools.partial(self._generate_id, jobs, name, index=index),
                     name,
                     jobs,
-                    cmd=cmd,
-                    directives=deepcopy(directives),
+                    cmd=functools.partial(
+                        self._run_cmd,
+                        entrypoint=entrypoint,
+                        operation_name=name,
+                        operation=op,
+                        jobs=jobs,
+                    ),
+                    directives=functools.partial(resolve_directives, name),
                 )
-                # Get the prefix, and if it's not NULL, set the fork directive
-                # to True since we must launch a separate process. Override
-                # the command directly.
-                prefix = jobs[0]._project._environment.get_prefix(job_op)
-                if prefix != "":
-                    job_op.directives["fork"] = True
-                    job_op._cmd = f"{prefix} {job_op.cmd}"
-                yield job_op
 
     def _get_submission_directives(self, default_directives, jobs):
         """Get the combined resources for submission.
@@ -1306,12 +2272,17 @@ class _FlowProjectClass(type):
             are used by :meth:`~.detect_operation_graph` when comparing
             conditions for equality. The tag defaults to the bytecode of the
             function.
+
+            Conditions that depend on anything but the job's workspace and
+            document, e.g. on other jobs or external files, should be declared
+            with ``volatile=True`` to exclude them from the persistent
+            condition cache.
             """
 
             _parent_class = parent_class
 
-            def __init__(self, condition, tag=None):
-                super().__init__(condition, tag)
+            def __init__(self, condition, tag=None, volatile=False):
+                super().__init__(condition, tag, volatile)
 
             def __call__(self, func):
                 operation_functions = [
@@ -1349,11 +2320,12 @@ class _FlowProjectClass(type):
                     raise ValueError(
                         "The arguments to pre.after must be operation functions."
                     )
-                return cls(
-                    _create_all_metacondition(
-                        cls._parent_class._collect_post_conditions(), *other_funcs
-                    )
+                metacondition = _create_all_metacondition(
+                    cls._parent_class._collect_post_conditions(), *other_funcs
                 )
+                # Used to determine the dependencies between operations.
+                metacondition._flow_after = other_funcs
+                return cls(metacondition)
 
         return pre
 
@@ -1378,12 +2350,17 @@ class _FlowProjectClass(type):
             are used by :meth:`~.detect_operation_graph` when comparing
             conditions for equality. The tag defaults to the bytecode of the
             function.
+
+            Conditions that depend on anything but the job's workspace and
+            document, e.g. on other jobs or external files, should be declared
+            with ``volatile=True`` to exclude them from the persistent
+            condition cache.
             """
 
             _parent_class = parent_class
 
-            def __init__(self, condition, tag=None):
-                super().__init__(condition, tag)
+            def __init__(self, condition, tag=None, volatile=False):
+                super().__init__(condition, tag, volatile)
 
             def __call__(self, func):
                 operation_functions = [
@@ -1471,6 +2448,43 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         self._groups = dict()
         self._register_groups()
 
+        # The condition cache is only active during an evaluation pass, see
+        # _cached_conditions(). The persistent condition store is loaded
+        # lazily, unless disabled.
+        self._condition_cache = None
+        self._condition_store = None
+        # Callable directives are memoized during submission, see
+        # _cached_directives().
+        self._directive_cache = None
+        # The ids of the groups and operations for job-aggregates, see
+        # FlowGroup._generate_id().
+        self._operation_ids = dict()
+        # The status of submitted operations is read from a snapshot during
+        # submission, see _cached_status().
+        self._status_snapshot = None
+        self._condition_cache_mode = None
+        self._condition_statistics = None
+        self._operation_dependencies = None
+        self._operation_graph = None
+        self._worker_pools = None
+        # Whether the project can be serialized for worker processes, see
+        # _is_picklable().
+        self._picklable = None
+        # The failures of operations are indexed as the failure ledger is
+        # read, see _load_failure_ledger().
+        self._failure_index = None
+
+        # The profiler is only active while profiling the status, see
+        # print_status().
+        self._profiler = None
+
+    def __getstate__(self):
+        # Pools of worker processes are not shared with other processes.
+        state = self.__dict__.copy()
+        state["_worker_pools"] = None
+        state["_directive_cache"] = None
+        return state
+
     def _setup_template_environment(self):
         """Setup the jinja2 template environment.
 
@@ -1622,10 +2636,10 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         be executed in order to make the operation eligible so that the task of
         executing all necessary operations can be automated.
 
-        The graph is determined by iterating over all pairs of operations and
-        checking for equality of pre- and post-conditions. The algorithm builds
-        an adjacency matrix based on whether the pre-conditions for one
-        operation match the post-conditions for another. The comparison of
+        The graph is determined by checking for equality of pre- and
+        post-conditions. The algorithm builds an adjacency matrix based on
+        whether the pre-conditions for one operation match the post-conditions
+        for another. The comparison of
         operations is conservative; by default, conditions must be composed of
         identical code to be identified as equal (technically, they must be
         bytecode equivalent, i.e. ``cond1.__code__.co_code ==
@@ -1667,21 +2681,42 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
 
         """
 
-        def to_callbacks(conditions):
-            """Get the actual callables associated with FlowConditions."""
-            return [condition._callback for condition in conditions]
-
-        def unpack_conditions(condition_functions):
-            """Identify any metaconditions in the list and reduce them to the
-            functions that they are composed of. The callbacks argument is used
-            in recursive calls to the function and appended to directly, but
-            only returned at the end."""
-            callbacks = set()
-            for cf in condition_functions:
+        return self.get_operation_graph().to_adjacency_matrix()
+
+    def get_operation_graph(self):
+        """Return the graph defined by operation pre- and post-conditions.
+
+        The edges of the graph are determined as described for
+        :meth:`~.detect_operation_graph`. The graph is computed once and
+        cached, its nodes are the names of the operations in the order of
+        :attr:`~.operations`. The returned graph answers queries for the
+        upstream and downstream operations of an operation and can be
+        exported, for example with ``project.get_operation_graph().to_dot()``.
+
+        :return:
+            The graph of the operations.
+        :rtype:
+            :class:`~flow.graph.OperationGraph`
+        :raises RuntimeError:
+            If a condition does not have a tag.
+
+        """
+        if self._operation_graph is None:
+            self._operation_graph = self._detect_operation_graph()
+        return self._operation_graph
+
+    def _detect_operation_graph(self):
+        """Build the graph of operations from the tags of their conditions."""
+
+        def unpack_conditions(conditions):
+            """Identify any metaconditions and reduce them to the tags of the
+            functions that they are composed of."""
+            tags = set()
+            for cf in conditions:
                 # condition may not have __name__ attribute in cases where functools is used
                 # for condition creation
                 if hasattr(cf, "__name__") and cf.__name__ == "_flow_metacondition":
-                    callbacks = callbacks.union(unpack_conditions(cf._composed_of))
+                    tags.update(unpack_conditions(cf._composed_of))
                 else:
                     if cf._flow_tag is None:
                         raise RuntimeError(
@@ -1689,24 +2724,38 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                             "each base condition has a ``__code__`` attribute or "
                             "manually specified tag.".format(cf)
                         )
-                    callbacks.add(cf._flow_tag)
+                    tags.add(cf._flow_tag)
+            return tags
 
-            return callbacks
+        names = list(self.operations)
+        prereqs = dict()
+        postconds = dict()
+        for name, op in self.operations.items():
+            prereqs[name] = unpack_conditions(c._callback for c in op._prereqs)
+            postconds[name] = unpack_conditions(c._callback for c in op._postconds)
 
-        ops = list(self.operations.items())
-        mat = [[0 for _ in range(len(ops))] for _ in range(len(ops))]
+        # Index the operations by the tags of their pre-conditions, so that only
+        # operations sharing at least one tag are compared.
+        operations_by_prereq = defaultdict(set)
+        for name in names:
+            for tag in prereqs[name]:
+                operations_by_prereq[tag].add(name)
 
-        for i, (name1, op1) in enumerate(ops):
-            for j, (name2, op2) in enumerate(ops[i:]):
-                postconds1 = unpack_conditions(to_callbacks(op1._postconds))
-                postconds2 = unpack_conditions(to_callbacks(op2._postconds))
-                prereqs1 = unpack_conditions(to_callbacks(op1._prereqs))
-                prereqs2 = unpack_conditions(to_callbacks(op2._prereqs))
-                if postconds1.intersection(prereqs2):
-                    mat[i][j + i] = 1
-                elif prereqs1.intersection(postconds2):
-                    mat[j + i][i] = 1
-        return mat
+        index = {name: i for i, name in enumerate(names)}
+        edges = []
+        for name in names:
+            targets = set()
+            for tag in postconds[name]:
+                targets.update(operations_by_prereq[tag])
+            for target in sorted(targets, key=index.get):
+                # If two operations depend on each other, only the edge from the
+                # operation added first is part of the graph.
+                if index[target] < index[name] and postconds[target].intersection(
+                    prereqs[name]
+                ):
+                    continue
+                edges.append((name, target))
+        return OperationGraph(names, edges)
 
     def _register_class_labels(self):
         """This function registers all label functions, which are part of the class definition.
@@ -1752,6 +2801,170 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         "Return the canonical name to store bundle information."
         return os.path.join(self.root_directory(), ".bundles", bundle_id)
 
+    def _fn_condition_cache(self):
+        "Return the canonical name to store persistent condition results."
+        return os.path.join(self.root_directory(), ".flow", "condition_cache.json")
+
+    def _fn_metrics(self):
+        "Return the canonical name to store the runtime metrics of operations."
+        return os.path.join(self.root_directory(), ".flow", "metrics.jsonl")
+
+    def _fn_failures(self):
+        "Return the canonical name to store the failure ledger of operations."
+        return os.path.join(self.root_directory(), ".flow", "failures.jsonl")
+
+    def _fn_condition_statistics(self):
+        "Return the canonical name to store condition statistics."
+        return os.path.join(self.root_directory(), ".flow", "condition_statistics.json")
+
+    def _get_condition_keys(self, storable_only=True):
+        """Map condition functions to keys that are stable across invocations.
+
+        By default, only conditions that may be stored in the persistent
+        condition cache are included, i.e., metaconditions, batch conditions,
+        built-in conditions, and volatile conditions are omitted.
+        """
+        keys = dict()
+        for name, op in self._operations.items():
+            for kind, conditions in (("pre", op._prereqs), ("post", op._postconds)):
+                for i, condition in enumerate(conditions):
+                    callback = condition._callback
+                    if storable_only and (
+                        hasattr(callback, "_composed_of")
+                        or hasattr(callback, "_flow_batch")
+                        or hasattr(callback, "_flow_builtin")
+                        or getattr(callback, "_flow_volatile", False)
+                    ):
+                        continue
+                    keys.setdefault(callback, f"{name}.{kind}.{i}")
+        return keys
+
+    def _get_batch_conditions(self):
+        "Return the batch functions of all batch conditions of this project."
+
+        def unpack(callbacks):
+            for callback in callbacks:
+                if hasattr(callback, "_composed_of"):
+                    yield from unpack(callback._composed_of)
+                elif hasattr(callback, "_flow_batch"):
+                    yield callback._flow_batch
+
+        batch_conditions = dict()
+        for op in self._operations.values():
+            for condition in op._prereqs + op._postconds:
+                for batch_condition in unpack([condition._callback]):
+                    batch_conditions.setdefault(batch_condition)
+        return list(batch_conditions)
+
+    def _get_workflow_signature(self, condition_keys):
+        """Return a signature of the workflow definition.
+
+        Any change to the conditions or to the file that defines this class
+        invalidates all persistently stored condition results and statistics.
+        """
+        try:
+            fn_definition = inspect.getfile(type(self))
+            mtime_definition = os.stat(fn_definition).st_mtime_ns
+        except (TypeError, OSError):
+            fn_definition = mtime_definition = None
+        definition = [
+            __version__,
+            fn_definition,
+            mtime_definition,
+            sorted(
+                (key, repr(getattr(condition, "_flow_tag", None)))
+                for condition, key in condition_keys.items()
+            ),
+        ]
+        return sha1(json.dumps(definition).encode("utf-8")).hexdigest()
+
+    def _get_condition_store(self):
+        """Return the persistent condition store, or None if it is disabled.
+
+        The store is enabled with the ``persistent_condition_cache``
+        configuration value, which may be overridden for one invocation with
+        the ``--no-cache`` and ``--rebuild-cache`` command line options.
+        """
+        if self._condition_store is None:
+            if self._condition_cache_mode is None:
+                enabled = self.config["flow"].as_bool("persistent_condition_cache")
+            else:
+                enabled = self._condition_cache_mode != "off"
+            if not enabled:
+                return None
+            condition_keys = self._get_condition_keys()
+            self._condition_store = _ConditionStore(
+                self._fn_condition_cache(),
+                self._get_workflow_signature(condition_keys),
+                condition_keys,
+            )
+            if self._condition_cache_mode == "rebuild":
+                self._condition_store.clear()
+        return self._condition_store
+
+    def _get_condition_statistics(self):
+        """Return the condition statistics, or None if they are disabled.
+
+        The statistics are enabled with the ``adaptive_condition_order``
+        configuration value.
+        """
+        if self._condition_statistics is None:
+            if not self.config["flow"].as_bool("adaptive_condition_order"):
+                return None
+            condition_keys = self._get_condition_keys(storable_only=False)
+            self._condition_statistics = _ConditionStatistics(
+                self._fn_condition_statistics(),
+                self._get_workflow_signature(condition_keys),
+                condition_keys,
+            )
+        return self._condition_statistics
+
+    def _get_operation_dependencies(self):
+        """Return the dependencies between operations, or None if not used.
+
+        The dependencies are used for the evaluation of conditions if the
+        ``graph_aware_evaluation`` configuration value is enabled.
+        """
+        if not self.config["flow"].as_bool("graph_aware_evaluation"):
+            return None
+        if self._operation_dependencies is None:
+            try:
+                self._operation_dependencies = _OperationDependencies(self._operations)
+            except ValueError as error:
+                logger.warning(f"Graph-aware evaluation is disabled: {error}")
+                return None
+        return self._operation_dependencies
+
+    def _order_conditions(self, statistics):
+        """Order the evaluation of all conditions by their expected cost.
+
+        Conditions are evaluated in the order of declaration, unless the
+        ``adaptive_condition_order`` configuration value is enabled, in which
+        case they are evaluated in the order that minimizes the expected cost
+        of the evaluation according to the statistics gathered in previous
+        evaluations. Conditions are expected to be free of side effects. A
+        condition that may rely on the conditions declared before it, because
+        it raised an error, retains its position relative to them, see
+        :meth:`~._ConditionStatistics.sort`, such that the results are
+        identical.
+        """
+        for op in self._operations.values():
+            op._prereqs_evaluation_order = statistics.sort(op._prereqs)
+            op._postconds_evaluation_order = statistics.sort(op._postconds)
+
+    def _order_conditions_by_dependencies(self, dependencies):
+        """Evaluate the ``pre.after`` conditions of all operations first.
+
+        The ``pre.after`` conditions are answered from the completion of other
+        operations, which is often known from the dependencies between
+        operations without evaluating any condition.
+        """
+        for op in self._operations.values():
+            op._prereqs_evaluation_order = sorted(
+                op._prereqs_evaluation_order,
+                key=lambda condition: condition._callback not in dependencies.after,
+            )
+
     def _store_bundled(self, operations):
         """Store operation-ids as part of a bundle and return bundle id.
 
@@ -1817,6 +3030,8 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         "Return a dict with information about job-operations for this job."
         starting_dict = functools.partial(dict, scheduler_status=JobStatus.unknown)
         status_dict = defaultdict(starting_dict)
+        if self._condition_cache is not None:
+            self._condition_cache.evaluate_operations((job,))
         for group in self._groups.values():
             completed = group._complete((job,))
             eligible = False if completed else group._eligible((job,))
@@ -1868,28 +3083,52 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                 raise
         return result
 
-    def _fetch_scheduler_status(self, jobs=None, file=None, ignore_errors=False):
-        "Update the status docs."
-        if file is None:
-            file = sys.stderr
-        if jobs is None:
+    def _get_submission_ids(self, jobs):
+        """Return the submission ids of all groups for the given jobs.
+
+        The ids are the names of the scheduler jobs that the groups are
+        submitted with, and are computed in bulk for the selection of jobs.
+        Groups of the same operations share their ids.
+
+        :param jobs:
+            The jobs to get the submission ids for.
+        :type jobs:
+            iterable of :class:`~signac.contrib.job.Job`
+        :return:
+            A mapping of each id to the list of groups and jobs it identifies.
+        :rtype:
+            dict
+        """
+        groups = list(self._groups.values())
+        ids = defaultdict(list)
+        for job in jobs:
+            for group in groups:
+                ids[group._generate_id((job,))].append((group, job))
+        return dict(ids)
+
+    def _fetch_scheduler_status(self, jobs=None, file=None, ignore_errors=False):
+        "Update the status docs."
+        if file is None:
+            file = sys.stderr
+        if jobs is None:
             jobs = list(self)
         try:
             scheduler = self._environment.get_scheduler()
 
-            self.document.setdefault("_status", dict())
-            scheduler_info = {
-                sjob.name(): sjob.status() for sjob in self.scheduler_jobs(scheduler)
-            }
-            status = dict()
+            with self._profiled("scheduler", type(scheduler).__name__):
+                scheduler_info = {
+                    sjob.name(): sjob.status()
+                    for sjob in self.scheduler_jobs(scheduler)
+                }
             print("Query scheduler...", file=file)
-            for job in tqdm(
-                jobs, desc="Fetching operation status", total=len(jobs), file=file
-            ):
-                for group in self._groups.values():
-                    _id = group._generate_id((job,))
-                    status[_id] = int(scheduler_info.get(_id, JobStatus.unknown))
-            self.document._status.update(status)
+            ids = self._get_submission_ids(
+                tqdm(jobs, desc="Fetching operation status", total=len(jobs), file=file)
+            )
+            status = dict.fromkeys(ids, int(JobStatus.unknown))
+            for name, scheduler_status in scheduler_info.items():
+                if name in ids:
+                    status[name] = int(scheduler_status)
+            self._store_status(status)
         except NoSchedulerError:
             logger.debug("No scheduler available.")
         except RuntimeError as error:
@@ -1899,6 +3138,24 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         else:
             logger.info("Updated job status cache.")
 
+    def _store_status(self, status):
+        """Store the status of job-operations in the project document.
+
+        The status store is updated with a single (atomic) write of the
+        project document, which holds the status of all job-operations.
+
+        :param status:
+            A mapping of job-operation ids to their status.
+        :type status:
+            dict
+        """
+        if not status:
+            return
+        try:
+            self.document["_status"].update(status)
+        except KeyError:
+            self.document["_status"] = status
+
     def _fetch_status(self, jobs, err, ignore_errors, status_parallelization="thread"):
         # The argument status_parallelization is used so that _fetch_status method
         # gets to know whether the deprecated argument no_parallelization passed
@@ -1932,7 +3189,7 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             cached_status=cached_status,
         )
 
-        with self._potentially_buffered():
+        with self._potentially_buffered(), self._cached_conditions(jobs) as cache:
             try:
                 if status_parallelization == "thread":
                     with contextlib.closing(ThreadPool()) as pool:
@@ -1947,46 +3204,24 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                             )
                         )
                 elif status_parallelization == "process":
-                    with contextlib.closing(Pool()) as pool:
-                        try:
-                            import pickle
-
-                            results = self._fetch_status_in_parallel(
-                                pool, pickle, jobs, ignore_errors, cached_status
-                            )
-                        except Exception as error:
-                            if (
-                                not isinstance(
-                                    error, (pickle.PickleError, self._PickleError)
-                                )
-                                and "pickle" not in str(error).lower()
-                            ):
-                                raise  # most likely not a pickle related error...
-
-                            try:
-                                import cloudpickle
-                            except ImportError:  # The cloudpickle package is not available.
-                                logger.error(
-                                    "Unable to parallelize execution due to a "
-                                    "pickling error. "
-                                    "\n\n - Try to install the 'cloudpickle' package, "
-                                    "e.g., with 'pip install cloudpickle'!\n"
-                                )
-                                raise error
-                            else:
-                                try:
-                                    results = self._fetch_status_in_parallel(
-                                        pool,
-                                        cloudpickle,
-                                        jobs,
-                                        ignore_errors,
-                                        cached_status,
-                                    )
-                                except self._PickleError as error:
-                                    raise RuntimeError(
-                                        "Unable to parallelize execution due to a pickling "
-                                        "error: {}.".format(error)
-                                    )
+                    # Evaluate batch conditions only once for all jobs, the
+                    # results are passed on to the worker processes with the
+                    # cache. Errors are raised by the workers instead.
+                    try:
+                        cache.prime(self._get_batch_conditions())
+                    except Exception as error:
+                        logger.debug(f"Unable to evaluate batch conditions: {error}")
+                    with self._worker_pool(
+                        context=dict(
+                            ignore_errors=ignore_errors, cached_status=cached_status
+                        )
+                    ) as pool:
+                        job_ids = [job.get_id() for job in jobs]
+                        results = pool.imap(
+                            _get_job_status_in_worker,
+                            job_ids,
+                            chunksize=_get_chunksize(len(job_ids)),
+                        )
                         return list(
                             tqdm(
                                 iterable=results,
@@ -2032,22 +3267,6 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                 )
                 return statuses
 
-    def _fetch_status_in_parallel(
-        self, pool, pickle, jobs, ignore_errors, cached_status
-    ):
-        try:
-            s_project = pickle.dumps(self)
-            s_tasks = [
-                (pickle.loads, s_project, job.get_id(), ignore_errors, cached_status)
-                for job in jobs
-            ]
-        except Exception as error:  # Masking all errors since they must be pickling related.
-            raise self._PickleError(error)
-
-        results = pool.imap(_serialized_get_job_status, s_tasks)
-
-        return results
-
     PRINT_STATUS_ALL_VARYING_PARAMETERS = True
     """This constant can be used to signal that the print_status() method is supposed
     to automatically show all varying parameters."""
@@ -2147,9 +3366,13 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         :type template:
             str
         :param profile:
-            Show profile result.
+            Record and show the number of calls and the runtime of all
+            conditions, labels, the scheduler query, and the rendering of the
+            status. The results are shown as a table sorted by the total
+            runtime, or in JSON format if the argument is ``'json'``. The
+            status is collected without parallelization while profiling.
         :type profile:
-            bool
+            bool or str
         :param eligible_jobs_max_lines:
             Limit the number of operations and its eligible job count printed in the overview.
         :type eligible_jobs_max_lines:
@@ -2197,103 +3420,24 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
 
         # get job status information
         if profile:
+            # The status is collected serially to obtain accurate timings.
+            status_parallelization = "none"
+            profiler = self._profiler = _Profiler()
             try:
-                import pprofile
-            except ImportError:
-                raise RuntimeWarning(
-                    "Profiling requires the pprofile package. "
-                    "Install with `pip install pprofile`."
-                )
-            prof = pprofile.StatisticalProfile()
-
-            fn_filter = [
-                inspect.getfile(threading),
-                inspect.getfile(multiprocessing),
-                inspect.getfile(Pool),
-                inspect.getfile(ThreadPool),
-                inspect.getfile(tqdm),
-            ]
-
-            with prof(single=False):
                 tmp = self._fetch_status(
                     jobs, err, ignore_errors, status_parallelization
                 )
-
-            prof._mergeFileTiming()
-
-            # Unrestricted
-            total_impact = 0
-            hits = [
-                hit
-                for fn, ft in prof.merged_file_dict.items()
-                if fn not in fn_filter
-                for hit in ft.iterHits()
-            ]
-            sorted_hits = reversed(sorted(hits, key=lambda hit: hit[2]))
-            total_num_hits = sum([hit[2] for hit in hits])
-
-            profiling_results = ["# Profiling:\n"]
-
-            profiling_results.extend(
-                ["Rank Impact Code object", "---- ------ -----------"]
-            )
-            for i, (line, code, hits, duration) in enumerate(sorted_hits):
-                impact = hits / total_num_hits
-                total_impact += impact
-                profiling_results.append(
-                    "{rank:>4} {impact:>6.0%} {code.co_filename}:"
-                    "{code.co_firstlineno}:{code.co_name}".format(
-                        rank=i + 1, impact=impact, code=code
-                    )
-                )
-                if i > 10 or total_impact > 0.8:
-                    break
-
-            for module_fn in prof.merged_file_dict:
-                if re.match(profile, module_fn):
-                    ft = prof.merged_file_dict[module_fn]
-                else:
-                    continue
-
-                total_hits = ft.getTotalHitCount()
-                total_impact = 0
-
-                profiling_results.append(f"\nHits by line for '{module_fn}':")
-                profiling_results.append("-" * len(profiling_results[-1]))
-
-                hits = list(sorted(ft.iterHits(), key=lambda h: 1 / h[2]))
-                for line, code, hits, duration in hits:
-                    impact = hits / total_hits
-                    total_impact += impact
-                    profiling_results.append(f"{module_fn}:{line} ({impact:2.0%}):")
-                    try:
-                        lines, start = inspect.getsourcelines(code)
-                    except OSError:
-                        continue
-                    hits_ = [
-                        ft.getHitStatsFor(line)[0]
-                        for line in range(start, start + len(lines))
-                    ]
-                    profiling_results.extend(
-                        [
-                            f"{h:>5} {lineno:>4}: {l.rstrip()}"
-                            for lineno, (l, h) in enumerate(zip(lines, hits_), start)
-                        ]
-                    )
-                    profiling_results.append("")
-                    if total_impact > 0.8:
-                        break
-
-            profiling_results.append("Total runtime: {}s".format(int(prof.total_time)))
-            if prof.total_time < 20:
-                profiling_results.append(
-                    "Warning: Profiler ran only for a short time, "
-                    "results may be highly inaccurate."
-                )
-
+            finally:
+                self._profiler = None
         else:
+            profiler = None
             tmp = self._fetch_status(jobs, err, ignore_errors, status_parallelization)
-            profiling_results = None
+
+        def _print_profile(file):
+            if profile == "json":
+                print(profiler.to_json(), file=file)
+            else:
+                print("\n# Profiling:\n\n" + profiler.to_table(), file=file)
 
         operations_errors = {s["_operations_error"] for s in tmp}
         labels_errors = {s["_labels_error"] for s in tmp}
@@ -2324,6 +3468,8 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         # formatted in JSON to screen.
         if dump_json:
             print(json.dumps(statuses, indent=4), file=file)
+            if profiler is not None:
+                _print_profile(err)
             return
 
         if overview:
@@ -2466,20 +3612,39 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             if status_parallelization == "process"
             else template_environment
         )
-        render_output = status_renderer.render(
-            template, te, context, detailed, expand, unroll, compact, output_format
+        render = functools.partial(
+            status_renderer.render,
+            template,
+            te,
+            context,
+            detailed,
+            expand,
+            unroll,
+            compact,
+            output_format,
         )
+        if profiler is None:
+            render_output = render()
+        else:
+            with profiler.record("render", output_format):
+                render_output = render()
 
         print(render_output, file=file)
 
         # Show profiling results (if enabled)
-        if profiling_results:
-            print("\n" + "\n".join(profiling_results), file=file)
+        if profiler is not None:
+            _print_profile(file)
 
         return status_renderer
 
     def _run_operations(
-        self, operations=None, pretend=False, np=None, timeout=None, progress=False
+        self,
+        operations=None,
+        pretend=False,
+        np=None,
+        timeout=None,
+        progress=False,
+        keep_going=False,
     ):
         """Execute the next operations as specified by the project's workflow.
 
@@ -2506,6 +3671,14 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             Show a progress bar during execution.
         :type progress:
             bool
+        :param keep_going:
+            Continue with the other operations if an operation fails.
+        :type keep_going:
+            bool
+        :return:
+            The failed operations if keep_going is set.
+        :rtype:
+            list
         """
         if timeout is not None and timeout < 0:
             timeout = None
@@ -2514,54 +3687,135 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         else:
             operations = list(operations)  # ensure list
 
+        failed = []
+
+        def fail(operation, error):
+            if not keep_going:
+                raise error
+            logger.error(f"Execution of operation '{operation}' failed: {error}")
+            failed.append(operation)
+
+        max_concurrency = self.config["flow"].as_int("async_cmd_concurrency")
+        if max_concurrency and not pretend:
+            # Operations with retries are executed like other operations.
+            cmd_operations = [
+                operation
+                for operation in operations
+                if isinstance(self._operations[operation.name], FlowCmdOperation)
+                and not operation.directives.get("max_retries")
+            ]
+            if cmd_operations:
+                for operation, error in self._run_cmd_operations_async(
+                    cmd_operations, max_concurrency, timeout, progress, keep_going
+                ):
+                    fail(operation, error)
+                cmd_operations = set(cmd_operations)
+                operations = [
+                    operation
+                    for operation in operations
+                    if operation not in cmd_operations
+                ]
+
         if np is None or np == 1 or pretend:
             if progress:
                 operations = tqdm(operations)
-            for operation in operations:
-                self._execute_operation(operation, timeout, pretend)
-        else:
+            # The worker process that executes operations with a timeout is
+            # reused for all operations.
+            with self._reusing_worker_pools():
+                for operation in operations:
+                    try:
+                        self._execute_operation(operation, timeout, pretend)
+                    except Exception as error:
+                        fail(operation, error)
+        elif operations and self.config["flow"].as_bool("resource_aware_run"):
+            resources = LocalResources.detect(np)
+            logger.debug(
+                "Resource-aware parallelized execution of {} operation(s) on {} "
+                "core(s).".format(len(operations), len(resources.cores))
+            )
+            with self._worker_pool(len(resources.cores)) as pool:
+                self._run_operations_with_resources(
+                    pool, operations, resources, progress, timeout, fail
+                )
+        elif operations:
             logger.debug(
                 "Parallelized execution of {} operation(s).".format(len(operations))
             )
-            with contextlib.closing(
-                Pool(processes=cpu_count() if np < 0 else np)
-            ) as pool:
-                logger.debug(
-                    "Parallelized execution of {} operation(s).".format(len(operations))
+            with self._worker_pool(cpu_count() if np < 0 else np) as pool:
+                self._run_operations_in_parallel(
+                    pool, operations, progress, timeout, fail
                 )
-                try:
-                    import pickle
+        return failed
 
-                    self._run_operations_in_parallel(
-                        pool, pickle, operations, progress, timeout
-                    )
-                    logger.debug("Used cPickle module for serialization.")
-                except Exception as error:
-                    if (
-                        not isinstance(error, (pickle.PickleError, self._PickleError))
-                        and "pickle" not in str(error).lower()
-                    ):
-                        raise  # most likely not a pickle related error...
+    def _run_cmd_operations_async(
+        self,
+        operations,
+        max_concurrency,
+        timeout=None,
+        progress=False,
+        keep_going=False,
+    ):
+        """Execute the commands of operations concurrently within this process.
 
-                    try:
-                        import cloudpickle
-                    except ImportError:  # The cloudpickle package is not available.
-                        logger.error(
-                            "Unable to parallelize execution due to a pickling error. "
-                            "\n\n - Try to install the 'cloudpickle' package, e.g., with "
-                            "'pip install cloudpickle'!\n"
-                        )
-                        raise error
-                    else:
-                        try:
-                            self._run_operations_in_parallel(
-                                pool, cloudpickle, operations, progress, timeout
-                            )
-                        except self._PickleError as error:
-                            raise RuntimeError(
-                                "Unable to parallelize execution due to a pickling "
-                                "error: {}.".format(error)
-                            )
+        The commands are executed as asyncio subprocesses, see
+        :func:`~.util.async_commands.run_commands`, which does not require a
+        worker process per command.
+
+        :return:
+            Pairs of the failed operations and their errors if keep_going is set.
+        :rtype:
+            list
+        """
+        logger.debug(
+            "Asynchronous execution of {} command operation(s).".format(len(operations))
+        )
+        for operation in operations:
+            logger.info(f"Execute operation '{operation}'...")
+        record_metrics = self.config["flow"].as_bool("record_metrics")
+        # Operations are identified by their command to record the outcome.
+        by_cmd = defaultdict(deque)
+        for operation in operations:
+            by_cmd[operation.cmd].append(operation)
+        start_times = defaultdict(deque)
+        failures = []
+
+        def started(cmd):
+            start_times[cmd].append(time.time())
+
+        def completed(cmd, error=None):
+            operation = by_cmd[cmd].popleft()
+            self._update_failure_ledger(operation, error)
+            if record_metrics:
+                # The resource usage of the commands is not known.
+                self._store_metrics(
+                    self._metrics_record(
+                        operation.name,
+                        operation._jobs,
+                        start_times[cmd].popleft(),
+                        time.time(),
+                        0 if error is None else getattr(error, "returncode", 1),
+                    )
+                )
+            return operation
+
+        def complete(cmd):
+            progress_bar.update()
+            completed(cmd)
+
+        def failed(error):
+            failures.append((completed(error.cmd, error), error))
+
+        with tqdm(total=len(operations), disable=not progress) as progress_bar:
+            run_commands(
+                [operation.cmd for operation in operations],
+                max_concurrency=max_concurrency,
+                timeout=timeout,
+                callback=complete,
+                keep_going=keep_going,
+                start_callback=started,
+                error_callback=failed,
+            )
+        return failures
 
     @deprecated(deprecated_in="0.11", removed_in="0.13", current_version=__version__)
     def run_operations(
@@ -2595,10 +3849,6 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         """
         return self._run_operations(operations, pretend, np, timeout, progress)
 
-    class _PickleError(Exception):
-        "Indicates a pickling error while trying to parallelize the execution of operations."
-        pass
-
     @staticmethod
     def _dumps_op(op):
         return (
@@ -2616,69 +3866,900 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         all_directives.update(directives)
         return _JobOperation(id, name, jobs, cmd, all_directives)
 
-    def _run_operations_in_parallel(self, pool, pickle, operations, progress, timeout):
+    def _run_operations_in_parallel(self, pool, operations, progress, timeout, fail):
         """Execute operations in parallel.
 
-        This function executes the given list of operations with the provided process pool.
+        This function executes the given list of operations with the provided pool of
+        worker processes (see :meth:`~._worker_pool`). Only the operations are
+        serialized, the project instance is deserialized once per worker process.
+        The fail callable is called with each failed operation and its error.
+        """
+        s_operations = [
+            self._dumps_op(op)
+            for op in tqdm(operations, desc="Serialize tasks", file=sys.stderr)
+        ]
+        # The errors are returned instead of raised, such that the results
+        # of the other operations are retained, and operations are cancelled
+        # upon timeout by the workers. Operations are not sent in chunks,
+        # since chunks of long operations would unbalance the load of the
+        # workers and defeat the execution order.
+        results = pool.imap(
+            functools.partial(_try_execute_operation_in_worker, timeout=timeout),
+            s_operations,
+        )
+        if progress:
+            results = tqdm(results, total=len(s_operations))
+        for operation, error in zip(operations, results):
+            if error is not None:
+                fail(operation, error)
+
+    def _run_operations_with_resources(
+        self, pool, operations, resources, progress, timeout, fail=None
+    ):
+        """Execute operations in parallel within the resources of the local node.
+
+        Operations are launched in order as soon as enough cores, GPUs, and
+        memory are free for them, according to their directives, and each
+        operation is confined to its allocated cores and GPUs, see
+        :class:`~.util.resources.LocalResources`. If provided, the fail
+        callable is called with each failed operation and its error, otherwise
+        the error is raised.
 
-        Since pickling of the project instance is likely to fail, we manually pickle the
-        project instance and the operations before submitting them to the process pool to
-        enable us to try different pool and pickle module combinations.
+        :raises RuntimeError:
+            If an operation requires more resources than available.
         """
+        for operation in operations:
+            if not resources.fits(operation.directives):
+                raise RuntimeError(
+                    "The operation '{}' requires more resources than available "
+                    "({} cores, {} GPUs, {} GB of memory).".format(
+                        operation,
+                        len(resources.cores),
+                        "unknown" if resources.gpus is None else len(resources.gpus),
+                        "unknown" if resources.memory is None else resources.memory,
+                    )
+                )
+
+        completed = queue.Queue()
+
+        def submit(operation, allocation):
+            pool.apply_async(
+                _execute_operation_in_worker,
+                (self._dumps_op(operation), timeout, allocation),
+                callback=lambda result: completed.put((operation, allocation, None)),
+                error_callback=lambda error: completed.put(
+                    (operation, allocation, error)
+                ),
+            )
+
+        pending = list(operations)
+        num_running = 0
+        with tqdm(total=len(pending), disable=not progress) as progress_bar:
+            while pending or num_running:
+                # Launch all pending operations that fit into the free resources.
+                waiting = []
+                for operation in pending:
+                    allocation = resources.allocate(operation.directives)
+                    if allocation is None:
+                        waiting.append(operation)
+                    else:
+                        submit(operation, allocation)
+                        num_running += 1
+                pending = waiting
+                operation, allocation, error = completed.get()
+                num_running -= 1
+                resources.release(allocation)
+                if error is not None:
+                    if fail is None:
+                        raise error
+                    fail(operation, error)
+                progress_bar.update()
 
+    def _run_operations_as_ready(
+        self,
+        operations,
+        gather,
+        pretend=False,
+        np=None,
+        timeout=None,
+        progress=False,
+        fail=None,
+    ):
+        """Execute operations and each operation as soon as it becomes eligible.
+
+        Whenever the last pending operation of a job completes, the eligible
+        operations of the job are gathered again and newly eligible operations
+        are executed without waiting for the operations of any other job to
+        complete. Like in one pass, the operations of one job that are eligible
+        at the same time may be executed concurrently, but never concurrently
+        with operations that became eligible after their completion.
+
+        :param operations:
+            The initially eligible operations.
+        :type operations:
+            Sequence of instances of :class:`._JobOperation`
+        :param gather:
+            A callable that returns the eligible operations of the given jobs,
+            omitting jobs with an id in the second argument, or None if the
+            operations can only be gathered once no operation is executing.
+        :type gather:
+            callable
+        :param pretend:
+            Do not actually execute the operations, but show which command would have been used.
+        :type pretend:
+            bool
+        :param np:
+            The number of processes to execute operations in parallel.
+        :type np:
+            int
+        :param timeout:
+            An optional timeout for each operation in seconds after which execution will
+            be cancelled. Use -1 to indicate not timeout (the default).
+        :type timeout:
+            int
+        :param progress:
+            Show a progress bar during execution.
+        :type progress:
+            bool
+        :param fail:
+            A callable that is called with each failed operation and its error
+            to continue with the other operations, otherwise the error is raised.
+        :type fail:
+            callable
+        """
+        if timeout is not None and timeout < 0:
+            timeout = None
+        progress_bar = tqdm(total=len(operations), disable=not progress)
+        # The number of pending operations of each job.
+        busy = Counter()
+        # The completed operations whose newly eligible operations are
+        # gathered once no operation is executing.
+        deferred = []
+
+        def add(new_operations):
+            progress_bar.total += len(new_operations)
+            progress_bar.refresh()
+            for operation in new_operations:
+                busy.update(job.get_id() for job in operation._jobs)
+            return new_operations
+
+        def complete(operation):
+            """Return the newly eligible operations after an operation completed."""
+            progress_bar.update()
+            busy.subtract(job.get_id() for job in operation._jobs)
+            busy_jobs = +busy
+            if any(job.get_id() in busy_jobs for job in operation._jobs):
+                return []
+            new_operations = gather(operation._jobs, busy_jobs)
+            if new_operations is None:
+                deferred.append(operation)
+                return []
+            return add(new_operations)
+
+        def complete_deferred():
+            """Return the newly eligible operations once no operation is executing."""
+            if not deferred:
+                return []
+            operation = deferred.pop()
+            deferred.clear()
+            return add(gather(operation._jobs, ()))
+
+        add(operations)
+        if np is None or np == 1 or pretend:
+            pending = deque(operations)
+            while pending:
+                operation = pending.popleft()
+                try:
+                    self._execute_operation(operation, timeout, pretend)
+                except Exception as error:
+                    if fail is None:
+                        raise
+                    fail(operation, error)
+                pending.extend(complete(operation))
+                if not pending:
+                    pending.extend(complete_deferred())
+            progress_bar.close()
+            return
+
+        completed = queue.Queue()
+
+        def submit(operation):
+            pool.apply_async(
+                _execute_operation_in_worker,
+                (self._dumps_op(operation), timeout),
+                callback=lambda result: completed.put((operation, None)),
+                error_callback=lambda error: completed.put((operation, error)),
+            )
+
+        logger.debug("Parallelized execution of operations as soon as eligible.")
+        with self._worker_pool(cpu_count() if np < 0 else np) as pool:
+            for operation in operations:
+                submit(operation)
+            num_running = len(operations)
+            while num_running:
+                operation, error = completed.get()
+                num_running -= 1
+                if error is not None:
+                    if fail is None:
+                        raise error
+                    fail(operation, error)
+                new_operations = complete(operation)
+                if not num_running and not new_operations:
+                    new_operations = complete_deferred()
+                for new_operation in new_operations:
+                    submit(new_operation)
+                    num_running += 1
+        progress_bar.close()
+
+    def _create_worker_pool(self, processes=None, context=None):
+        """Create a pool of worker processes that hold a copy of this project.
+
+        The project is serialized once and deserialized once per worker
+        process, such that tasks only need to refer to jobs and operations.
+
+        :param processes:
+            The number of worker processes (default is the number of CPUs).
+        :type processes:
+            int
+        :param context:
+            Keyword arguments that are available to the tasks of the workers.
+        :type context:
+            dict
+        :return:
+            The process pool.
+        :rtype:
+            :class:`multiprocessing.pool.Pool`
+        """
+        loads, s_project = self._dumps_project()
+        return Pool(
+            processes=processes,
+            initializer=_initialize_worker,
+            initargs=(loads, s_project, context),
+        )
+
+    @contextlib.contextmanager
+    def _worker_pool(self, processes=None, context=None):
+        """Provide a pool of worker processes, see :meth:`~._create_worker_pool`.
+
+        Within the :meth:`~._reusing_worker_pools` context, pools without a
+        context are reused for the same number of processes.
+        """
+        if context is None and self._worker_pools is not None:
+            pool = self._worker_pools.get(processes)
+            if pool is None:
+                pool = self._worker_pools[processes] = self._create_worker_pool(
+                    processes
+                )
+            yield pool
+        else:
+            with contextlib.closing(
+                self._create_worker_pool(processes, context)
+            ) as pool:
+                yield pool
+
+    @contextlib.contextmanager
+    def _reusing_worker_pools(self):
+        """Reuse the pools of worker processes that execute operations.
+
+        The project is deserialized by the workers when a pool is created, so
+        the workflow definition must not change while the context is active.
+        If the context is exited with an error, the operations that are still
+        queued or executing are cancelled.
+        """
+        if self._worker_pools is not None:
+            yield
+            return
+        self._worker_pools = dict()
         try:
-            s_project = pickle.dumps(self)
-            s_tasks = [
-                (pickle.loads, s_project, self._dumps_op(op))
-                for op in tqdm(operations, desc="Serialize tasks", file=sys.stderr)
-            ]
-        except Exception as error:  # Masking all errors since they must be pickling related.
-            raise self._PickleError(error)
+            yield
+        except BaseException:
+            for pool in self._worker_pools.values():
+                pool.terminate()
+            raise
+        else:
+            for pool in self._worker_pools.values():
+                pool.close()
+                pool.join()
+        finally:
+            self._worker_pools = None
 
-        results = [
-            pool.apply_async(_execute_serialized_operation, task) for task in s_tasks
-        ]
+    def _dumps_project(self):
+        """Serialize the project for the execution of operations in other processes.
+
+        :return:
+            The function to deserialize the project and the serialized project.
+        :rtype:
+            tuple
+        """
+        import pickle
 
-        for result in tqdm(results) if progress else results:
-            result.get(timeout=timeout)
+        try:
+            return pickle.loads, pickle.dumps(self)
+        except Exception as error:
+            try:
+                import cloudpickle
+            except ImportError:  # The cloudpickle package is not available.
+                logger.error(
+                    "Unable to parallelize execution due to a pickling error. "
+                    "\n\n - Try to install the 'cloudpickle' package, e.g., with "
+                    "'pip install cloudpickle'!\n"
+                )
+                raise error
+            try:
+                return cloudpickle.loads, cloudpickle.dumps(self)
+            except Exception as error:
+                raise RuntimeError(
+                    "Unable to parallelize execution due to a pickling "
+                    "error: {}.".format(error)
+                )
+
+    def _is_picklable(self):
+        """Return whether the project can be serialized for worker processes.
+
+        See :meth:`~._dumps_project`. Projects with conditions or directives
+        that cannot be serialized execute operations with a timeout by forking
+        instead of in a worker process.
+        """
+        if self._picklable is None:
+            try:
+                self._dumps_project()
+            except Exception as error:
+                logger.debug(f"Unable to serialize the project: {error}")
+                self._picklable = False
+            else:
+                self._picklable = True
+        return self._picklable
 
     def _execute_operation(self, operation, timeout=None, pretend=False):
+        """Execute an operation and retry it according to its directives.
+
+        A failed operation is executed again up to ``max_retries`` times
+        (default 0), waiting ``retry_backoff`` seconds (default 1) before the
+        first retry and twice as long before each further retry. The outcome
+        is recorded in the failure ledger, see :meth:`~._update_failure_ledger`.
+        """
         if pretend:
             print(operation.cmd)
             return None
 
+        max_retries = operation.directives.get("max_retries", 0)
+        retry_backoff = operation.directives.get("retry_backoff", 1)
+        for attempt in count():
+            try:
+                self._execute_operation_once(operation, timeout)
+            except (
+                UserOperationError,
+                subprocess.CalledProcessError,
+                subprocess.TimeoutExpired,
+            ) as error:
+                if attempt >= max_retries:
+                    self._update_failure_ledger(operation, error)
+                    raise
+                delay = retry_backoff * 2 ** attempt
+                logger.warning(
+                    "Execution of operation '{}' failed, retry {} of {} in "
+                    "{:.3g}s: {}".format(
+                        operation, attempt + 1, max_retries, delay, error
+                    )
+                )
+                time.sleep(delay)
+            else:
+                self._update_failure_ledger(operation)
+                return None
+
+    def _execute_operation_once(self, operation, timeout=None):
         logger.info(f"Execute operation '{operation}'...")
         # Check if we need to fork for operation execution...
-        if (
+        fork = (
             # The 'fork' directive was provided and evaluates to True:
             operation.directives.get("fork", False)
-            # Separate process needed to cancel with timeout:
-            or timeout is not None
             # The operation function is of an instance of FlowCmdOperation:
             or isinstance(self._operations[operation.name], FlowCmdOperation)
             # The specified executable is not the same as the interpreter instance:
             or operation.directives.get("executable", sys.executable) != sys.executable
-        ):
-            # ... need to fork:
-            logger.debug(
-                "Forking to execute operation '{}' with "
-                "cmd '{}'.".format(operation, operation.cmd)
+            # Separate process needed to cancel with timeout, but worker
+            # processes cannot have worker processes themselves, and the
+            # project must be serializable to start a worker process:
+            or (
+                timeout is not None
+                and (current_process().daemon or not self._is_picklable())
             )
-            subprocess.run(operation.cmd, shell=True, timeout=timeout, check=True)
-        else:
-            # ... executing operation in interpreter process as function:
+        )
+        in_worker = not fork and timeout is not None
+        with self._recording_metrics(
+            operation.name, operation._jobs, in_process=not (fork or in_worker)
+        ) as record:
+            if fork:
+                # ... need to fork:
+                logger.debug(
+                    "Forking to execute operation '{}' with "
+                    "cmd '{}'.".format(operation, operation.cmd)
+                )
+                usage = _run_command(operation.cmd, timeout=timeout)
+                if usage is not None:
+                    record["cpu_time"], record["max_rss"] = _get_resource_metrics(usage)
+            elif in_worker:
+                # ... executing operation in a worker process that is cancelled
+                # upon timeout:
+                self._execute_operation_in_worker_with_timeout(operation, timeout)
+            else:
+                # ... executing operation in interpreter process as function:
+                logger.debug(
+                    "Executing operation '{}' with current interpreter "
+                    "process ({}).".format(operation, os.getpid())
+                )
+                self._call_operation_function(operation)
+
+    def _call_operation_function(self, operation):
+        try:
+            self._operations[operation.name](*operation._jobs)
+        except Exception as e:
+            assert len(operation._jobs) == 1
+            raise UserOperationError(
+                "An exception was raised during operation {operation.name} "
+                "for job {operation._jobs[0]}.".format(operation=operation)
+            ) from e
+
+    def _execute_operation_in_worker_with_timeout(self, operation, timeout):
+        """Execute the function of an operation in a worker process with a timeout.
+
+        Unlike forking with the command of the operation, this does not start
+        an interpreter and import the project for each operation. The worker
+        process is reused within the :meth:`~._reusing_worker_pools` context
+        and is only terminated and replaced if an operation times out.
+
+        :raises subprocess.TimeoutExpired:
+            If the operation does not complete within the timeout.
+        """
+        with self._operation_worker() as worker:
             logger.debug(
-                "Executing operation '{}' with current interpreter "
-                "process ({}).".format(operation, os.getpid())
+                "Executing operation '{}' in worker process with timeout "
+                "{}s.".format(operation, timeout)
             )
             try:
-                self._operations[operation.name](*operation._jobs)
-            except Exception as e:
-                assert len(operation._jobs) == 1
+                worker.call(self._dumps_op(operation), timeout)
+            except (TimeoutError, EOFError) as error:
+                worker.terminate()
+                if self._worker_pools is not None:
+                    # The worker is replaced for the next operation.
+                    self._worker_pools.pop(_OperationWorker, None)
+                if isinstance(error, TimeoutError):
+                    raise subprocess.TimeoutExpired(operation.cmd, timeout)
                 raise UserOperationError(
-                    "An exception was raised during operation {operation.name} "
+                    "The worker process exited during operation {operation.name} "
                     "for job {operation._jobs[0]}.".format(operation=operation)
-                ) from e
+                )
+
+    @contextlib.contextmanager
+    def _operation_worker(self):
+        """Provide a worker process that calls the functions of operations.
+
+        Within the :meth:`~._reusing_worker_pools` context, the worker process
+        is reused, see :class:`~._OperationWorker`.
+        """
+        if self._worker_pools is not None:
+            worker = self._worker_pools.get(_OperationWorker)
+            if worker is None:
+                worker = self._worker_pools[_OperationWorker] = _OperationWorker(
+                    *self._dumps_project()
+                )
+            yield worker
+            return
+        worker = _OperationWorker(*self._dumps_project())
+        try:
+            yield worker
+        except BaseException:
+            worker.terminate()
+            raise
+        else:
+            worker.close()
+            worker.join()
+
+    def _metrics_record(self, name, jobs, start, end, status=0):
+        """Return a metrics record of an executed operation.
+
+        See also: :meth:`~._recording_metrics`
+        """
+        return {
+            "operation": name,
+            "jobs": [job.get_id() for job in jobs],
+            "start": start,
+            "end": end,
+            "wall_time": end - start,
+            "cpu_time": None,
+            "max_rss": None,
+            "status": status,
+            "host": socket.gethostname(),
+        }
+
+    def _store_metrics(self, record):
+        """Append a metrics record to the metrics file of the project.
+
+        See also: :meth:`~._recording_metrics`
+        """
+        try:
+            fn_metrics = self._fn_metrics()
+            os.makedirs(os.path.dirname(fn_metrics), exist_ok=True)
+            # Each record is appended with a single write, such that
+            # records of concurrently executed operations do not interleave.
+            with open(fn_metrics, "a") as file:
+                file.write(json.dumps(record) + "\n")
+        except OSError as error:
+            logger.warning(
+                "Unable to record the metrics of operation '{}': {}".format(
+                    record["operation"], error
+                )
+            )
+
+    @contextlib.contextmanager
+    def _recording_metrics(self, name, jobs, in_process=False):
+        """Record the runtime metrics of an operation executed within this context.
+
+        If the ``record_metrics`` configuration value is set, a record is
+        appended to the metrics file of the project (see :meth:`~._fn_metrics`)
+        with the start and end time, the wall time and the CPU time in
+        seconds, the maximum resident set size (RSS) in kilobytes, the exit
+        status, and the host. The context yields the record, such that the
+        CPU time and the max RSS of a forked operation can be set from the
+        resource usage of its process (see :func:`_run_command`). The CPU time
+        of an operation executed in this process (``in_process``) is measured
+        here, its max RSS is not recorded, because only the peak RSS over the
+        lifetime of the process is known.
+
+        :param name:
+            The name of the operation.
+        :type name:
+            str
+        :param jobs:
+            The jobs of the operation.
+        :type jobs:
+            Sequence of :class:`~signac.contrib.job.Job`
+        :param in_process:
+            Whether the operation is executed in this process.
+        :type in_process:
+            bool
+        """
+        if not self.config["flow"].as_bool("record_metrics"):
+            yield {}
+            return
+        cpu_time = _get_cpu_time() if in_process else None
+        start = time.time()
+        record = {}
+        status = 1
+        try:
+            yield record
+            status = 0
+        except subprocess.CalledProcessError as error:
+            status = error.returncode
+            raise
+        finally:
+            # The values set by the caller take precedence.
+            record = {
+                **self._metrics_record(name, jobs, start, time.time(), status),
+                **record,
+            }
+            if cpu_time is not None:
+                record["cpu_time"] = _get_cpu_time() - cpu_time
+            self._store_metrics(record)
+
+    def _load_metrics(self):
+        """Yield the recorded metrics of executed operations.
+
+        See also: :meth:`~._recording_metrics`
+        """
+        try:
+            with open(self._fn_metrics()) as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Skip incomplete records, e.g., of an interrupted write.
+                        logger.debug(f"Skip invalid metrics record: {line!r}")
+        except FileNotFoundError:
+            return
+
+    @staticmethod
+    def _failure_key(operation_name, job_ids):
+        return operation_name, tuple(job_ids)
+
+    def _load_failure_ledger(self):
+        """Return the number of consecutive failed executions of operations.
+
+        The ledger is indexed in memory, such that only the records appended
+        since the last call, e.g. by other processes, are read. The index is
+        rebuilt if the ledger was replaced, see :meth:`~._clear_failure_ledger`.
+
+        :return:
+            The number of failed executions since the last successful
+            execution by operation name and tuple of job ids. Operations
+            without failures are omitted.
+        :rtype:
+            dict
+        """
+        fn_failures = self._fn_failures()
+        try:
+            stat = os.stat(fn_failures)
+        except FileNotFoundError:
+            self._failure_index = None
+            return dict()
+        if self._failure_index is None or self._failure_index[0] != stat.st_ino:
+            self._failure_index = stat.st_ino, 0, dict()
+        inode, offset, failures = self._failure_index
+        if stat.st_size > offset:
+            with open(fn_failures, "rb") as file:
+                file.seek(offset)
+                data = file.read(stat.st_size - offset)
+            # A record that is still being written is read with the next call.
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].decode().splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.debug(f"Skip invalid failure record: {line!r}")
+                    continue
+                key = self._failure_key(record["operation"], record["jobs"])
+                if record["error"] is None:
+                    failures.pop(key, None)
+                else:
+                    failures[key] = failures.get(key, 0) + 1
+            self._failure_index = inode, offset + end, failures
+        return failures
+
+    def _load_failure_records(self):
+        """Yield the records of the failure ledger in the order of execution."""
+        try:
+            with open(self._fn_failures()) as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        logger.debug(f"Skip invalid failure record: {line!r}")
+        except FileNotFoundError:
+            return
+
+    def _update_failure_ledger(self, operation, error=None):
+        """Record the outcome of an execution in the failure ledger.
+
+        If the ``failure_quarantine`` configuration value is set, each failed
+        execution is appended to the ledger file (see :meth:`~._fn_failures`)
+        and a successful execution resets the count of consecutive failures
+        of the operation. Operations that failed as many times in a row are
+        quarantined, see :meth:`~._get_quarantined_operations`.
+
+        :param operation:
+            The executed operation.
+        :type operation:
+            :class:`._JobOperation`
+        :param error:
+            The error of a failed execution, or None if successful.
+        :type error:
+            :class:`Exception`
+        """
+        if not self.config["flow"].as_int("failure_quarantine"):
+            return
+        job_ids = [job.get_id() for job in operation._jobs]
+        fn_failures = self._fn_failures()
+        if (
+            error is None
+            and self._failure_key(operation.name, job_ids)
+            not in self._load_failure_ledger()
+        ):
+            return  # There are no failures to reset.
+        record = {
+            "operation": operation.name,
+            "jobs": job_ids,
+            "time": time.time(),
+            "error": None if error is None else str(error) or type(error).__name__,
+        }
+        try:
+            os.makedirs(os.path.dirname(fn_failures), exist_ok=True)
+            # Each record is appended with a single write, such that records
+            # of concurrently executed operations do not interleave.
+            with open(fn_failures, "a") as file:
+                file.write(json.dumps(record) + "\n")
+        except OSError as error:
+            logger.warning(f"Unable to record the failure of '{operation}': {error}")
+
+    def _get_quarantined_operations(self):
+        """Return the operations that are quarantined after repeated failures.
+
+        :return:
+            The pairs of operation name and tuple of job ids that failed at
+            least ``failure_quarantine`` times in a row, or an empty set if
+            the configuration value is not set.
+        :rtype:
+            set
+        """
+        threshold = self.config["flow"].as_int("failure_quarantine")
+        if not threshold:
+            return set()
+        return {
+            key
+            for key, failures in self._load_failure_ledger().items()
+            if failures >= threshold
+        }
+
+    def _clear_failure_ledger(self, names=None, job_ids=None):
+        """Remove the failures of operations from the ledger.
+
+        :param names:
+            Only clear the failures of operations with the given names.
+        :type names:
+            Sequence of :class:`str`
+        :param job_ids:
+            Only clear the failures of operations of jobs with the given ids.
+        :type job_ids:
+            Sequence of :class:`str`
+        :return:
+            The number of cleared pairs of operation and jobs.
+        :rtype:
+            int
+        """
+        fn_failures = self._fn_failures()
+
+        def cleared(record):
+            return (names is None or record["operation"] in names) and (
+                job_ids is None or not set(record["jobs"]).isdisjoint(job_ids)
+            )
+
+        records = list(self._load_failure_records())
+        if not records:
+            return 0
+        keep = [record for record in records if not cleared(record)]
+        num_cleared = len(
+            {
+                self._failure_key(record["operation"], record["jobs"])
+                for record in records
+                if cleared(record)
+            }
+        )
+        if keep:
+            _dump_json_atomically(keep, fn_failures, lines=True)
+        else:
+            os.remove(fn_failures)
+        self._failure_index = None
+        return num_cleared
+
+    def _get_exec_function(self, name):
+        """Return a function that executes an operation for a job, see ``exec``."""
+        try:
+            operation = self._operations[name]
+        except KeyError:
+            raise KeyError(f"Unknown operation '{name}'.")
+
+        if isinstance(operation, FlowCmdOperation):
+
+            def operation_function(job):
+                cmd = operation(job).format(job=job)
+                subprocess.run(cmd, shell=True, check=True)
+
+            return operation_function
+        else:
+            return operation
+
+    def _execute_manifest_entry(self, entry):
+        """Execute the operation of one manifest entry.
+
+        :return:
+            The formatted traceback if the execution failed, otherwise None.
+        """
+        try:
+            jobs = [self.open_job(id=job_id) for job_id in entry["jobs"]]
+            ignore_conditions = entry.get("ignore_conditions")
+            if ignore_conditions is not None:
+                ignore_conditions = getattr(IgnoreConditions, ignore_conditions.upper())
+                if not self._operations[entry["operation"]]._eligible(
+                    tuple(jobs), ignore_conditions
+                ):
+                    logger.info(
+                        "Skip operation '{}' for job(s) {}, which is not "
+                        "eligible.".format(entry["operation"], ", ".join(entry["jobs"]))
+                    )
+                    return None
+            operation_function = self._get_exec_function(entry["operation"])
+            logger.info(
+                "Execute operation '{}' for job(s) {}...".format(
+                    entry["operation"], ", ".join(entry["jobs"])
+                )
+            )
+            # The resource usage of the commands of operations is not known.
+            in_process = not isinstance(
+                self._operations[entry["operation"]], FlowCmdOperation
+            )
+            with self._recording_metrics(entry["operation"], jobs, in_process):
+                for job in jobs:
+                    operation_function(job)
+        except Exception:
+            return traceback.format_exc()
+        return None
+
+    def _execute_manifest(self, manifest, np=None):
+        """Execute the operations listed in a manifest within this interpreter.
+
+        Each entry of the manifest is a mapping of the ``operation`` name and
+        the ids of the ``jobs``. Like with ``exec``, operations are executed
+        regardless of their conditions, unless the entry specifies which
+        conditions to ignore with ``ignore_conditions``, e.g. ``"none"``. In
+        that case the operation is only executed if it is eligible, like with
+        ``run``. A failing operation does not prevent the execution of the
+        remaining entries.
+
+        :param manifest:
+            The entries of the manifest.
+        :type manifest:
+            Iterable of :class:`dict`
+        :param np:
+            Execute the entries with the given number of processes, or with
+            one process per processing unit if negative.
+        :type np:
+            int
+        :return:
+            Pairs of the failed entries and the formatted tracebacks.
+        :rtype:
+            list
+        """
+        manifest = list(manifest)
+        if np is None or np == 1 or len(manifest) < 2:
+            results = [self._execute_manifest_entry(entry) for entry in manifest]
+        else:
+            processes = cpu_count() if np < 0 else np
+            # The entries are not sent in chunks to balance the load of the
+            # workers, see _run_operations_in_parallel().
+            with self._worker_pool(processes) as pool:
+                results = list(pool.imap(_execute_manifest_entry_in_worker, manifest))
+        return [
+            (entry, error)
+            for entry, error in zip(manifest, results)
+            if error is not None
+        ]
+
+    def _get_operation_priorities(self, order):
+        """Return the priority of each operation for the execution order.
+
+        The expected duration of an operation is the median wall time of its
+        successful executions recorded in the runtime metrics (see
+        :meth:`~._recording_metrics`). Operations without recorded executions
+        are expected to take the median of the expected durations of all
+        other operations, or the same time if no executions were recorded.
+
+        :param order:
+            With ``'longest-first'``, the priority of an operation is its
+            expected duration. With ``'critical-path'``, the priority is the
+            expected duration of the longest chain of operations starting with
+            the operation in the operation graph (see
+            :meth:`~.get_operation_graph`), or its expected duration if the
+            graph is cyclic.
+        :type order:
+            str
+        :return:
+            The priority of each operation by name.
+        :rtype:
+            dict
+        """
+        wall_times = defaultdict(list)
+        for record in self._load_metrics():
+            if record["status"] == 0:
+                wall_times[record["operation"]].append(record["wall_time"])
+        durations = {
+            name: _percentile(sorted(values), 50) for name, values in wall_times.items()
+        }
+        default = _percentile(sorted(durations.values()), 50) if durations else 1.0
+        priorities = {name: durations.get(name, default) for name in self._operations}
+        if order == "critical-path":
+            graph = self.get_operation_graph()
+            if graph.is_acyclic():
+                # Successors precede their predecessors in reversed order.
+                for name in reversed(graph.topological_order()):
+                    priorities[name] += max(
+                        (priorities[other] for other in graph.successors(name)),
+                        default=0,
+                    )
+            else:
+                logger.warning(
+                    "The operation graph is cyclic, ordering operations by their "
+                    "expected duration instead of the critical path."
+                )
+        return priorities
 
     def _get_default_directives(self):
         return {
@@ -2698,6 +4779,8 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         progress=False,
         order=None,
         ignore_conditions=IgnoreConditions.NONE,
+        mode="passes",
+        keep_going=False,
     ):
         """Execute all pending operations for the given selection.
 
@@ -2726,7 +4809,14 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             bool
         :param np:
             Parallelize to the specified number of processors. Use -1 to parallelize to all
-            available processing units.
+            available processing units. If the ``resource_aware_run`` configuration
+            value is set, this is the number of cores instead, which are shared by the
+            operations of a pass according to their ``np``, ``ngpu``, and ``memory``
+            directives. If the ``async_cmd_concurrency`` configuration
+            value is set, the commands of :class:`~.FlowCmdOperation` operations of a
+            pass are instead executed concurrently from this process, up to the
+            configured number at a time, before the other operations of the pass
+            and regardless of the ``order``.
         :type np:
             int
         :param timeout:
@@ -2754,17 +4844,24 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                 * 'by-job' (operations are grouped by job)
                 * 'cyclic' (order operations cyclic by job)
                 * 'random' (shuffle the execution order randomly)
+                * 'longest-first' (operations with the longest expected duration first)
+                * 'critical-path' (operations with the longest expected duration of
+                                   the chain of downstream operations first)
                 * callable (a callable returning a comparison key for an
                             operation used to sort operations)
 
             The default value is `none`, which is equivalent to `by-job` in the current
-            implementation.
+            implementation. The expected durations are based on the recorded runtime
+            metrics of operations, see :meth:`~._get_operation_priorities`.
 
             .. note::
                 Users are advised to not rely on a specific execution order, as a
                 substitute for defining the workflow in terms of pre- and post-conditions.
                 However, a specific execution order may be more performant in cases where
                 operations need to access and potentially lock shared resources.
+                If the ``async_cmd_concurrency`` configuration value is set, the
+                order applies separately to the command operations of a pass, which
+                are executed first, and to its other operations.
         :type order:
             str, callable, or NoneType
         :param ignore_conditions:
@@ -2772,7 +4869,40 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             The default is :py:class:`IgnoreConditions.NONE`.
         :type ignore_conditions:
             :py:class:`~.IgnoreConditions`
+        :param mode:
+            Specify how operations are executed, possible values are:
+                * 'passes' (all eligible operations are executed, before the
+                            eligibility of operations is determined again)
+                * 'dataflow' (when an operation completes, the eligibility of
+                              the operations of its jobs is determined again
+                              and newly eligible operations are executed
+                              immediately)
+
+            The default value is `passes`. In the `dataflow` mode, the order
+            is applied to the initially eligible operations and to the
+            operations that become eligible with each completed operation.
+        :type mode:
+            str
+        :param keep_going:
+            Continue with the other operations if an operation fails, instead
+            of aborting the execution. Failed operations are not executed
+            again within this call, which raises a :class:`RuntimeError` after
+            all other operations are executed.
+        :type keep_going:
+            bool
+
+        Operations are retried according to their ``max_retries`` and
+        ``retry_backoff`` directives. If the ``failure_quarantine``
+        configuration value is set, operations that failed as many times in a
+        row for the same jobs are quarantined and skipped until their failures
+        are cleared, e.g., with the ``failures --clear`` command.
         """
+        if mode not in ("passes", "dataflow"):
+            raise ValueError(
+                "Invalid value for the 'mode' argument, valid arguments are "
+                "'passes' and 'dataflow'."
+            )
+
         # If no jobs argument is provided, we run operations for all jobs.
         if jobs is None:
             jobs = self
@@ -2810,9 +4940,31 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
 
         reached_execution_limit = Event()
 
+        quarantined = self._get_quarantined_operations()
+        failed_operations = set()
+
+        def fail(operation, error):
+            logger.error(f"Execution of operation '{operation}' failed: {error}")
+            failed_operations.add(operation)
+
         def select(operation):
             self._verify_aggregate_project(operation._jobs)
 
+            if operation in failed_operations:
+                return False  # The operation failed within this call.
+            if quarantined and (
+                self._failure_key(
+                    operation.name, [job.get_id() for job in operation._jobs]
+                )
+                in quarantined
+            ):
+                log(
+                    "Skip operation '{}', which is quarantined after repeated "
+                    "failures.".format(operation),
+                    logging.WARNING,
+                )
+                return False
+
             if num is not None and select.total_execution_count >= num:
                 reached_execution_limit.set()
                 raise StopIteration  # Reached total number of executions
@@ -2852,27 +5004,71 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         # Note: We are not using sum(select.num_execution.values()) for efficiency.
         select.total_execution_count = 0
 
-        for i_pass in count(1):
-            if reached_execution_limit.is_set():
-                logger.warning(
-                    "Reached the maximum number of operations that can be executed, but "
-                    "there are still operations pending."
+        def create_job_operations(job):
+            """Create the operations of each flow group for a job.
+
+            The operations of a job are reused from the previous pass, if no
+            operation was executed for the job and its workspace and document
+            are unmodified since then.
+            """
+            if unmodified_jobs is not None:
+                fingerprint = _job_fingerprint(job)
+                entry = unmodified_jobs.get(job.id)
+                if entry is not None and entry[0] == fingerprint:
+                    return entry[1]
+            group_operations = [
+                list(
+                    flow_group._create_run_job_operations(
+                        self._entrypoint,
+                        default_directives,
+                        (job,),
+                        ignore_conditions,
+                    )
                 )
-                break
+                for flow_group in flow_groups
+            ]
+            if unmodified_jobs is not None:
+                unmodified_jobs[job.id] = (fingerprint, group_operations)
+            return group_operations
+
+        # Keep track of the operations of jobs that are not modified between
+        # passes, unless the eligibility of operations may depend on other jobs.
+        if (
+            self.config["flow"].as_bool("incremental_run")
+            and not self._get_batch_conditions()
+        ):
+            unmodified_jobs = dict()
+        else:
+            unmodified_jobs = None
+
+        if order in ("longest-first", "critical-path"):
+            priorities = self._get_operation_priorities(order)
+
+        def gather(selected_jobs, busy_jobs=(), condition_cache=None):
+            """Gather the eligible operations of the given jobs in execution order.
+
+            Jobs with an id in busy_jobs are omitted. The conditions are
+            evaluated with the given condition cache, or with a new one.
+            """
+            if busy_jobs:
+                selected_jobs = [
+                    job for job in selected_jobs if job.get_id() not in busy_jobs
+                ]
             try:
                 # Change groups to available run _JobOperation(s)
-                with self._potentially_buffered():
+                with self._potentially_buffered(), self._cached_conditions(
+                    jobs, condition_cache
+                ):
+                    job_operations = self._gather_job_operations(
+                        create_job_operations,
+                        selected_jobs,
+                        [name for group in flow_groups for name in group.operations],
+                        (ignore_conditions,),
+                    )
                     operations = []
-                    for flow_group in flow_groups:
-                        for job in jobs:
-                            operations.extend(
-                                flow_group._create_run_job_operations(
-                                    self._entrypoint,
-                                    default_directives,
-                                    (job,),
-                                    ignore_conditions,
-                                )
-                            )
+                    for i, flow_group in enumerate(flow_groups):
+                        for group_operations in job_operations:
+                            operations.extend(group_operations[i])
 
                     operations = list(filter(select, operations))
             finally:
@@ -2881,7 +5077,7 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                         logger.log(level, msg)
                     del messages[:]  # clear
             if not operations:
-                break  # No more pending operations or execution limits reached.
+                return operations
 
             # Optionally re-order operations for execution if order argument is provided:
             if callable(order):
@@ -2894,21 +5090,97 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                 operations = list(roundrobin(*groups))
             elif order == "random":
                 random.shuffle(operations)
+            elif order in ("longest-first", "critical-path"):
+                operations.sort(key=lambda op: priorities[op.name], reverse=True)
             elif order is None or order in ("none", "by-job"):
                 pass  # by-job is the default order
             else:
                 raise ValueError(
                     "Invalid value for the 'order' argument, valid arguments are "
-                    "'none', 'by-job', 'cyclic', 'random', None, or a callable."
+                    "'none', 'by-job', 'cyclic', 'random', 'longest-first', "
+                    "'critical-path', None, or a callable."
                 )
+            return operations
 
-            logger.info(
-                "Executing {} operation(s) (Pass # {:02d})...".format(
-                    len(operations), i_pass
+        # In dataflow mode, the condition cache is retained and only the
+        # results of the jobs of completed operations are invalidated.
+        dataflow_caches = []
+
+        def gather_completed(completed_jobs, busy_jobs):
+            """Gather the eligible operations after an operation completed.
+
+            Only the jobs of the completed operation are evaluated again,
+            unless the operation moved a job, e.g., by modifying its state point.
+            In that case, all jobs are evaluated again once no other operation
+            is executing, since other jobs may be moved concurrently.
+            """
+            if all(job in self for job in completed_jobs):
+                condition_cache = dataflow_caches[-1]
+                condition_cache.invalidate(completed_jobs)
+                return gather(completed_jobs, busy_jobs, condition_cache)
+            if busy_jobs:
+                return None
+            dataflow_caches[:] = [self._create_condition_cache(jobs)]
+            return gather(jobs, condition_cache=dataflow_caches[-1])
+
+        # The worker processes are reused across passes.
+        with self._reusing_worker_pools():
+            if mode == "dataflow":
+                unmodified_jobs = None
+                logger.info("Executing operations as soon as they are eligible...")
+                dataflow_caches.append(self._create_condition_cache(jobs))
+                self._run_operations_as_ready(
+                    gather(jobs, condition_cache=dataflow_caches[-1]),
+                    gather_completed,
+                    pretend=pretend,
+                    np=np,
+                    timeout=timeout,
+                    progress=progress,
+                    fail=fail if keep_going else None,
+                )
+                if reached_execution_limit.is_set():
+                    logger.warning(
+                        "Reached the maximum number of operations that can be executed, but "
+                        "there are still operations pending."
+                    )
+            else:
+                for i_pass in count(1):
+                    if reached_execution_limit.is_set():
+                        logger.warning(
+                            "Reached the maximum number of operations that can be executed, but "
+                            "there are still operations pending."
+                        )
+                        break
+                    operations = gather(jobs)
+                    if not operations:
+                        break  # No more pending operations or execution limits reached.
+
+                    logger.info(
+                        "Executing {} operation(s) (Pass # {:02d})...".format(
+                            len(operations), i_pass
+                        )
+                    )
+                    failed = self._run_operations(
+                        operations,
+                        pretend=pretend,
+                        np=np,
+                        timeout=timeout,
+                        progress=progress,
+                        keep_going=keep_going,
+                    )
+                    failed_operations.update(failed)
+                    if unmodified_jobs is not None and not pretend:
+                        for operation in operations:
+                            for job in operation._jobs:
+                                unmodified_jobs.pop(job.id, None)
+
+        if failed_operations:
+            raise RuntimeError(
+                "{} of {} operation(s) failed: {}".format(
+                    len(failed_operations),
+                    select.total_execution_count,
+                    ", ".join(sorted(map(str, failed_operations))),
                 )
-            )
-            self._run_operations(
-                operations, pretend=pretend, np=np, timeout=timeout, progress=progress
             )
 
     def _gather_flow_groups(self, names=None):
@@ -2937,29 +5209,183 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                 "will be included twice when using the"
                 " -o/--operation option."
             )
-        return operations
+        return operations
+
+    def _get_submission_operations(
+        self,
+        jobs,
+        default_directives,
+        names=None,
+        ignore_conditions=IgnoreConditions.NONE,
+        ignore_conditions_on_execution=IgnoreConditions.NONE,
+    ):
+        """Grabs _JobOperations that are eligible to run from FlowGroups.
+
+        Groups with an operation that is quarantined for the job after
+        repeated failures are omitted, see
+        :meth:`~._get_quarantined_operations`.
+        """
+        groups = self._gather_flow_groups(names)
+        quarantined = self._get_quarantined_operations()
+
+        def is_quarantined(group, job):
+            return any(
+                self._failure_key(name, [job.get_id()]) in quarantined
+                for name in group.operations
+            )
+
+        def create_submission_job_operation(group, job):
+            if quarantined and is_quarantined(group, job):
+                logger.info(
+                    "Skip group '{}' for job {}, which is quarantined after "
+                    "repeated failures.".format(group.name, job)
+                )
+                return None
+            if group._eligible(
+                (job,), ignore_conditions
+            ) and self._eligible_for_submission(group, (job,)):
+                return group._create_submission_job_operation(
+                    entrypoint=self._entrypoint,
+                    default_directives=default_directives,
+                    jobs=(job,),
+                    index=0,
+                    ignore_conditions_on_execution=ignore_conditions_on_execution,
+                )
+            return None
+
+        if self.config["flow"]["gather_parallelization"] == "none":
+            for group in groups:
+                for job in jobs:
+                    operation = create_submission_job_operation(group, job)
+                    if operation is not None:
+                        yield operation
+            return
+
+        def create_submission_job_operations(job):
+            return [create_submission_job_operation(group, job) for group in groups]
+
+        job_operations = self._gather_job_operations(
+            create_submission_job_operations,
+            jobs,
+            [name for group in groups for name in group.operations],
+            (
+                ignore_conditions,
+                ignore_conditions_on_execution,
+                ignore_conditions_on_execution | IgnoreConditions.PRE,
+                ignore_conditions_on_execution | IgnoreConditions.POST,
+            ),
+        )
+        for i in range(len(groups)):
+            for group_operations in job_operations:
+                if group_operations[i] is not None:
+                    yield group_operations[i]
+
+    def _gather_job_operations(self, func, jobs, names, ignore_conditions):
+        """Apply a function that creates the operations of a job to all jobs.
+
+        The jobs are processed in parallel according to the
+        ``gather_parallelization`` configuration value. With ``'thread'``, the
+        function is applied to the jobs in a thread pool. With ``'process'``,
+        the conditions that determine the eligibility of the given operations
+        are evaluated in a process pool first, such that the function is
+        applied to the jobs with the results already cached. This method must
+        be called within the :meth:`~._cached_conditions` context.
+
+        :param func:
+            The function applied to each job.
+        :type func:
+            callable
+        :param jobs:
+            The jobs.
+        :type jobs:
+            iterable of :class:`~signac.contrib.job.Job`
+        :param names:
+            The names of the operations whose eligibility is determined.
+        :type names:
+            list of str
+        :param ignore_conditions:
+            The ignored conditions that the eligibility is determined with.
+        :type ignore_conditions:
+            tuple of :class:`~.IgnoreConditions`
+        :return:
+            The results in the order of the jobs.
+        :rtype:
+            list
+        """
+        jobs = list(jobs)
+        gather_parallelization = self.config["flow"]["gather_parallelization"]
+        if gather_parallelization == "thread":
+            try:
+                with contextlib.closing(ThreadPool()) as pool:
+                    return pool.map(func, jobs)
+            except RuntimeError as error:
+                if "can't start new thread" not in error.args:
+                    raise  # unrelated error
+        elif gather_parallelization == "process":
+            self._evaluate_eligibility_in_parallel(jobs, names, ignore_conditions)
+        elif gather_parallelization != "none":
+            raise RuntimeError(
+                "Configuration value gather_parallelization is invalid. "
+                "You can set it to 'thread', 'process', or 'none'"
+            )
+        return [func(job) for job in jobs]
 
-    def _get_submission_operations(
-        self,
-        jobs,
-        default_directives,
-        names=None,
-        ignore_conditions=IgnoreConditions.NONE,
-        ignore_conditions_on_execution=IgnoreConditions.NONE,
-    ):
-        """Grabs _JobOperations that are eligible to run from FlowGroups."""
-        for group in self._gather_flow_groups(names):
-            for job in jobs:
-                if group._eligible(
-                    (job,), ignore_conditions
-                ) and self._eligible_for_submission(group, (job,)):
-                    yield group._create_submission_job_operation(
-                        entrypoint=self._entrypoint,
-                        default_directives=default_directives,
-                        jobs=(job,),
-                        index=0,
-                        ignore_conditions_on_execution=ignore_conditions_on_execution,
-                    )
+    def _evaluate_eligibility_in_parallel(self, jobs, names, ignore_conditions):
+        """Evaluate the eligibility of operations in a process pool.
+
+        The results of the evaluated conditions are added to the condition
+        cache. Errors are not raised by the worker processes, but when the
+        conditions are evaluated again by this process.
+        """
+        cache = self._condition_cache
+        # Evaluate batch conditions only once for all jobs, the results are
+        # passed on to the worker processes with the cache.
+        try:
+            cache.prime(self._get_batch_conditions())
+        except Exception as error:
+            logger.debug(f"Unable to evaluate batch conditions: {error}")
+        try:
+            pool = self._create_worker_pool(
+                context=dict(names=names, ignore_conditions=ignore_conditions)
+            )
+        except Exception as error:
+            logger.warning(
+                f"Unable to parallelize the evaluation of conditions: {error}"
+            )
+            return
+        condition_keys = self._get_condition_keys(storable_only=False)
+        job_ids = [job.get_id() for job in jobs]
+        with contextlib.closing(pool):
+            try:
+                for results in pool.imap(
+                    _evaluate_eligibility_in_worker,
+                    job_ids,
+                    chunksize=_get_chunksize(len(job_ids)),
+                ):
+                    cache.import_results(results, condition_keys)
+            except Exception as error:
+                # The conditions are evaluated by this process instead.
+                logger.warning(
+                    f"Unable to parallelize the evaluation of conditions: {error}"
+                )
+
+    def _evaluate_eligibility(self, job, names, ignore_conditions):
+        """Evaluate the conditions that determine the eligibility of operations.
+
+        :return:
+            The results of the evaluated conditions, see
+            :meth:`~._ConditionCache.export_results`.
+        :rtype:
+            list
+        """
+        with self._cached_conditions((job,)) as cache:
+            for name in names:
+                for flag in ignore_conditions:
+                    try:
+                        self._operations[name]._eligible((job,), flag)
+                    except Exception:
+                        pass  # The error is raised by the calling process.
+            return cache.export_results(self._get_condition_keys(storable_only=False))
 
     def _get_pending_operations(
         self, jobs, operation_names=None, ignore_conditions=IgnoreConditions.NONE
@@ -2993,6 +5419,116 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         else:
             yield
 
+    @contextlib.contextmanager
+    def _cached_directives(self):
+        """Memoize the values of callable directives within this context.
+
+        All callable directives evaluated within this context are evaluated at
+        most once per job-aggregate, regardless of the operations and groups
+        they are resolved for. Nested contexts share the cache of the
+        outermost context.
+        """
+        if self._directive_cache is not None:
+            yield self._directive_cache
+            return
+        cache = self._directive_cache = dict()
+        try:
+            yield cache
+        finally:
+            self._directive_cache = None
+
+    @contextlib.contextmanager
+    def _cached_status(self):
+        """Read the status of submitted operations from a snapshot within this context.
+
+        The status store in the project document is loaded once when entering
+        the outermost context. Status updates within this context are not
+        reflected by the snapshot.
+        """
+        if self._status_snapshot is not None:
+            yield self._status_snapshot
+            return
+        try:
+            snapshot = self._status_snapshot = self.document["_status"]._as_dict()
+        except KeyError:
+            snapshot = self._status_snapshot = dict()
+        try:
+            yield snapshot
+        finally:
+            self._status_snapshot = None
+
+    @contextlib.contextmanager
+    def _profiled(self, category, name):
+        "Record the runtime of the code executed within this context, if profiling."
+        if self._profiler is None:
+            yield
+        else:
+            with self._profiler.record(category, name):
+                yield
+
+    def _create_condition_cache(self, jobs=None):
+        """Create a cache of condition results, see :meth:`~._cached_conditions`.
+
+        :param jobs:
+            The selected jobs that batch conditions are evaluated for (default
+            is only the jobs that a result is requested for).
+        :type jobs:
+            iterable of :class:`~signac.contrib.job.Job`
+        :return:
+            The condition cache.
+        :rtype:
+            :class:`~._ConditionCache`
+        """
+        store = self._get_condition_store()
+        statistics = self._get_condition_statistics()
+        if statistics is not None:
+            self._order_conditions(statistics)
+        dependencies = self._get_operation_dependencies()
+        if dependencies is not None:
+            self._order_conditions_by_dependencies(dependencies)
+        return _ConditionCache(store, jobs, self._profiler, statistics, dependencies)
+
+    @contextlib.contextmanager
+    def _cached_conditions(self, jobs=None, cache=None):
+        """Memoize condition results within this context.
+
+        All conditions evaluated within this context are evaluated at most once
+        per job-aggregate. The data space must therefore not be modified by
+        operations while the context is active. Nested contexts share the cache
+        of the outermost context.
+
+        :param jobs:
+            The selected jobs that batch conditions are evaluated for (default
+            is only the jobs that a result is requested for).
+        :type jobs:
+            iterable of :class:`~signac.contrib.job.Job`
+        :param cache:
+            A cache created with :meth:`~._create_condition_cache` to use
+            instead of a new cache. Its results are retained after this
+            context, such that it can be reused once the results of modified
+            jobs are invalidated, see :meth:`~._ConditionCache.invalidate`.
+        :type cache:
+            :class:`~._ConditionCache`
+        """
+        if self._condition_cache is not None:
+            yield self._condition_cache
+            return
+        if cache is None:
+            cache = self._create_condition_cache(jobs)
+        self._condition_cache = cache
+        try:
+            yield cache
+        finally:
+            self._condition_cache = None
+            if cache._store is not None:
+                cache._store.save()
+            if cache._statistics is not None:
+                cache._statistics.save()
+            logger.debug(
+                f"Condition cache: {cache.hits} hit(s), {cache.misses} miss(es), "
+                f"{cache.store_hits} persistent hit(s)."
+            )
+
     def _script(
         self, operations, parallel=False, template="script.sh", show_template_help=False
     ):
@@ -3080,6 +5616,85 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             self._show_template_help_and_exit(template_environment, context)
         return template.render(**context)
 
+    def _get_operation_batches(
+        self, operations, parallel=False, ignore_conditions=IgnoreConditions.NONE
+    ):
+        """Batch the submitted operations into single ``exec`` invocations.
+
+        A submitted group that consists of a single Python operation, which
+        ``run`` would execute within its interpreter, is instead executed by
+        one ``exec --manifest`` invocation for all such operations with the
+        same entrypoint. The manifest is passed inline to the invocation, see
+        :meth:`~._execute_manifest`. The batched operations are only executed
+        if they are eligible at that time, like with ``run``.
+
+        :param operations:
+            The submitted operations.
+        :type operations:
+            Sequence of instances of :class:`._SubmissionJobOperation`
+        :param parallel:
+            Execute the operations of a batch in parallel.
+        :type parallel:
+            bool
+        :param ignore_conditions:
+            The conditions to ignore when the batched operations are executed.
+        :type ignore_conditions:
+            :py:class:`~.IgnoreConditions`
+        :return:
+            The template variables ``batches``, the list of batches with the
+            command ``cmd``, the ``manifest`` lines, and the ``operations`` of
+            each batch, and ``batched_ids``, the ids of all batched operations.
+        :rtype:
+            dict
+        """
+        batches = OrderedDict()
+        for operation in operations:
+            group = self._groups[operation.name]
+            if group.options or len(group.operations) != 1:
+                continue
+            name, flow_operation = next(iter(group.operations.items()))
+            if isinstance(flow_operation, FlowCmdOperation):
+                continue
+            run_operations = (
+                operation.eligible_operations
+                + operation.operations_with_unmet_preconditions
+                + operation.operations_with_met_postconditions
+            )
+            if not run_operations or run_operations[0].directives.get("fork", False):
+                continue
+            # The entrypoint is the part of the command preceding 'exec'.
+            cmd = run_operations[0].cmd
+            suffix = " exec {} {}".format(name, " ".join(map(str, operation._jobs)))
+            if not cmd.endswith(suffix):
+                continue
+            entry = {
+                "operation": name,
+                "jobs": [job.id for job in operation._jobs],
+                "ignore_conditions": str(ignore_conditions),
+            }
+            batches.setdefault(cmd[: -len(suffix)], []).append((operation, entry))
+
+        template_batches = []
+        for entrypoint, batch in batches.items():
+            if len(batch) < 2:
+                continue
+            cmd = f"{entrypoint} exec --manifest -".lstrip()
+            template_batches.append(
+                {
+                    "cmd": (cmd + " --parallel") if parallel else cmd,
+                    "manifest": [json.dumps(entry) for _, entry in batch],
+                    "operations": [operation for operation, _ in batch],
+                }
+            )
+        return {
+            "batches": template_batches,
+            "batched_ids": {
+                operation.id
+                for batch in template_batches
+                for operation in batch["operations"]
+            },
+        }
+
     def _submit_operations(
         self,
         operations,
@@ -3274,6 +5889,7 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         env=None,
         ignore_conditions=IgnoreConditions.NONE,
         ignore_conditions_on_execution=IgnoreConditions.NONE,
+        batched=False,
         **kwargs,
     ):
         """Submit function for the project's main submit interface.
@@ -3314,6 +5930,12 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             submitting. The default is :py:class:`IgnoreConditions.NONE`.
         :type ignore_conditions:
             :py:class:`~.IgnoreConditions`
+        :param batched:
+            Execute the single-operation groups of a bundle with one ``exec``
+            invocation instead of one ``run`` invocation per group, see
+            :meth:`~._get_operation_batches`.
+        :type batched:
+            bool
         """
         # Regular argument checks and expansion
         if jobs is None:
@@ -3347,37 +5969,52 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                 "must be a member of class IgnoreConditions"
             )
 
-        # Gather all pending operations.
-        with self._potentially_buffered():
-            default_directives = self._get_default_directives()
-            # The generator must be used *inside* the buffering context manager
-            # for performance reasons.
-            operation_generator = self._get_submission_operations(
-                jobs,
-                default_directives,
-                names,
-                ignore_conditions,
-                ignore_conditions_on_execution,
-            )
-            # islice takes the first "num" elements from the generator, or all
-            # items if num is None.
-            operations = list(islice(operation_generator, num))
-
-        # Bundle them up and submit.
-        with self._potentially_buffered():
-            for bundle in _make_bundles(operations, bundle_size):
-                status = self._submit_operations(
-                    operations=bundle,
-                    env=env,
-                    parallel=parallel,
-                    force=force,
-                    walltime=walltime,
-                    **kwargs,
+        # Callable directives are evaluated once per job for gathering, bundling,
+        # and rendering the scripts of the operations. The status of submitted
+        # operations is read from a snapshot.
+        with self._cached_directives(), self._cached_status():
+            # Gather all pending operations.
+            with self._potentially_buffered(), self._cached_conditions(jobs):
+                default_directives = self._get_default_directives()
+                # The generator must be used *inside* the buffering context manager
+                # for performance reasons.
+                operation_generator = self._get_submission_operations(
+                    jobs,
+                    default_directives,
+                    names,
+                    ignore_conditions,
+                    ignore_conditions_on_execution,
                 )
-                if status is not None:
-                    # Operations were submitted, store status
-                    for operation in bundle:
-                        operation.set_status(status)
+                # islice takes the first "num" elements from the generator, or all
+                # items if num is None.
+                operations = list(islice(operation_generator, num))
+
+            # Bundle them up and submit. The status of the submitted operations
+            # is stored at once, also if the submission of a bundle fails.
+            statuses = dict()
+            with self._potentially_buffered():
+                try:
+                    for bundle in _make_bundles(operations, bundle_size):
+                        if batched:
+                            kwargs.update(
+                                self._get_operation_batches(
+                                    bundle, parallel, ignore_conditions_on_execution
+                                )
+                            )
+                        status = self._submit_operations(
+                            operations=bundle,
+                            env=env,
+                            parallel=parallel,
+                            force=force,
+                            walltime=walltime,
+                            **kwargs,
+                        )
+                        if status is not None:
+                            # Operations were submitted, store status
+                            for operation in bundle:
+                                statuses[operation.id] = int(status)
+                finally:
+                    self._store_status(statuses)
 
     @classmethod
     def _add_submit_args(cls, parser):
@@ -3464,6 +6101,27 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             "and filter functions; then exit.",
         )
 
+    @classmethod
+    def _add_condition_cache_args(cls, parser):
+        "Add arguments to parser to control the persistent condition cache."
+        cache_group = parser.add_mutually_exclusive_group()
+        cache_group.add_argument(
+            "--no-cache",
+            dest="condition_cache",
+            action="store_const",
+            const="off",
+            help="Do not use the persistent condition cache.",
+        )
+        cache_group.add_argument(
+            "--rebuild-cache",
+            dest="condition_cache",
+            action="store_const",
+            const="rebuild",
+            help="Discard and rebuild the persistent condition cache. This implies "
+            "the use of the cache, even if not enabled with the "
+            "persistent_condition_cache configuration value.",
+        )
+
     @classmethod
     def _add_job_selection_args(cls, parser):
         parser.add_argument(
@@ -3540,6 +6198,12 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             action="store_true",
             help="Execute all operations in a single bundle in parallel.",
         )
+        bundling_group.add_argument(
+            "--batched",
+            action="store_true",
+            help="Execute the operations of a single bundle with one interpreter "
+            "instead of one interpreter per operation, where possible.",
+        )
 
     def export_job_statuses(self, collection, statuses):
         "Export the job statuses to a database collection."
@@ -3668,14 +6332,15 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
                     "_label_name",
                     getattr(label_func, "__name__", type(label_func).__name__),
                 )
-            try:
-                label_value = label_func(job)
-            except TypeError:
+            with self._profiled("label", label_name):
                 try:
-                    label_value = label_func(self, job)
-                except Exception:
-                    label_func = getattr(self, label.__func__.__name__)
                     label_value = label_func(job)
+                except TypeError:
+                    try:
+                        label_value = label_func(self, job)
+                    except Exception:
+                        label_func = getattr(self, label.__func__.__name__)
+                        label_value = label_func(job)
 
             assert label_name is not None
             if isinstance(label_value, str):
@@ -3753,9 +6418,17 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         op = self.operations[name] = FlowCmdOperation(cmd=cmd, pre=pre, post=post)
         if name in self._groups:
             raise KeyError("A group with this identifier already exists.")
+        # The workflow definition changed, the persistent store and the
+        # statistics must be reloaded.
+        self._condition_store = None
+        self._condition_statistics = None
+        self._operation_dependencies = None
+        self._operation_graph = None
+        self._picklable = None
         self._groups[name] = FlowGroup(
             name, operations={name: op}, operation_directives=dict(name=kwargs)
         )
+        self._index_overlapping_groups()
 
     def completed_operations(self, job):
         """Determine which operations have been completed for job.
@@ -3981,6 +6654,28 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             directives = getattr(func, "_flow_directives", dict())
             self._groups[op_name].operation_directives[op_name] = directives
 
+        self._index_overlapping_groups()
+
+    def _index_overlapping_groups(self):
+        """Index the other groups that share operations with each group.
+
+        The index is used to check whether a group is eligible for submission,
+        see :meth:`~._eligible_for_submission`.
+        """
+        groups_of_operation = defaultdict(list)
+        for group in self._groups.values():
+            for operation in group.operations:
+                groups_of_operation[operation].append(group)
+        self._overlapping_groups = dict()
+        for name, group in self._groups.items():
+            names = dict.fromkeys(
+                other.name
+                for operation in group.operations
+                for other in groups_of_operation[operation]
+                if other is not group
+            )
+            self._overlapping_groups[name] = [self._groups[other] for other in names]
+
     @property
     def operations(self):
         "The dictionary of operations that have been added to the workflow."
@@ -4001,13 +6696,84 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             return False
         if flow_group._get_status(jobs) >= JobStatus.submitted:
             return False
-        group_ops = set(flow_group)
-        for other_group in self._groups.values():
-            if group_ops & set(other_group):
-                if other_group._get_status(jobs) >= JobStatus.submitted:
-                    return False
+        if self._groups.get(flow_group.name) is flow_group:
+            other_groups = self._overlapping_groups[flow_group.name]
+        else:
+            group_ops = set(flow_group)
+            other_groups = [
+                group for group in self._groups.values() if group_ops & set(group)
+            ]
+        for other_group in other_groups:
+            if other_group._get_status(jobs) >= JobStatus.submitted:
+                return False
         return True
 
+    def _main_stats(self, args):
+        "Print the statistics of the recorded runtime metrics of operations."
+        summary = _summarize_metrics(self._load_metrics(), args.operation_name)
+        if args.json:
+            print(json.dumps(summary, indent=4))
+            return
+        if not summary:
+            print(
+                "No runtime metrics of operations have been recorded. Enable "
+                "recording with `signac config set flow.record_metrics True`.",
+                file=sys.stderr,
+            )
+            return
+
+        def _format(value, scale=1):
+            return "-" if value is None else "{:.2f}".format(value / scale)
+
+        rows = [
+            (
+                entry["operation"],
+                str(entry["runs"]),
+                str(entry["failed"]),
+                *(_format(entry["wall_time"][f"p{q}"]) for q in (50, 90, 99, 100)),
+                _format(entry["cpu_time"]),
+                _format(entry["max_rss"], 1024),
+                _format(entry["throughput"]),
+            )
+            for entry in summary
+        ]
+        header = (
+            "Operation",
+            "Runs",
+            "Failed",
+            "P50/s",
+            "P90/s",
+            "P99/s",
+            "Max/s",
+            "CPU/s",
+            "Max RSS/MB",
+            "Runs/h",
+        )
+        print(_format_table(header, rows))
+
+    def _main_failures(self, args):
+        "Print or clear the failures of operations."
+        if args.clear:
+            num_cleared = self._clear_failure_ledger(args.operation_name, args.job_id)
+            print(f"Cleared the failures of {num_cleared} operation(s).")
+            return
+        threshold = self.config["flow"].as_int("failure_quarantine")
+        rows = [
+            (
+                name,
+                ", ".join(job_ids),
+                str(failures),
+                "yes" if threshold and failures >= threshold else "no",
+            )
+            for (name, job_ids), failures in sorted(self._load_failure_ledger().items())
+            if (args.operation_name is None or name in args.operation_name)
+            and (args.job_id is None or not set(job_ids).isdisjoint(args.job_id))
+        ]
+        if not rows:
+            print("No failed operations have been recorded.", file=sys.stderr)
+            return
+        print(_format_table(("Operation", "Jobs", "Failures", "Quarantined"), rows, 2))
+
     def _main_status(self, args):
         "Print status overview."
         jobs = self._select_jobs_from_args(args)
@@ -4077,9 +6843,10 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
 
     def _main_next(self, args):
         "Determine the jobs that are eligible for a specific operation."
-        for op in self._next_operations(self):
-            if args.name in op.name:
-                print(" ".join(map(str, op._jobs)))
+        with self._cached_conditions(self):
+            for op in self._next_operations(self):
+                if args.name in op.name:
+                    print(" ".join(map(str, op._jobs)))
 
     def _main_run(self, args):
         "Run all (or select) job operations."
@@ -4101,6 +6868,8 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             progress=args.progress,
             order=args.order,
             ignore_conditions=args.ignore_conditions,
+            mode=args.mode,
+            keep_going=args.keep_going,
         )
 
         if args.switch_to_project_root:
@@ -4123,28 +6892,29 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         # Select jobs:
         jobs = self._select_jobs_from_args(args)
 
-        # Gather all pending operations or generate them based on a direct command...
-        with self._potentially_buffered():
-            names = args.operation_name if args.operation_name else None
-            default_directives = self._get_default_directives()
-            operations = self._get_submission_operations(
-                jobs,
-                default_directives,
-                names,
-                args.ignore_conditions,
-                args.ignore_conditions_on_execution,
-            )
-            operations = list(islice(operations, args.num))
+        with self._cached_directives(), self._cached_status():
+            # Gather all pending operations or generate them based on a direct command...
+            with self._potentially_buffered(), self._cached_conditions(jobs):
+                names = args.operation_name if args.operation_name else None
+                default_directives = self._get_default_directives()
+                operations = self._get_submission_operations(
+                    jobs,
+                    default_directives,
+                    names,
+                    args.ignore_conditions,
+                    args.ignore_conditions_on_execution,
+                )
+                operations = list(islice(operations, args.num))
 
-        # Generate the script and print to screen.
-        print(
-            self._script(
-                operations=operations,
-                parallel=args.parallel,
-                template=args.template,
-                show_template_help=args.show_template_help,
+            # Generate the script and print to screen.
+            print(
+                self._script(
+                    operations=operations,
+                    parallel=args.parallel,
+                    template=args.template,
+                    show_template_help=args.show_template_help,
+                )
             )
-        )
 
     def _main_submit(self, args):
         "Submit jobs to a scheduler"
@@ -4163,24 +6933,33 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         self.submit(jobs=jobs, names=names, **kwargs)
 
     def _main_exec(self, args):
+        if args.manifest is not None:
+            if args.operation is not None or len(args.job_id):
+                raise ValueError(
+                    "Cannot provide both an operation and a manifest to exec."
+                )
+            manifest = [json.loads(line) for line in args.manifest if line.strip()]
+            failed = self._execute_manifest(manifest, np=args.parallel)
+            for entry, error in failed:
+                print(
+                    "Operation '{}' failed for job(s) {}:\n{}".format(
+                        entry["operation"], ", ".join(entry["jobs"]), error
+                    ),
+                    file=sys.stderr,
+                )
+            if failed:
+                raise RuntimeError(
+                    f"{len(failed)} of {len(manifest)} operations failed."
+                )
+            return
+        elif args.operation is None:
+            raise ValueError("Provide either an operation or a manifest to exec.")
+
         if len(args.job_id):
             jobs = [self.open_job(id=jid) for jid in args.job_id]
         else:
             jobs = self
-        try:
-            operation = self._operations[args.operation]
-
-            if isinstance(operation, FlowCmdOperation):
-
-                def operation_function(job):
-                    cmd = operation(job).format(job=job)
-                    subprocess.run(cmd, shell=True, check=True)
-
-            else:
-                operation_function = operation
-
-        except KeyError:
-            raise KeyError(f"Unknown operation '{args.operation}'.")
+        operation_function = self._get_exec_function(args.operation)
 
         for job in jobs:
             operation_function(job)
@@ -4274,18 +7053,73 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             "config set flow.status_parallelization VALUE`.",
         )
         self._add_print_status_args(parser_status)
+        self._add_condition_cache_args(parser_status)
         parser_status.add_argument(
             "--profile",
-            const=inspect.getsourcefile(inspect.getmodule(self)),
+            const="table",
             nargs="?",
-            help="Collect statistics to determine code paths that are responsible "
-            "for the majority of runtime required for status determination. "
-            "Optionally provide a filename pattern to select for what files "
-            "to show result for. Defaults to the main module. "
-            "(requires pprofile)",
+            choices=["table", "json"],
+            help="Record the number of calls and the runtime of all conditions, "
+            "labels, the scheduler query, and the rendering to determine the "
+            "code paths that are responsible for the majority of runtime "
+            "required for status determination. The results are shown as a "
+            "table (default) or in JSON format.",
         )
         parser_status.set_defaults(func=self._main_status)
 
+        parser_stats = subparsers.add_parser(
+            "stats",
+            parents=[base_parser],
+            description="Show the percentiles of the wall time, the mean CPU "
+            "time, the maximum memory usage, and the throughput of the executed "
+            "operations. The runtime metrics of operations are recorded if the "
+            "flow.record_metrics config value is set. You can do this by "
+            "executing `signac config set flow.record_metrics True`.",
+        )
+        parser_stats.add_argument(
+            "-o",
+            "--operation",
+            dest="operation_name",
+            nargs="+",
+            help="Only show the statistics of operations with the given names.",
+        )
+        parser_stats.add_argument(
+            "--json",
+            action="store_true",
+            help="Show the statistics in JSON format.",
+        )
+        parser_stats.set_defaults(func=self._main_stats)
+
+        parser_failures = subparsers.add_parser(
+            "failures",
+            parents=[base_parser],
+            description="Show the number of consecutive failed executions of "
+            "operations and whether they are quarantined. Failed executions are "
+            "recorded if the flow.failure_quarantine config value is set to the "
+            "number of failures after which operations are quarantined, e.g., "
+            "with `signac config set flow.failure_quarantine 3`.",
+        )
+        parser_failures.add_argument(
+            "-o",
+            "--operation",
+            dest="operation_name",
+            nargs="+",
+            help="Only show or clear the failures of operations with the given names.",
+        )
+        parser_failures.add_argument(
+            "-j",
+            "--job-id",
+            nargs="+",
+            help="Only show or clear the failures of operations of the given jobs.",
+        )
+        parser_failures.add_argument(
+            "--clear",
+            action="store_true",
+            help="Clear the failures, such that quarantined operations are "
+            "executed and submitted again.",
+        )
+        parser_failures.set_defaults(func=self._main_failures)
+
         parser_next = subparsers.add_parser(
             "next",
             parents=[base_parser],
@@ -4346,9 +7180,35 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         execution_group.add_argument(
             "--order",
             type=str,
-            choices=["none", "by-job", "cyclic", "random"],
+            choices=[
+                "none",
+                "by-job",
+                "cyclic",
+                "random",
+                "longest-first",
+                "critical-path",
+            ],
             default=None,
-            help="Specify the execution order of operations for each execution pass.",
+            help="Specify the execution order of operations for each execution pass. "
+            "The orders 'longest-first' and 'critical-path' are based on the recorded "
+            "durations of operations (see the 'stats' command). If the "
+            "'async_cmd_concurrency' configuration value is set, the command "
+            "operations of a pass are executed before its other operations.",
+        )
+        execution_group.add_argument(
+            "--mode",
+            type=str,
+            choices=["passes", "dataflow"],
+            default="passes",
+            help="Execute all eligible operations in passes (default), or execute "
+            "operations as soon as they are eligible ('dataflow').",
+        )
+        execution_group.add_argument(
+            "-k",
+            "--keep-going",
+            action="store_true",
+            help="Continue with the other operations if an operation fails and "
+            "report the failed operations at the end.",
         )
         execution_group.add_argument(
             "--ignore-conditions",
@@ -4358,6 +7218,7 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             action=_IgnoreConditionsConversion,
             help="Specify conditions to ignore for eligibility check.",
         )
+        self._add_condition_cache_args(parser_run)
         parser_run.set_defaults(func=self._main_run)
 
         parser_script = subparsers.add_parser(
@@ -4390,6 +7251,7 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             conflict_handler="resolve",
         )
         self._add_submit_args(parser_submit)
+        self._add_condition_cache_args(parser_submit)
         env_group = parser_submit.add_argument_group(
             f"{self._environment.__name__} options"
         )
@@ -4408,6 +7270,7 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
         parser_exec.add_argument(
             "operation",
             type=str,
+            nargs="?",
             choices=list(sorted(self._operations)),
             help="The operation to execute.",
         )
@@ -4418,6 +7281,25 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             help="The job ids, as registered in the signac project. "
             "Omit to default to all statepoints.",
         )
+        parser_exec.add_argument(
+            "--manifest",
+            type=argparse.FileType("r"),
+            help="Execute the operations listed in a manifest file instead, "
+            "or read the manifest from standard input with '-'. Each line of "
+            "the manifest is a JSON object with the 'operation' name and the "
+            "'jobs' ids, and optionally the conditions to ignore with "
+            "'ignore_conditions' to only execute eligible operations.",
+        )
+        parser_exec.add_argument(
+            "-p",
+            "--parallel",
+            type=int,
+            nargs="?",
+            const=-1,
+            help="Execute the operations of the manifest with the given number of "
+            "processes. Defaults to all available processing units if argument "
+            "is omitted.",
+        )
         parser_exec.set_defaults(func=self._main_exec)
 
         args = parser.parse_args()
@@ -4440,6 +7322,11 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             args.verbose = max(2, args.verbose)
             args.show_traceback = True
 
+        # Configure the persistent condition cache for this invocation.
+        if hasattr(args, "condition_cache"):
+            self._condition_cache_mode = args.condition_cache
+            delattr(args, "condition_cache")
+
         # Support print_status argument alias
         if args.func == self._main_status and args.full:
             args.detailed = args.all_ops = True
@@ -4525,22 +7412,190 @@ class FlowProject(signac.contrib.Project, metaclass=_FlowProjectClass):
             _show_traceback_and_exit(error)
 
 
-def _execute_serialized_operation(loads, project, operation):
-    """Invoke the _execute_operation() method on a serialized project instance."""
-    project = loads(project)
-    project._execute_operation(project._loads_op(operation))
+# The project instance of a worker process, see FlowProject._worker_pool().
+_worker_project = None
+_worker_context = None
 
 
-def _serialized_get_job_status(s_task):
-    """Invoke the _get_job_status() method on a serialized project instance."""
-    loads = s_task[0]
-    project = loads(s_task[1])
-    job = project.open_job(id=s_task[2])
-    ignore_errors = s_task[3]
-    cached_status = s_task[4]
-    return project.get_job_status(
-        job, ignore_errors=ignore_errors, cached_status=cached_status
-    )
+def _initialize_worker(loads, s_project, context):
+    """Deserialize the project once per worker process.
+
+    If the project cannot be deserialized, the error is stored in place of the
+    project and raised by each task, see :func:`~._get_worker_project`, since
+    the pool would otherwise replace the failing worker process indefinitely.
+    """
+    global _worker_project, _worker_context
+    try:
+        _worker_project = loads(s_project)
+    except Exception as error:
+        _worker_project = error
+    _worker_context = dict() if context is None else context
+
+
+def _get_worker_project():
+    """Return the project instance of a worker process.
+
+    :raises Exception:
+        The error raised while deserializing the project.
+    """
+    if isinstance(_worker_project, Exception):
+        raise _worker_project
+    return _worker_project
+
+
+def _get_chunksize(num_tasks, processes=None):
+    """Return the number of tasks sent to a worker process at once."""
+    if processes is None:
+        processes = cpu_count()
+    return max(1, num_tasks // (4 * processes))
+
+
+def _execute_operation_in_worker(operation, timeout=None, allocation=None):
+    """Invoke the _execute_operation() method on the worker's project instance.
+
+    If provided, the operation is confined to the resources of the allocation.
+    """
+    project = _get_worker_project()
+    operation = project._loads_op(operation)
+    if allocation is None:
+        project._execute_operation(operation, timeout)
+    else:
+        with allocated(allocation):
+            project._execute_operation(operation, timeout)
+
+
+class _OperationWorker:
+    """A worker process that calls the functions of operations one at a time.
+
+    Unlike the processes of a :class:`multiprocessing.pool.Pool`, the process
+    is not daemonic, such that operations may start processes themselves,
+    e.g., with a pool of worker processes. Like a pool, the worker is closed
+    with :meth:`~.close` and :meth:`~.join`, or terminated with
+    :meth:`~.terminate`, e.g., if an operation times out.
+
+    :param loads:
+        The function to deserialize the project.
+    :type loads:
+        callable
+    :param s_project:
+        The serialized project, see :meth:`FlowProject._dumps_project`.
+    :type s_project:
+        bytes
+    """
+
+    def __init__(self, loads, s_project):
+        self._connection, connection = Pipe()
+        self._process = Process(
+            target=_run_operation_worker, args=(connection, loads, s_project)
+        )
+        self._process.start()
+        connection.close()
+
+    def call(self, operation, timeout=None):
+        """Call the function of an operation and return once it completed.
+
+        :param operation:
+            The serialized operation, see :meth:`FlowProject._dumps_op`.
+        :type operation:
+            tuple
+        :param timeout:
+            The time in seconds to wait for the completion (Default value =
+            None).
+        :type timeout:
+            float
+        :raises TimeoutError:
+            If the operation does not complete within the timeout.
+        :raises EOFError:
+            If the worker process exited.
+        """
+        self._connection.send(operation)
+        if not self._connection.poll(timeout):
+            raise TimeoutError()
+        error = self._connection.recv()
+        if error is not None:
+            raise error
+
+    def close(self):
+        """Let the worker process exit once the current operation completed."""
+        try:
+            self._connection.send(None)
+        except OSError:
+            pass  # The worker process exited.
+        self._connection.close()
+
+    def join(self):
+        """Wait for the worker process to exit."""
+        self._process.join()
+
+    def terminate(self):
+        """Terminate the worker process immediately."""
+        self._process.terminate()
+        self._process.join()
+        self._connection.close()
+
+
+def _run_operation_worker(connection, loads, s_project):
+    """Call the functions of the operations received from the connection.
+
+    The error of each operation, or None, is sent back once it completed. If
+    the project cannot be deserialized, the error is sent for each operation.
+    """
+    try:
+        project = loads(s_project)
+    except Exception as error:
+        project, init_error = None, ExceptionWithTraceback(error, error.__traceback__)
+    while True:
+        try:
+            operation = connection.recv()
+        except EOFError:
+            return  # The project process exited.
+        if operation is None:
+            return  # The worker was closed.
+        if project is None:
+            connection.send(init_error)
+            continue
+        try:
+            project._call_operation_function(project._loads_op(operation))
+        except Exception as error:
+            error = ExceptionWithTraceback(error, error.__traceback__)
+            try:
+                connection.send(error)
+            except Exception:  # The error cannot be serialized.
+                connection.send(RuntimeError(error.tb))
+        else:
+            connection.send(None)
+
+
+def _try_execute_operation_in_worker(operation, timeout=None):
+    """Invoke _execute_operation_in_worker() and return the error if it failed.
+
+    Like errors raised in a pool of worker processes, the returned error
+    carries the formatted traceback of the worker as its cause.
+    """
+    try:
+        _execute_operation_in_worker(operation, timeout)
+    except Exception as error:
+        return ExceptionWithTraceback(error, error.__traceback__)
+    return None
+
+
+def _execute_manifest_entry_in_worker(entry):
+    """Invoke the _execute_manifest_entry() method on the worker's project instance."""
+    return _get_worker_project()._execute_manifest_entry(entry)
+
+
+def _get_job_status_in_worker(job_id):
+    """Invoke the get_job_status() method on the worker's project instance."""
+    project = _get_worker_project()
+    job = project.open_job(id=job_id)
+    return project.get_job_status(job, **_worker_context)
+
+
+def _evaluate_eligibility_in_worker(job_id):
+    """Invoke the _evaluate_eligibility() method on the worker's project instance."""
+    project = _get_worker_project()
+    job = project.open_job(id=job_id)
+    return project._evaluate_eligibility(job, **_worker_context)
 
 
 # Status-related helper functions
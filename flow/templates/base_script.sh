@@ -15,7 +15,17 @@ cd {{ project.config.project_dir }}
 {% endblock %}
 {% block body %}
 {% set cmd_suffix = cmd_suffix|default('') ~ (' &' if parallel else '') %}
-{% for operation in operations %}
+{% set batched_ids = batched_ids|default([]) %}
+{% for batch in batches|default([]) %}
+
+# Batch of {{ batch.operations|length }} operations
+{{ batch.cmd }} << 'FLOW_MANIFEST'{{ cmd_suffix }}
+{% for line in batch.manifest %}
+{{ line }}
+{% endfor %}
+FLOW_MANIFEST
+{% endfor %}
+{% for operation in operations if operation.id not in batched_ids %}
 
 # {{ "%s"|format(operation) }}
 {{ operation.cmd }}{{ cmd_suffix }}
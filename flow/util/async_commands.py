@@ -0,0 +1,214 @@
+# Copyright (c) 2020 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Concurrent execution of shell commands within one process with asyncio."""
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+async def _forward(stream, file):
+    """Forward the output of a stream to a file line by line as it arrives."""
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        file.write(line.decode(errors="replace"))
+        file.flush()
+
+
+def _kill(process):
+    """Kill a process and all processes in its session."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass  # The process has completed already.
+
+
+async def _run_command(cmd, semaphore, timeout, start_callback, stdout, stderr):
+    async with semaphore:
+        if start_callback is not None:
+            start_callback(cmd)
+        # The command is started in a new session, so that all of its child
+        # processes are killed upon timeout or cancellation. The creation is
+        # shielded, since the process may be started even if it is cancelled.
+        creation = asyncio.ensure_future(
+            asyncio.create_subprocess_shell(
+                cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+        )
+        process = None
+        try:
+            process = await asyncio.shield(creation)
+            await asyncio.wait_for(
+                asyncio.gather(
+                    _forward(process.stdout, stdout),
+                    _forward(process.stderr, stderr),
+                    process.wait(),
+                ),
+                timeout,
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if process is None:
+                process = await creation
+            _kill(process)
+            await process.wait()
+            if isinstance(error, asyncio.TimeoutError):
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            raise
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+
+
+async def _run_commands(
+    commands,
+    max_concurrency,
+    timeout,
+    callback,
+    start_callback,
+    error_callback,
+    keep_going,
+    stdout,
+    stderr,
+):
+    semaphore = asyncio.Semaphore(max_concurrency or len(commands) or 1)
+    errors = []
+
+    async def run(cmd):
+        try:
+            await _run_command(cmd, semaphore, timeout, start_callback, stdout, stderr)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as error:
+            if error_callback is not None:
+                error_callback(error)
+            if not keep_going:
+                raise
+            errors.append(error)
+            return
+        if callback is not None:
+            callback(cmd)
+
+    tasks = [asyncio.ensure_future(run(cmd)) for cmd in commands]
+    try:
+        for task in asyncio.as_completed(tasks):
+            await task
+    finally:
+        # Cancel the remaining commands if one of them failed.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return errors
+
+
+def _event_loop_running():
+    """Return whether an event loop is running in the current thread."""
+    if sys.version_info < (3, 7):
+        try:
+            return asyncio.get_event_loop().is_running()
+        except RuntimeError:
+            return False
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _run_until_complete(coroutine):
+    if sys.version_info < (3, 7):
+        return asyncio.get_event_loop().run_until_complete(coroutine)
+    return asyncio.run(coroutine)
+
+
+def run_commands(
+    commands,
+    max_concurrency=None,
+    timeout=None,
+    callback=None,
+    keep_going=False,
+    stdout=None,
+    stderr=None,
+    start_callback=None,
+    error_callback=None,
+):
+    """Execute shell commands concurrently within the current process.
+
+    The commands are executed as asyncio subprocesses, so that waiting for
+    them does not require a thread or process per command. The output of the
+    commands is forwarded line by line as it arrives. If a command fails or
+    does not complete within the timeout, all other commands are cancelled
+    and killed, as they are if the execution is interrupted, unless
+    keep_going is set.
+
+    :param commands:
+        The shell commands to execute.
+    :type commands:
+        Sequence of :class:`str`
+    :param max_concurrency:
+        The maximum number of commands to execute at the same time. All
+        commands are executed at the same time if None.
+    :type max_concurrency:
+        int
+    :param timeout:
+        The timeout for each command in seconds.
+    :type timeout:
+        float
+    :param callback:
+        A function that is called with each command that completed
+        successfully.
+    :type callback:
+        callable
+    :param keep_going:
+        Continue with the other commands if a command fails or does not
+        complete within the timeout.
+    :type keep_going:
+        bool
+    :param stdout:
+        The file to forward the standard output of the commands to, defaults
+        to ``sys.stdout``.
+    :param stderr:
+        The file to forward the standard error of the commands to, defaults
+        to ``sys.stderr``.
+    :param start_callback:
+        A function that is called with each command when it is started.
+    :type start_callback:
+        callable
+    :param error_callback:
+        A function that is called with the error of each command that failed
+        or did not complete within the timeout.
+    :type error_callback:
+        callable
+    :return:
+        The errors of the failed commands if keep_going is set.
+    :rtype:
+        list
+    :raises subprocess.CalledProcessError:
+        If a command exits with a non-zero exit status.
+    :raises subprocess.TimeoutExpired:
+        If a command does not complete within the timeout.
+    """
+    coroutine = _run_commands(
+        list(commands),
+        max_concurrency,
+        timeout,
+        callback,
+        start_callback,
+        error_callback,
+        keep_going,
+        sys.stdout if stdout is None else stdout,
+        sys.stderr if stderr is None else stderr,
+    )
+    if not _event_loop_running():
+        return _run_until_complete(coroutine)
+    # An event loop is already running in this thread, e.g. within a Jupyter
+    # notebook, hence the commands are executed from a separate thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_until_complete, coroutine).result()
@@ -15,7 +15,16 @@ status_performance_warn_threshold = float(default=0.2)
 show_traceback = boolean()
 eligible_jobs_max_lines = int(default=10)
 status_parallelization = string(default='thread')
+gather_parallelization = string(default='none')
 use_buffered_mode = boolean(default=True)
+persistent_condition_cache = boolean(default=False)
+adaptive_condition_order = boolean(default=False)
+graph_aware_evaluation = boolean(default=False)
+incremental_run = boolean(default=False)
+async_cmd_concurrency = integer(min=0, default=0)
+resource_aware_run = boolean(default=False)
+record_metrics = boolean(default=False)
+failure_quarantine = integer(min=0, default=0)
 """
 
 
@@ -2,8 +2,11 @@
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
 import argparse
+import json
 import logging
 import os
+import threading
+import time
 from contextlib import contextmanager
 from itertools import cycle, islice
 
@@ -111,6 +114,124 @@ def switch_to_directory(root=None):
             os.chdir(cwd)
 
 
+def _dump_json_atomically(obj, filename, lines=False):
+    """Write obj as JSON to filename, atomically replacing any existing file.
+
+    The data is first written to a temporary file in the same directory, which
+    is then moved into place, so that readers never observe a partially written
+    file. If lines is set, obj is an iterable of which each element is written
+    as JSON on a separate line (JSON lines).
+    """
+    dirname = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(dirname, exist_ok=True)
+    fn_tmp = os.path.join(dirname, f"._{os.path.basename(filename)}.{os.getpid()}")
+    try:
+        with open(fn_tmp, "w") as file:
+            if lines:
+                file.writelines(json.dumps(element) + "\n" for element in obj)
+            else:
+                json.dump(obj, file)
+        os.replace(fn_tmp, filename)
+    finally:
+        if os.path.exists(fn_tmp):
+            os.remove(fn_tmp)
+
+
+class _Profiler:
+    """Record the number of calls, errors, and the runtime of named code paths.
+
+    Code paths are identified by a category (e.g. ``"condition"``) and a name.
+    Instances of this class are thread-safe.
+    """
+
+    def __init__(self):
+        self._stats = dict()
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def record(self, category, name):
+        "Record the runtime of the code executed within this context."
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats.setdefault((category, name), [0, 0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += error
+                stats[2] += elapsed
+                stats[3] = max(stats[3], elapsed)
+
+    def results(self):
+        "Return the recorded statistics as dicts, sorted by total runtime."
+        results = [
+            {
+                "category": category,
+                "name": name,
+                "calls": calls,
+                "errors": errors,
+                "total": total,
+                "mean": total / calls,
+                "max": max_,
+            }
+            for (category, name), (calls, errors, total, max_) in self._stats.items()
+        ]
+        return sorted(results, key=lambda r: r["total"], reverse=True)
+
+    def to_json(self):
+        "Return the results and the total runtime formatted as JSON."
+        return json.dumps(
+            {
+                "total_time": time.perf_counter() - self._start,
+                "results": self.results(),
+            },
+            indent=4,
+        )
+
+    def to_table(self):
+        "Return the results and the total runtime formatted as a table."
+        rows = [
+            (
+                r["category"],
+                r["name"],
+                str(r["calls"]),
+                str(r["errors"]),
+                "{:.3f}".format(r["total"]),
+                "{:.3f}".format(1e3 * r["mean"]),
+                "{:.3f}".format(1e3 * r["max"]),
+            )
+            for r in self.results()
+        ]
+        header = ("Category", "Name", "Calls", "Errors", "Total/s", "Mean/ms", "Max/ms")
+        return "{}\n\nTotal runtime: {:.3f}s".format(
+            _format_table(header, rows, 2), time.perf_counter() - self._start
+        )
+
+
+def _format_table(header, rows, num_text_columns=1):
+    """Format rows of strings as a table with a header.
+
+    The first num_text_columns columns are aligned to the left, all other
+    columns are aligned to the right.
+    """
+    widths = [max(map(len, column)) for column in zip(header, *rows)]
+    lines = []
+    for row in [header, tuple("-" * w for w in widths)] + list(rows):
+        lines.append(
+            "  ".join(
+                value.ljust(w) if i < num_text_columns else value.rjust(w)
+                for i, (value, w) in enumerate(zip(row, widths))
+            ).rstrip()
+        )
+    return "\n".join(lines)
+
+
 class TrackGetItemDict(dict):
     "A dict that keeps track of which keys were accessed via __getitem__."
 
@@ -0,0 +1,256 @@
+# Copyright (c) 2020 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Accounting of the processors, GPUs, and memory of the local node."""
+import contextlib
+import os
+import re
+import subprocess
+from multiprocessing import cpu_count
+
+# The memory in gigabytes per unit of a memory string, e.g. "4g".
+_MEMORY_UNITS = {"k": 2 ** -20, "m": 2 ** -10, "g": 1, "t": 2 ** 10}
+
+
+def _get_cores():
+    """Return the ids of the CPU cores available to this process."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(cpu_count()))
+
+
+def _get_gpus():
+    """Return the ids of the GPUs available to this process, or None if unknown.
+
+    The GPUs are those made visible with the ``CUDA_VISIBLE_DEVICES``
+    environment variable, if set, otherwise those listed by ``nvidia-smi``.
+    """
+    devices = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if devices is not None:
+        return [device.strip() for device in devices.split(",") if device.strip()]
+    try:
+        output = subprocess.run(
+            ["nvidia-smi", "-L"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+            timeout=30,
+        ).stdout.decode(errors="replace")
+    except (OSError, subprocess.SubprocessError):
+        return None
+    num_gpus = sum(1 for line in output.splitlines() if line.startswith("GPU "))
+    return [str(i) for i in range(num_gpus)]
+
+
+def _get_memory():
+    """Return the physical memory of the node in gigabytes, or None if unknown."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2 ** 30
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _parse_memory(value):
+    """Return the memory in gigabytes requested by a ``memory`` directive.
+
+    :param value:
+        The number of gigabytes, or a string with an optional unit suffix as
+        used in scheduler templates, e.g. ``"512m"`` or ``"4g"``. A number
+        without unit is in gigabytes.
+    :type value:
+        float or str
+    :return:
+        The memory in gigabytes, or 0 if the value is None.
+    :rtype:
+        float
+    :raises ValueError:
+        If the value is not a valid amount of memory.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        match = re.fullmatch(
+            r"\s*(\d+(?:\.\d*)?|\.\d+)\s*([kmgt]?)b?\s*", value, re.IGNORECASE
+        )
+        if match is None:
+            raise ValueError(f"Invalid amount of memory: '{value}'.")
+        number, unit = match.groups()
+        return float(number) * _MEMORY_UNITS[unit.lower() or "g"]
+    memory = float(value)
+    if memory < 0:
+        raise ValueError(f"Invalid amount of memory: {value}.")
+    return memory
+
+
+class LocalResources:
+    """The resources of the local node that are available to operations.
+
+    Operations are allocated resources according to their ``np``, ``ngpu``,
+    and ``memory`` directives, such that the resources of all running
+    operations never exceed the capacity.
+
+    :param cores:
+        The ids of the CPU cores.
+    :type cores:
+        sequence
+    :param gpus:
+        The ids of the GPUs, or None to not account for GPUs.
+    :type gpus:
+        sequence
+    :param memory:
+        The memory in gigabytes, or None to not account for memory.
+    :type memory:
+        float
+    """
+
+    def __init__(self, cores, gpus=(), memory=None):
+        self.cores = list(cores)
+        self.gpus = None if gpus is None else list(gpus)
+        self.memory = memory
+        self._free_cores = set(self.cores)
+        self._free_gpus = None if gpus is None else set(self.gpus)
+        self._free_memory = memory
+
+    @classmethod
+    def detect(cls, np=None):
+        """Detect the resources of the local node.
+
+        :param np:
+            Limit the number of CPU cores, or use all cores if None or
+            negative.
+        :type np:
+            int
+        :return:
+            The available cores and GPUs and the physical memory. GPUs and
+            memory are not accounted for if unknown.
+        :rtype:
+            :class:`~.LocalResources`
+        """
+        cores = _get_cores()
+        if np is not None and np > 0:
+            cores = cores[:np]
+        return cls(cores, _get_gpus(), _get_memory())
+
+    @staticmethod
+    def _demand(directives):
+        return (
+            directives.get("np", 1),
+            directives.get("ngpu", 0),
+            _parse_memory(directives.get("memory")),
+        )
+
+    def fits(self, directives):
+        """Return whether the resources suffice for an operation at all.
+
+        :param directives:
+            The directives of the operation.
+        :type directives:
+            dict
+        :rtype:
+            bool
+        :raises ValueError:
+            If the ``memory`` directive is invalid.
+        """
+        np, ngpu, memory = self._demand(directives)
+        return (
+            np <= len(self.cores)
+            and (self.gpus is None or ngpu <= len(self.gpus))
+            and (self.memory is None or memory <= self.memory)
+        )
+
+    def allocate(self, directives):
+        """Allocate free resources to an operation.
+
+        :param directives:
+            The directives of the operation.
+        :type directives:
+            dict
+        :return:
+            The allocated ``cores``, ``gpus``, and ``memory`` and the number
+            of OpenMP threads of the operation, or None if the free resources
+            do not suffice. The ``gpus`` are None if GPUs are not accounted for.
+        :rtype:
+            dict
+        """
+        np, ngpu, memory = self._demand(directives)
+        if (
+            np > len(self._free_cores)
+            or (self._free_gpus is not None and ngpu > len(self._free_gpus))
+            or (self._free_memory is not None and memory > self._free_memory)
+        ):
+            return None
+        cores = sorted(self._free_cores)[:np]
+        self._free_cores.difference_update(cores)
+        if self._free_gpus is None:
+            gpus = None
+        else:
+            gpus = sorted(self._free_gpus)[:ngpu]
+            self._free_gpus.difference_update(gpus)
+        if self._free_memory is not None:
+            self._free_memory -= memory
+        omp_num_threads = directives.get("omp_num_threads") or max(
+            1, np // max(1, directives.get("nranks", 0))
+        )
+        return {
+            "cores": cores,
+            "gpus": gpus,
+            "memory": memory,
+            "omp_num_threads": omp_num_threads,
+        }
+
+    def release(self, allocation):
+        """Release the resources of an allocation.
+
+        :param allocation:
+            An allocation returned by :meth:`~.allocate`.
+        :type allocation:
+            dict
+        """
+        self._free_cores.update(allocation["cores"])
+        if self._free_gpus is not None:
+            self._free_gpus.update(allocation["gpus"])
+        if self._free_memory is not None:
+            self._free_memory += allocation["memory"]
+
+
+@contextlib.contextmanager
+def allocated(allocation):
+    """Confine the current process to the resources of an allocation.
+
+    The CPU affinity of the process and the ``OMP_NUM_THREADS`` and
+    ``CUDA_VISIBLE_DEVICES`` environment variables, which are inherited by
+    child processes, are restored upon exit. ``CUDA_VISIBLE_DEVICES`` is not
+    set if GPUs are not accounted for.
+
+    .. note::
+
+        The environment variables only take effect for forked operations and
+        for runtimes that are initialized within this context. An OpenMP or
+        CUDA runtime that was already initialized in this process, e.g., by
+        an operation executed earlier by the same worker process, is not
+        affected.
+
+    :param allocation:
+        An allocation returned by :meth:`~.LocalResources.allocate`.
+    :type allocation:
+        dict
+    """
+    environ = {
+        key: os.environ.get(key) for key in ("OMP_NUM_THREADS", "CUDA_VISIBLE_DEVICES")
+    }
+    affinity = os.sched_getaffinity(0) if hasattr(os, "sched_setaffinity") else None
+    try:
+        if affinity is not None:
+            os.sched_setaffinity(0, allocation["cores"])
+        os.environ["OMP_NUM_THREADS"] = str(allocation["omp_num_threads"])
+        if allocation["gpus"] is not None:
+            os.environ["CUDA_VISIBLE_DEVICES"] = ",".join(map(str, allocation["gpus"]))
+        yield
+    finally:
+        if affinity is not None:
+            os.sched_setaffinity(0, affinity)
+        for key, value in environ.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
@@ -230,6 +230,32 @@ class TestDirectives:
         with pytest.raises(KeyError):
             directives["test"]
 
+    def test_copy_on_write(self, directives, non_default_directive_values):
+        directives["test"] = True
+        copy = directives.copy()
+        assert dict(copy) == dict(directives)
+        assert copy._defined_directives is directives._defined_directives
+        copy.update(non_default_directive_values[1])
+        del copy["test"]
+        assert directives[_NP._name] == _NP._default
+        assert directives["test"]
+        assert copy[_NP._name] == non_default_directive_values[1]["np"]
+        assert "test" not in copy
+        copy = directives.copy()
+        copy._add_directive(_Directive("test_directive", default=1))
+        assert copy["test_directive"] == 1
+        assert "test_directive" not in directives
+
+    def test_evaluate_copy_on_write(self, directives):
+        copy = directives.copy()
+        copy.evaluate((None,))
+        assert copy._defined_directives is directives._defined_directives
+        directives["test"] = lambda job: job
+        copy = directives.copy()
+        copy.evaluate((None,))
+        assert copy["test"] is None
+        assert callable(directives["test"])
+
     def test_update_directive_without_aggregate(
         self, directives, non_default_directive_values
     ):
@@ -3,11 +3,15 @@
 # This software is licensed under the BSD 3-Clause License.
 import collections.abc
 import inspect
+import json
 import logging
+import multiprocessing
 import os
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import uuid
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
 from distutils.version import StrictVersion
@@ -15,6 +19,7 @@ from functools import partial
 from io import StringIO
 from itertools import groupby
 from tempfile import TemporaryDirectory
+from unittest import mock
 
 import pytest
 import signac
@@ -25,12 +30,15 @@ from deprecation import fail_if_not_removed
 import flow
 from flow import FlowProject, cmd, directives, init, with_job
 from flow.environment import ComputeEnvironment
+from flow.errors import UserOperationError
+from flow.project import _FlowCondition
 from flow.scheduling.base import ClusterJob, JobStatus, Scheduler
 from flow.util.misc import (
     add_cwd_to_environment_pythonpath,
     add_path_to_environment_pythonpath,
     switch_to_directory,
 )
+from flow.util.resources import LocalResources, allocated
 
 
 @contextmanager
@@ -42,6 +50,10 @@ def suspend_logging():
         logging.disable(logging.NOTSET)
 
 
+def _failing_loads(s_project):
+    raise RuntimeError("Unable to deserialize the project.")
+
+
 class MockScheduler(Scheduler):
     _jobs = {}  # needs to be singleton
     _scripts = {}
@@ -476,6 +488,28 @@ class TestProjectClass(TestProjectBase):
             for next_op in project._next_operations((job,)):
                 assert next_op.directives["np"] == expected_np
 
+    def test_callable_directives_memoized(self):
+        class A(FlowProject):
+            pass
+
+        group = A.make_group("group")
+        evaluated = []
+
+        def nranks(job):
+            evaluated.append(job.get_id())
+            return 2
+
+        @group
+        @A.operation
+        @directives(nranks=nranks, walltime=nranks)
+        def a(job):
+            return "hello!"
+
+        project = self.mock_project(A)
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+            project.submit(pretend=True)
+        assert sorted(evaluated) == sorted(job.get_id() for job in project)
+
     def test_copy_conditions(self):
         class A(FlowProject):
             pass
@@ -669,6 +703,28 @@ class TestProject(TestProjectBase):
                 with redirect_stderr(StringIO()):
                     project.print_status(parameters=parameters, detailed=True)
 
+    def test_project_status_profile(self):
+        project = self.mock_project()
+        for profile in (True, "json"):
+            out = StringIO()
+            with redirect_stderr(StringIO()):
+                project.print_status(profile=profile, file=out)
+            out = out.getvalue()
+            if profile is True:
+                assert "# Profiling:" in out
+                assert "b_is_even" in out
+                continue
+            profile_start = out.rindex("\n{\n")
+            results = json.loads(out[profile_start:])["results"]
+            calls = {(r["category"], r["name"]): r["calls"] for r in results}
+            assert calls[("label", "default_label")] == len(project)
+            assert calls[("condition", "isfile('world.txt')")] == len(project)
+            assert calls[("render", "terminal")] == 1
+            # Results are sorted by the total runtime.
+            totals = [r["total"] for r in results]
+            assert totals == sorted(totals, reverse=True)
+        assert project._profiler is None
+
     def test_script(self):
         project = self.mock_project()
         for job in project:
@@ -745,6 +801,8 @@ execution_orders = (
     "cyclic",
     "by-job",
     "random",
+    "longest-first",
+    "critical-path",
     lambda op: (op.name, op._jobs[0].get_id()),
 )
 
@@ -849,6 +907,491 @@ class TestExecutionProject(TestProjectBase):
             else:
                 assert not job.isfile("world.txt")
 
+    def test_run_async_cmd(self):
+        project = self.mock_project()
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.isfile("out.txt")
+        @cmd
+        def write(job):
+            return "echo {job.sp.b} > {job.ws}/out.txt"
+
+        @Project.operation
+        @cmd
+        def wait(job):
+            return "sleep 60"
+
+        config = project.config.copy()
+        config["flow"]["async_cmd_concurrency"] = 2
+        config["flow"]["record_metrics"] = True
+        project = Project(config=config)
+        project.run(names=["write"])
+        for job in project:
+            with open(job.fn("out.txt")) as file:
+                assert int(file.read()) == job.sp.b
+        records = list(project._load_metrics())
+        assert sorted(record["jobs"][0] for record in records) == sorted(
+            job.id for job in project
+        )
+        for record in records:
+            assert record["operation"] == "write"
+            assert record["status"] == 0
+            assert record["wall_time"] >= 0
+
+        # All commands are cancelled once the first one times out.
+        start = time.time()
+        with pytest.raises(subprocess.TimeoutExpired):
+            project.run(names=["wait"], timeout=0.5)
+        assert time.time() - start < 30
+
+    def test_run_with_resources(self, monkeypatch):
+        resources = LocalResources(cores=range(4), gpus=["0", "1"], memory=8)
+        assert resources.fits(dict(np=4, ngpu=2, memory=8))
+        assert not resources.fits(dict(np=5))
+        # The memory may be given with a unit like in scheduler templates.
+        assert resources.fits(dict(memory="8g"))
+        assert resources.fits(dict(memory="512M"))
+        assert not resources.fits(dict(memory="9G"))
+        with pytest.raises(ValueError):
+            resources.fits(dict(memory="8 gigabytes"))
+        first = resources.allocate(dict(np=3, ngpu=1, memory=2))
+        assert first["cores"] == [0, 1, 2]
+        assert first["gpus"] == ["0"]
+        assert first["omp_num_threads"] == 3
+        assert resources.allocate(dict(np=2)) is None
+        assert resources.allocate(dict(np=1, memory=7)) is None
+        second = resources.allocate(dict(np=1, ngpu=1, memory=6))
+        assert second["cores"] == [3]
+        assert second["gpus"] == ["1"]
+        resources.release(first)
+        assert resources.allocate(dict(np=3, nranks=3))["omp_num_threads"] == 1
+        # GPUs are not accounted for if unknown.
+        resources = LocalResources(cores=range(4), gpus=None)
+        assert resources.fits(dict(ngpu=2))
+        assert resources.allocate(dict(ngpu=2))["gpus"] is None
+
+        monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "")
+        resources = LocalResources.detect(1)
+        assert resources.gpus == []
+        allocation = resources.allocate(dict(np=1, omp_num_threads=2))
+        omp_num_threads = os.environ.get("OMP_NUM_THREADS")
+        with allocated(allocation):
+            assert os.environ["OMP_NUM_THREADS"] == "2"
+            assert os.environ["CUDA_VISIBLE_DEVICES"] == ""
+        assert os.environ.get("OMP_NUM_THREADS") == omp_num_threads
+
+        project = self.mock_project()
+        config = project.config.copy()
+        config["flow"]["resource_aware_run"] = True
+        project = type(project)(config=config)
+        project._entrypoint = self.entrypoint
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    # The operation op3 requires a GPU, but none is visible.
+                    with pytest.raises(RuntimeError):
+                        project.run(np=2, names=["op3"])
+                    project.run(np=2, names=["op1", "op2"])
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        for job in project:
+            assert job.isfile("world.txt") == (job in even_jobs)
+            assert job.doc.get("test")
+
+    def test_run_order_by_duration(self):
+        project = self.mock_project()
+        executed = []
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true("first")
+        def first(job):
+            executed.append("first")
+            job.doc.first = True
+
+        @Project.operation
+        @Project.pre.after(first)
+        @Project.post.true("second")
+        def second(job):
+            executed.append("second")
+            job.doc.second = True
+
+        @Project.operation
+        @Project.post.true("other")
+        def other(job):
+            executed.append("other")
+            job.doc.other = True
+
+        project = Project(project.config)
+        # Without history, the critical path is the longest chain of operations.
+        assert project._get_operation_priorities("critical-path") == dict(
+            first=2, second=1, other=1
+        )
+        os.makedirs(os.path.dirname(project._fn_metrics()))
+        with open(project._fn_metrics(), "w") as file:
+            for name, wall_time in (("first", 1), ("second", 10), ("other", 5)):
+                record = dict(operation=name, wall_time=wall_time, status=0)
+                file.write(json.dumps(record) + "\n")
+            file.write(json.dumps(dict(operation="first", wall_time=99, status=1)))
+        assert project._get_operation_priorities("longest-first") == dict(
+            first=1, second=10, other=5
+        )
+        assert project._get_operation_priorities("critical-path") == dict(
+            first=11, second=10, other=5
+        )
+        job = next(iter(project))
+        project.run(jobs=[job], order="critical-path", num_passes=None)
+        assert executed == ["first", "other", "second"]
+
+    def test_record_metrics(self):
+        project = self.mock_project()
+        config = project.config.copy()
+        config["flow"]["record_metrics"] = True
+        project = type(project)(config=config)
+        project._entrypoint = self.entrypoint
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(names=["op1", "op2"])
+        records = list(project._load_metrics())
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        assert len(records) == len(project) + len(even_jobs)
+        for record in records:
+            assert record["status"] == 0
+            assert record["end"] - record["start"] == record["wall_time"]
+            # The max RSS is only known for forked operations.
+            if record["operation"] == "op1":
+                assert record["max_rss"] > 0
+            else:
+                assert record["max_rss"] is None
+            assert record["cpu_time"] >= 0
+        summary = {
+            entry["operation"]: entry
+            for entry in flow.project._summarize_metrics(records)
+        }
+        assert summary["op1"]["runs"] == len(even_jobs)
+        assert summary["op2"]["runs"] == len(project)
+        assert summary["op2"]["failed"] == 0
+        wall_time = summary["op2"]["wall_time"]
+        assert wall_time["p50"] <= wall_time["p90"] <= wall_time["p99"]
+        assert wall_time["p99"] <= wall_time["p100"]
+
+    def test_record_metrics_manifest(self):
+        project = self.mock_project()
+        config = project.config.copy()
+        config["flow"]["record_metrics"] = True
+        project = type(project)(config=config)
+        manifest = [dict(operation="op2", jobs=[job.id]) for job in project]
+        manifest.append(dict(operation="op3", jobs=["0" * 32]))
+        with redirect_stderr(StringIO()):
+            assert len(project._execute_manifest(manifest)) == 1
+        records = list(project._load_metrics())
+        assert len(records) == len(project)
+        for record in records:
+            assert record["operation"] == "op2"
+            assert record["status"] == 0
+            assert record["cpu_time"] >= 0
+
+    def test_run_command(self):
+        usage = flow.project._run_command("true")
+        assert usage is None or usage.ru_maxrss > 0
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            flow.project._run_command("exit 3")
+        assert error.value.returncode == 3
+        with pytest.raises(subprocess.TimeoutExpired):
+            flow.project._run_command("sleep 10", timeout=0.1)
+
+    def test_run_retry(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true("done")
+        @directives(max_retries=2, retry_backoff=0)
+        def flaky(job):
+            job.doc.attempts = job.doc.get("attempts", 0) + 1
+            if job.doc.attempts < 3:
+                raise RuntimeError("flaky")
+            job.doc.done = True
+
+        project = self.mock_project(Project)
+        with redirect_stderr(StringIO()):
+            project.run()
+        for job in project:
+            assert job.doc.attempts == 3
+            assert job.doc.done
+
+    def test_run_timeout_in_worker(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true("pid")
+        def fast(job):
+            job.doc.pid = os.getpid()
+
+        @Project.operation
+        @Project.post.true("slow")
+        def slow(job):
+            time.sleep(60)
+
+        project = self.mock_project(Project)
+        project.run(names=["fast"], timeout=30)
+        # All operations are executed by the same worker process.
+        pids = {job.doc.pid for job in project}
+        assert len(pids) == 1
+        assert os.getpid() not in pids
+
+        start = time.time()
+        with pytest.raises(subprocess.TimeoutExpired):
+            project.run(names=["slow"], timeout=0.5)
+        assert time.time() - start < 30
+
+    def test_run_timeout_child_process(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true("spawned")
+        def spawn(job):
+            # Operations may start processes themselves.
+            with multiprocessing.Pool(2) as pool:
+                job.doc.spawned = sum(pool.map(abs, [-1, -2]))
+
+        project = self.mock_project(Project)
+        project.run(timeout=30)
+        for job in project:
+            assert job.doc.spawned == 3
+
+    def test_run_timeout_unpicklable(self):
+        project = self.mock_project()
+        # The project cannot be serialized, e.g., due to a condition that
+        # refers to a lock.
+        lock = threading.Lock()
+        project._operations["op2"]._prereqs.append(
+            _FlowCondition(lambda job: lock is not None)
+        )
+        assert not project._is_picklable()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(names=["op2"], timeout=30)
+        # The operations are executed by forking.
+        for job in project:
+            assert job.doc.test != os.getpid()
+
+    def test_run_keep_going(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true("done")
+        def fail_odd(job):
+            if job.sp.b % 2:
+                raise RuntimeError("odd")
+            job.doc.done = True
+
+        project = self.mock_project(Project)
+        odd_jobs = [job for job in project if job.sp.b % 2]
+        with redirect_stderr(StringIO()):
+            with pytest.raises(UserOperationError):
+                project.run()
+            with pytest.raises(RuntimeError, match=f"{len(odd_jobs)} of"):
+                project.run(keep_going=True, num_passes=None)
+        for job in project:
+            assert job.doc.get("done", False) == (job not in odd_jobs)
+
+    def test_failure_quarantine(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true("done")
+        def fail_odd(job):
+            job.doc.attempts = job.doc.get("attempts", 0) + 1
+            if job.sp.b % 2:
+                raise RuntimeError("odd")
+            job.doc.done = True
+
+        project = self.mock_project(Project)
+        config = project.config.copy()
+        config["flow"]["failure_quarantine"] = 2
+        project = Project(config=config)
+        odd_jobs = [job for job in project if job.sp.b % 2]
+        with redirect_stderr(StringIO()):
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    project.run(keep_going=True)
+            # The failed operations are quarantined and skipped.
+            project.run(keep_going=True)
+        failures = project._load_failure_ledger()
+        assert set(failures) == {("fail_odd", (job.id,)) for job in odd_jobs}
+        assert set(failures.values()) == {2}
+        assert project._get_quarantined_operations() == set(failures)
+        for job in project:
+            assert job.doc.attempts == (2 if job in odd_jobs else 1)
+        assert list(project._get_submission_operations(odd_jobs, {})) == []
+
+        # Records appended by other processes are added to the index.
+        even_job = next(job for job in project if job not in odd_jobs)
+        with open(project._fn_failures(), "a") as file:
+            record = {"operation": "fail_odd", "jobs": [even_job.id], "error": "e"}
+            file.write(json.dumps(record) + "\n")
+        assert project._load_failure_ledger()[("fail_odd", (even_job.id,))] == 1
+        assert project._clear_failure_ledger(job_ids=[even_job.id]) == 1
+
+        # Clearing the failures lifts the quarantine.
+        assert project._clear_failure_ledger(job_ids=[odd_jobs[0].id]) == 1
+        with redirect_stderr(StringIO()):
+            with pytest.raises(RuntimeError, match="1 of 1"):
+                project.run(keep_going=True)
+        assert project._clear_failure_ledger() == len(odd_jobs)
+        assert project._load_failure_ledger() == {}
+
+    def test_run_dataflow(self):
+        project = self.mock_project()
+        executed = []
+
+        class Project(FlowProject):
+            pass
+
+        def stage_complete(i):
+            def _stage_complete(job):
+                return job.doc.get("stage", 0) > i
+
+            return _stage_complete
+
+        upstream = None
+        for i in range(3):
+
+            def stage(job, i=i):
+                executed.append((job.id, i))
+                job.doc.stage = i + 1
+
+            stage = Project.post(stage_complete(i))(stage)
+            if upstream is not None:
+                stage = Project.pre.after(upstream)(stage)
+            upstream = Project.operation(f"stage{i}")(stage)
+
+        project = Project(project.config)
+        with pytest.raises(ValueError):
+            project.run(mode="invalid")
+
+        project.run(mode="dataflow", num=4)
+        assert len(executed) == 4
+
+        project.run(mode="dataflow")
+        assert all(job.doc.stage == 3 for job in project)
+        assert len(executed) == 3 * len(project)
+        # Each stage is executed once per job, after the previous stage.
+        assert sorted(executed) == sorted(set(executed))
+        for job in project:
+            assert [i for job_id, i in executed if job_id == job.id] == [0, 1, 2]
+
+    def test_run_dataflow_condition_cache(self):
+        project = self.mock_project()
+        evaluated = []
+
+        class Project(FlowProject):
+            pass
+
+        def ready(jobs):
+            evaluated.extend(job.id for job in jobs)
+            return [True] * len(jobs)
+
+        @Project.operation
+        @Project.pre.batch(ready)
+        @Project.post.true("done")
+        def op(job):
+            job.doc.done = True
+
+        project = Project(project.config)
+        project.run(mode="dataflow")
+        assert all(job.doc.get("done") for job in project)
+        # Only the conditions of the jobs of completed operations are
+        # evaluated again, instead of those of all jobs.
+        assert set(evaluated) == {job.id for job in project}
+        assert len(evaluated) <= 2 * len(project)
+
+    def test_condition_cache_invalidate(self):
+        project = self.mock_project()
+        jobs = list(project)
+        counts = collections.Counter()
+
+        def condition(*jobs):
+            counts.update(job.id for job in jobs)
+            return True
+
+        cache = flow.project._ConditionCache()
+        for job in jobs:
+            cache.evaluate(condition, (job,))
+        cache.evaluate(condition, jobs[:2])
+        cache.invalidate(jobs[:1])
+        for job in jobs:
+            cache.evaluate(condition, (job,))
+        cache.evaluate(condition, jobs[:2])
+        assert counts[jobs[0].id] == 4
+        assert counts[jobs[1].id] == 3
+        assert all(counts[job.id] == 1 for job in jobs[2:])
+
+    def test_run_dataflow_parallel(self):
+        project = self.mock_project()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(np=2, mode="dataflow")
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        for job in project:
+            assert job.isfile("world.txt") == (job in even_jobs)
+            assert job.doc.get("test")
+
+    def test_reuse_worker_pool(self):
+        project = self.mock_project()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with project._reusing_worker_pools():
+                    with project._worker_pool(2) as pool:
+                        pass
+                    with project._worker_pool(2) as other_pool:
+                        assert other_pool is pool
+                    # Pools of worker processes are not serialized.
+                    loads, s_project = project._dumps_project()
+                    assert loads(s_project)._worker_pools is None
+                    with redirect_stderr(StringIO()):
+                        project.run(np=2, num_passes=2)
+                    assert list(project._worker_pools) == [2]
+        assert project._worker_pools is None
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        for job in project:
+            assert job.isfile("world.txt") == (job in even_jobs)
+
+    def test_reuse_worker_pool_error(self):
+        project = self.mock_project()
+        start = time.time()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with pytest.raises(RuntimeError):
+                    with project._reusing_worker_pools():
+                        with project._worker_pool(2) as pool:
+                            for _ in range(4):
+                                pool.apply_async(time.sleep, (30,))
+                            raise RuntimeError()
+        # The queued and executing tasks are cancelled.
+        assert project._worker_pools is None
+        assert time.time() - start < 30
+
+    def test_worker_initialization_error(self, monkeypatch):
+        project = self.mock_project()
+        monkeypatch.setattr(project, "_dumps_project", lambda: (_failing_loads, b""))
+        # The error is raised instead of replacing the workers indefinitely.
+        with redirect_stderr(StringIO()):
+            with pytest.raises(RuntimeError, match="Unable to deserialize"):
+                project.run(np=2, names=["op2"])
+
     def test_run_condition_inheritance(self):
 
         # This assignment is necessary to use the `mock_project` function on
@@ -1039,6 +1582,27 @@ class TestExecutionProject(TestProjectBase):
                     JobStatus.inactive,
                 )
 
+    def test_submit_status_single_write(self, monkeypatch):
+        MockScheduler.reset()
+        project = self.mock_project()
+        fn_doc = project.document._filename
+        num_writes = []
+        save = signac.core.jsondict.JSONDict._save
+
+        def counting_save(self, data=None):
+            if self._filename == fn_doc:
+                num_writes.append(1)
+            return save(self, data)
+
+        monkeypatch.setattr(signac.core.jsondict.JSONDict, "_save", counting_save)
+        with redirect_stderr(StringIO()):
+            project.submit()
+        assert len(list(MockScheduler.jobs())) > 1
+        assert len(num_writes) == 1
+        for job in project:
+            next_op = list(project._next_operations((job,)))[0]
+            assert next_op.get_status() == JobStatus.submitted
+
     def test_submit_operations_bad_directive(self):
         MockScheduler.reset()
         project = self.mock_project()
@@ -1106,6 +1670,444 @@ class TestExecutionProject(TestProjectBase):
                 project.run()
                 assert evaluated == expected_evaluation
 
+    def test_condition_cache(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        evaluated = collections.Counter()
+
+        class Project(FlowProject):
+            pass
+
+        def cond(job):
+            evaluated[job.get_id()] += 1
+            return False
+
+        @Project.operation
+        @Project.post(cond)
+        def op1(job):
+            pass
+
+        @Project.operation
+        @Project.pre.after(op1)
+        def op2(job):
+            pass
+
+        project = Project(project.config)
+        with project._cached_conditions() as cache:
+            for job in project:
+                assert project.groups["op1"]._eligible((job,))
+                assert not project.groups["op1"]._complete((job,))
+                assert not project.groups["op2"]._eligible((job,))
+        # The pre.after metacondition is cached in addition to its components.
+        assert cache.misses == 2 * len(project)
+        assert cache.hits == 2 * len(project)
+        assert set(evaluated.values()) == {1}
+        assert project._condition_cache is None
+
+        # Each condition is evaluated once per job for the status...
+        evaluated.clear()
+        project._fetch_status(project, StringIO(), ignore_errors=False)
+        assert set(evaluated.values()) == {1}
+
+        # ...and once per job and execution pass.
+        evaluated.clear()
+        with redirect_stderr(StringIO()):
+            project.run(names=["op2"])
+        assert set(evaluated.values()) == {1}
+
+    def test_persistent_condition_cache(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        evaluated = collections.Counter()
+
+        class Project(FlowProject):
+            pass
+
+        def done(job):
+            evaluated["done"] += 1
+            return job.doc.get("done", False)
+
+        def external(job):
+            evaluated["external"] += 1
+            return True
+
+        @Project.operation
+        @Project.pre(external, volatile=True)
+        @Project.post(done)
+        def op1(job):
+            pass
+
+        for job in project:
+            with open(job.fn("data.txt"), "w") as file:
+                file.write("data")
+        config = project.config.copy()
+        config["flow"]["persistent_condition_cache"] = True
+        project = Project(config=config)
+
+        def fetch_status():
+            evaluated.clear()
+            project._fetch_status(project, StringIO(), ignore_errors=False)
+
+        fetch_status()
+        assert evaluated == {"done": len(project), "external": len(project)}
+        assert os.path.isfile(project._fn_condition_cache())
+
+        # Volatile conditions are always evaluated, all others are restored
+        # from the cache, also for new instances of the project.
+        project = Project(config=config)
+        fetch_status()
+        assert evaluated == {"external": len(project)}
+
+        # Only conditions of modified jobs are evaluated again. The pre-condition
+        # is not evaluated for the now completed job.
+        job = next(iter(project))
+        job.doc.done = True
+        fetch_status()
+        assert evaluated == {"done": 1, "external": len(project) - 1}
+        status = project.get_job_status(job)
+        assert status["operations"]["op1"]["completed"]
+
+        # Files modified in place, like the job data, count as modifications.
+        job = list(project)[1]
+        with open(job.fn("data.txt"), "a") as file:
+            file.write("more data")
+        fetch_status()
+        assert evaluated == {"done": 1, "external": len(project) - 1}
+
+        # The cache can be disabled or rebuilt.
+        project = Project(config=config)
+        project._condition_cache_mode = "off"
+        fetch_status()
+        assert evaluated["done"] == len(project)
+        project = Project(config=config)
+        project._condition_cache_mode = "rebuild"
+        fetch_status()
+        assert evaluated["done"] == len(project)
+        fetch_status()
+        assert evaluated["done"] == 0
+
+    def test_batch_condition(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        calls = []
+
+        class Project(FlowProject):
+            pass
+
+        def done(jobs):
+            calls.append(len(jobs))
+            return [job.doc.get("done", False) for job in jobs]
+
+        @Project.operation
+        @Project.post.batch(done)
+        def op1(job):
+            pass
+
+        @Project.operation
+        @Project.pre.batch(done)
+        def op2(job):
+            pass
+
+        project = Project(project.config)
+        job = next(iter(project))
+        job.doc.done = True
+
+        # Batch conditions are tagged like other conditions.
+        assert project.detect_operation_graph() == [[0, 1], [0, 0]]
+
+        # Without a cache, a batch condition is evaluated for each job.
+        assert project.groups["op1"]._complete((job,))
+        assert calls == [1]
+
+        # Within one pass, it is evaluated once for all selected jobs.
+        del calls[:]
+        status = project._fetch_status(project, StringIO(), ignore_errors=False)
+        assert calls == [len(project)]
+        for job_status in status:
+            done = job_status["job_id"] == job.get_id()
+            assert job_status["operations"]["op1"]["completed"] == done
+            assert job_status["operations"]["op2"]["eligible"] == done
+
+        # Ignored conditions are not evaluated.
+        del calls[:]
+        with project._cached_conditions(project):
+            assert project.groups["op1"]._eligible(
+                (job,), ignore_conditions=flow.IgnoreConditions.POST
+            )
+        assert calls == []
+
+        status = project._fetch_status(
+            project, StringIO(), ignore_errors=False, status_parallelization="process"
+        )
+        assert [s["operations"]["op1"]["completed"] for s in status].count(True) == 1
+
+    def test_batch_condition_invalid_result(self):
+        project = self.mock_project()
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.batch(lambda jobs: [True])
+        def op1(job):
+            pass
+
+        project = Project(project.config)
+        with pytest.raises(flow.errors.UserConditionError):
+            with project._cached_conditions(project):
+                project.groups["op1"]._complete((next(iter(project)),))
+
+    def test_builtin_condition_snapshot(self):
+        project = self.mock_project()
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.pre.true("ready")
+        @Project.pre.not_(Project.pre.isfile("lock").condition)
+        @Project.post.isfile("out.txt")
+        @Project.post.isfile("sub/out.txt")
+        @Project.post.false("failed")
+        def op1(job):
+            pass
+
+        project = Project(project.config)
+        for i, job in enumerate(project):
+            job.doc.ready = bool(i % 2)
+            if i % 3:
+                with open(job.fn("out.txt"), "w"):
+                    pass
+            if i % 4:
+                os.mkdir(job.fn("sub"))
+                with open(job.fn("sub/out.txt"), "w"):
+                    pass
+            if i % 5 == 0:
+                with open(job.fn("lock"), "w"):
+                    pass
+
+        group = project.groups["op1"]
+        expected = [
+            (group._eligible((job,)), group._complete((job,))) for job in project
+        ]
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            with project._cached_conditions(project):
+                results = [
+                    (group._eligible((job,)), group._complete((job,)))
+                    for job in project
+                ]
+        assert results == expected
+        # The workspace and its subdirectory are scanned at most once per job.
+        assert 0 < scandir.call_count <= 2 * len(project)
+
+    def test_adaptive_condition_order(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        evaluated = collections.Counter()
+
+        class Project(FlowProject):
+            pass
+
+        def always_met(job):
+            evaluated["always_met"] += 1
+            return True
+
+        def never_met(job):
+            evaluated["never_met"] += 1
+            return False
+
+        @Project.operation
+        @Project.pre(always_met)
+        @Project.pre(never_met)
+        def op1(job):
+            pass
+
+        config = project.config.copy()
+        config["flow"]["adaptive_condition_order"] = True
+        project = Project(config=config)
+
+        def fetch_status():
+            evaluated.clear()
+            return project._fetch_status(project, StringIO(), ignore_errors=False)
+
+        # Conditions are evaluated in the order of declaration at first...
+        fetch_status()
+        assert evaluated == {"always_met": len(project), "never_met": len(project)}
+        assert os.path.isfile(project._fn_condition_statistics())
+
+        # ...and then ordered by their expected cost, also for new instances.
+        project = Project(config=config)
+        status = fetch_status()
+        assert evaluated == {"never_met": len(project)}
+        assert not any(s["operations"]["op1"]["eligible"] for s in status)
+        op1_ = project.operations["op1"]
+        assert [c._callback for c in op1_._prereqs] == [always_met, never_met]
+
+    def test_adaptive_condition_order_guard(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+
+        class Project(FlowProject):
+            pass
+
+        def has_data(job):
+            return "data" in job.doc
+
+        def positive_data(job):
+            return job.doc["data"] > 0
+
+        @Project.operation
+        @Project.pre(has_data)
+        @Project.pre(positive_data)
+        def op1(job):
+            pass
+
+        for job in project:
+            job.doc.data = job.sp.b % 2
+        config = project.config.copy()
+        config["flow"]["adaptive_condition_order"] = True
+
+        def fetch_status():
+            project = Project(config=config)
+            status = project._fetch_status(project, StringIO(), ignore_errors=False)
+            order = project.operations["op1"]._prereqs_evaluation_order
+            return status, [c._callback for c in order]
+
+        # The guard never fails, hence it is evaluated last...
+        fetch_status()
+        assert fetch_status()[1] == [positive_data, has_data]
+
+        # ...until the guarded condition raises an error without it, in which
+        # case the conditions are evaluated again in the order of declaration.
+        job = next(iter(project))
+        del job.doc["data"]
+        status, _ = fetch_status()
+        assert not status[0]["operations"]["op1"]["eligible"]
+        assert fetch_status()[1] == [has_data, positive_data]
+
+    def test_graph_aware_evaluation(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        evaluated = collections.Counter()
+
+        class Project(FlowProject):
+            pass
+
+        def stage_complete(i):
+            def _stage_complete(job):
+                evaluated[i] += 1
+                return job.doc.get("stage", 0) > i
+
+            return _stage_complete
+
+        upstream = None
+        for i in range(5):
+
+            def stage(job):
+                pass
+
+            stage = Project.post(stage_complete(i))(stage)
+            if upstream is not None:
+                stage = Project.pre.after(upstream)(stage)
+            upstream = Project.operation(f"stage{i}")(stage)
+
+        # Jobs have completed 0 to 5 stages.
+        for i, job in enumerate(project):
+            job.doc.stage = i % 6
+
+        def fetch_status():
+            evaluated.clear()
+            return project._fetch_status(project, StringIO(), ignore_errors=False)
+
+        project = Project(project.config)
+        expected = fetch_status()
+        num_evaluated = sum(evaluated.values())
+
+        config = project.config.copy()
+        config["flow"]["graph_aware_evaluation"] = True
+        project = Project(config=config)
+        assert fetch_status() == expected
+        assert sum(evaluated.values()) < num_evaluated
+        # The completion of each stage is only evaluated if all previous
+        # stages are complete.
+        for i in range(5):
+            assert evaluated[i] == len([job for job in project if job.doc.stage >= i])
+
+    def test_incremental_run(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        evaluated = collections.Counter()
+
+        class Project(FlowProject):
+            pass
+
+        def done(job):
+            evaluated[job.id] += 1
+            return job.doc.get("steps", 0) >= job.doc.limit
+
+        @Project.operation
+        @Project.post(done)
+        def step(job):
+            job.doc.steps = job.doc.get("steps", 0) + 1
+
+        for i, job in enumerate(project):
+            job.doc.limit = i % 4
+
+        for incremental in (False, True):
+            config = project.config.copy()
+            config["flow"]["incremental_run"] = incremental
+            project = Project(config=config)
+            for job in project:
+                job.doc.pop("steps", None)
+            evaluated.clear()
+            project.run(num_passes=None)
+            for job in project:
+                assert job.doc.get("steps", 0) == job.doc.limit
+                if incremental:
+                    # Jobs are evaluated again only after an operation was
+                    # executed for them in the previous pass.
+                    assert evaluated[job.id] == job.doc.limit + 1
+                else:
+                    assert evaluated[job.id] == 4
+
+    def test_gather_parallelization(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+
+        def with_parallelization(gather_parallelization):
+            config = project.config.copy()
+            config["flow"]["gather_parallelization"] = gather_parallelization
+            return type(project)(config=config)
+
+        def submission_operations(project):
+            default_directives = project._get_default_directives()
+            with project._cached_conditions(project):
+                return [
+                    operation.id
+                    for operation in project._get_submission_operations(
+                        project, default_directives
+                    )
+                ]
+
+        expected = submission_operations(project)
+        assert len(expected)
+        for gather_parallelization in ("thread", "process"):
+            # The operations are gathered in a deterministic order.
+            parallel_project = with_parallelization(gather_parallelization)
+            assert submission_operations(parallel_project) == expected
+
+        # Execute with the operations gathered by the process pool.
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    parallel_project.run()
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        for job in project:
+            assert job.isfile("world.txt") == (job in even_jobs)
+
+        with pytest.raises(RuntimeError):
+            with_parallelization("invalid").run()
+
 
 class TestUnbufferedExecutionProject(TestExecutionProject):
     def mock_project(self, project_class=None):
@@ -1173,6 +2175,50 @@ class TestProjectMainInterface(TestProjectBase):
         for job in self.project:
             assert job.doc.get("test", False)
 
+    def test_main_exec_manifest(self):
+        assert len(self.project)
+        manifest = [dict(operation="op2", jobs=[job.id]) for job in self.project]
+        # A failing entry must not prevent the execution of the other entries.
+        manifest.insert(1, dict(operation="op2", jobs=["0" * 32]))
+        fn_manifest = os.path.abspath("manifest.jsonl")
+        with open(fn_manifest, "w") as file:
+            file.write("\n".join(json.dumps(entry) for entry in manifest))
+        with pytest.raises(subprocess.CalledProcessError):
+            self.call_subcmd(f"exec --manifest {fn_manifest} --parallel 2")
+        for job in self.project:
+            assert job.doc.get("test", False)
+
+    def test_main_submit_batched(self):
+        assert len(self.project)
+        script = self.call_subcmd("submit --test -o op2 --bundle --batched").decode()
+        assert script.count("exec --manifest") == 1
+        assert "run -o op2" not in script
+        for job in self.project:
+            assert job.get_id() in script
+
+    def test_main_stats(self):
+        assert len(self.project)
+        assert json.loads(self.call_subcmd("stats --json").decode()) == []
+        config = self.project.config.copy()
+        config["flow"]["record_metrics"] = True
+        type(self.project)(config=config).run(names=["op2"])
+        stats = json.loads(self.call_subcmd("stats --json -o op2").decode())
+        assert [entry["operation"] for entry in stats] == ["op2"]
+        assert stats[0]["runs"] == len(self.project)
+        assert "op2" in self.call_subcmd("stats").decode()
+
+    def test_main_failures(self):
+        job = next(iter(self.project))
+        os.makedirs(os.path.dirname(self.project._fn_failures()), exist_ok=True)
+        with open(self.project._fn_failures(), "w") as file:
+            record = {"operation": "op1", "jobs": [job.id], "time": 0, "error": "e"}
+            file.write(json.dumps(record) + "\n")
+        output = self.call_subcmd("failures -o op1").decode()
+        assert "op1" in output and job.id in output
+        output = self.call_subcmd(f"failures --clear -j {job.id}").decode()
+        assert "Cleared the failures of 1 operation(s)." in output
+        assert not os.path.exists(self.project._fn_failures())
+
     def test_main_run(self):
         assert len(self.project)
         for job in self.project:
@@ -1185,6 +2231,33 @@ class TestProjectMainInterface(TestProjectBase):
             else:
                 assert not job.isfile("world.txt")
 
+    def test_main_run_parallel_failure(self):
+        fn_script = os.path.join(self._tmp_dir.name, "define_failing_project.py")
+        with open(fn_script, "w") as file:
+            file.write(
+                "from flow import FlowProject\n\n\n"
+                "class FailingProject(FlowProject):\n"
+                "    pass\n\n\n"
+                "@FailingProject.operation\n"
+                "def fail(job):\n"
+                "    if job.sp.b % 2:\n"
+                "        raise ValueError('Operation failed.')\n\n\n"
+                "if __name__ == '__main__':\n"
+                "    FailingProject().main()\n"
+            )
+        with add_path_to_environment_pythonpath(os.path.abspath(self.cwd)):
+            with switch_to_directory(self.project.root_directory()):
+                process = subprocess.run(
+                    ["python", fn_script, "run", "--parallel", "2"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    universal_newlines=True,
+                )
+        assert process.returncode == 1
+        # The traceback of the failed operation is shown.
+        assert "ValueError: Operation failed." in process.stderr
+        assert "AttributeError" not in process.stderr
+
     def test_main_next(self):
         assert len(self.project)
         jobids = set(self.call_subcmd("next op1").decode().split())
@@ -1248,6 +2321,37 @@ class TestProjectDagDetection(TestProjectBase):
 
         assert adj == adj_correct
 
+    def test_operation_graph(self):
+        project = self.mock_project()
+        graph = project.get_operation_graph()
+        assert graph is project.get_operation_graph()
+        assert graph.nodes == list(project.operations)
+        assert graph.to_adjacency_matrix() == project.detect_operation_graph()
+
+        assert graph.successors("first") == ["second", "third", "fifth"]
+        assert graph.predecessors("sixth") == ["third", "fifth"]
+        assert graph.ancestors("seventh") == {"first", "second", "third", "fourth"}
+        assert graph.descendants("third") == {"fourth", "sixth", "seventh"}
+        assert graph.is_reachable("first", "sixth")
+        assert not graph.is_reachable("second", "sixth")
+
+        order = graph.topological_order()
+        assert sorted(order) == sorted(project.operations)
+        for source, target in graph.edges:
+            assert order.index(source) < order.index(target)
+
+        data = json.loads(graph.to_json())
+        assert data["nodes"] == graph.nodes
+        assert len(data["edges"]) == 9
+        dot = graph.to_dot()
+        assert dot.startswith('digraph "operations" {')
+        assert '    "first" -> "second";' in dot.splitlines()
+
+        # Adding an operation invalidates the cached graph.
+        project.add_operation("eighth", "echo eighth")
+        assert project.get_operation_graph() is not graph
+        assert "eighth" in project.get_operation_graph()
+
 
 # Tests for multiple operation groups or groups with options
 class TestGroupProject(TestProjectBase):
@@ -1319,6 +2423,62 @@ class TestGroupProject(TestProjectBase):
                 [job_op.directives.get("omp_num_threads", 0) == 1 for job_op in job_ops]
             )
 
+    def test_run_job_operation_lazy(self):
+        class A(flow.FlowProject):
+            pass
+
+        @A.operation
+        @flow.directives(nranks=lambda job: job.doc.nranks)
+        def op1(job):
+            pass
+
+        project = self.mock_project(A)
+        job = next(iter(project))
+        (job_op,) = project.groups["op1"]._create_run_job_operations(
+            project._entrypoint, project._get_default_directives(), (job,)
+        )
+        assert not hasattr(job_op, "__dict__")
+        # Neither the id, nor the directives, nor the command are resolved yet.
+        assert callable(job_op._id)
+        assert callable(job_op._directives)
+        assert callable(job_op._cmd)
+        job.doc.nranks = 2
+        assert job_op.directives["nranks"] == 2
+        assert job_op.directives["fork"]
+        assert job_op.cmd.startswith("mpiexec -n 2 ")
+        assert job_op.id == project.groups["op1"]._generate_id((job,), "op1")
+        assert job_op.directives is job_op.directives
+
+    def test_submission_ids(self):
+        project = self.mock_project()
+        jobs = list(project)
+        ids = project._get_submission_ids(jobs)
+        assert sum(map(len, ids.values())) == len(jobs) * len(project.groups)
+        for id_, groups_and_jobs in ids.items():
+            for group, job in groups_and_jobs:
+                assert id_ == group._calc_id((job,), None, 0)
+                assert group._generate_id((job,)) == id_
+        project._operation_ids.clear()
+        assert project._get_submission_ids(jobs) == ids
+
+    def test_eligible_for_submission(self):
+        project = self.mock_project()
+        for name, group in project.groups.items():
+            assert {other.name for other in project._overlapping_groups[name]} == {
+                other.name
+                for other in project.groups.values()
+                if other is not group and not group.isdisjoint(other)
+            }
+        job = next(iter(project))
+        group = project.groups["group1"]
+        assert project._eligible_for_submission(group, (job,))
+        with project._cached_status() as snapshot:
+            snapshot[project.groups["op1"]._generate_id((job,))] = int(
+                JobStatus.submitted
+            )
+            assert not project._eligible_for_submission(group, (job,))
+        assert project._eligible_for_submission(group, (job,))
+
     def test_submission_aggregation(self):
         class A(flow.FlowProject):
             pass